@@ -7,19 +7,40 @@ Description: Flask application for weather prediction using SVM model and Visual
 # =====================================================================================
 
 # Core Flask imports
-from flask import Flask, render_template, request, jsonify, send_from_directory
+from flask import Flask, Response, g, has_request_context, render_template, request, jsonify, send_from_directory
 
 # Standard library imports
+import hmac
+import json
 import os
+import threading
+import time
 from datetime import datetime, timedelta, timezone
 from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import quote
+
+# awal inisialisasi modul, utk laporan waktu startup di /api/ready
+MODULE_INIT_STARTED = time.perf_counter()
 
 # Third-party imports
+# joblib (fallback .pkl) baru di-import di initialize_model jika bundle NumPy tidak bisa dipakai
 import requests # utk mengakses API eksternal 
-import joblib # utk loading model ML yg sdh dilatih
 import numpy as np # utk manipulasi data
-import pandas as pd 
-from sklearn.preprocessing import StandardScaler # utk preprocessing data
+
+# Local imports
+from svc_engine import BUNDLE_FORMAT_VERSION, SVCEngine # utk inferensi SVC tanpa sklearn
+from weather_cache import TimelineCache # utk cache data timeline visual crossing
+from upstream import CircuitBreaker, SingleFlight, UpstreamClient # utk request upstream yg efisien dan aman
+from prewarm import ForecastEntry, ForecastPrewarmer, PredictionStore # utk prakiraan yg sdh dihitung di background
+from day_store import DAY_STORE_ELEMENTS, DayFrame, DayStore # utk data per jam dlm bentuk array
+from metrics import Metrics # utk histogram latensi per tahap dan endpoint /metrics
+from profiling import RequestProfiler # utk profil per request (collapsed stack / cProfile)
+from memory_report import mapping_memory, process_memory # utk laporan memori per worker
+from model_config import MODEL_CONFIG # utk path artefak model dan kolom fitur
+from model_bundle import ArtifactWatcher, ModelBundle, read_export_stamp, validate_bundle # utk reload model tanpa restart
+from prediction_memo import PredictionMemo # utk hasil model per vektor fitur yg sdh pernah dihitung
+from quota import QuotaBudget, QuotaExceededError, estimate_record_cost # utk anggaran record harian visual crossing
 
 # =====================================================================================
 # APPLICATION CONFIGURATION
@@ -28,26 +49,118 @@ from sklearn.preprocessing import StandardScaler # utk preprocessing data
 # Initialize Flask application
 app = Flask(__name__, static_folder='.', static_url_path='')
 
+# folder aplikasi = root file statis; data runtime (profil, status kuota) disimpan di luar folder ini
+STATIC_ROOT = os.path.dirname(os.path.abspath(__file__))
+STATE_DIR = os.environ.get('WEBCUACA_STATE_DIR', os.path.join(os.path.dirname(STATIC_ROOT), 'var'))
+
 # API Configuration
-# utk mengakses layanan cuaca visual crossing
-VISUAL_CROSSING_API_KEY = "4U9YJTK8HYWFRKZ86G4N68TK7"
-VISUAL_CROSSING_BASE_URL = "https://weather.visualcrossing.com/VisualCrossingWebServices/rest/services/timeline"
-
-# Model configuration
-# konfigurasi model SVM dan scaler yg digunakan utk prediksi
-MODEL_CONFIG = {
-    'svm_model_path': 'svm_model_cuaca.pkl',
-    'scaler_path': 'scaler_cuaca.pkl',
-    'default_location': "Teluk Ambon, Maluku, Indonesia", # lokasi default dan kolom fitur utk machine learning
-    'feature_columns': ['temp', 'humidity', 'precip', 'windspeed',
-                       'windgust', 'cloudcover', 'visibility',
-                       'uvindex', 'solarradiation', 'pressure']
+# utk mengakses layanan cuaca visual crossing; base URL bisa diarahkan ke vc_stub.py utk uji beban
+VISUAL_CROSSING_API_KEY = os.environ.get('VISUAL_CROSSING_API_KEY', "4U9YJTK8HYWFRKZ86G4N68TK7")
+VISUAL_CROSSING_BASE_URL = os.environ.get(
+    'VISUAL_CROSSING_BASE_URL',
+    "https://weather.visualcrossing.com/VisualCrossingWebServices/rest/services/timeline"
+).rstrip('/')
+
+# Cache configuration
+# tanggal lampau disimpan permanen, hari ini dan masa depan kedaluwarsa setelah ttl_seconds
+CACHE_CONFIG = {
+    'max_bytes': 32 * 1024 * 1024,
+    'ttl_seconds': 600,
+    'disk_dir': None, # isi dgn path folder agar cache bertahan setelah restart
+    'day_store_max_entries': 512, # jumlah (lokasi, tanggal) dlm day store
+    'prediction_memo_max_entries': 65536, # vektor fitur unik yg hasil modelnya diingat (0 = nonaktif)
+    'prediction_memo_decimals': 2 # hanya kunci memo yg dibulatkan; model tetap menerima nilai asli
+}
+
+# Upstream HTTP client configuration
+# timeout dlm detik; retry hanya utk error koneksi, timeout, 429 dan 5xx
+UPSTREAM_CONFIG = {
+    'pool_size': 10,
+    'connect_timeout': 3.05,
+    'read_timeout': 15,
+    'max_retries': 2,
+    'backoff_base': 0.5,
+    'backoff_max': 4,
+    'breaker_failure_threshold': 5,
+    'breaker_reset_timeout': 30
+}
+
+# Upstream quota configuration
+# visual crossing menagih per record (1 per hari utk include=days, 24 per hari utk include=hours)
+QUOTA_CONFIG = {
+    'daily_records': int(os.environ.get('VISUAL_CROSSING_DAILY_RECORDS', '1000')), # 0 = tanpa batas
+    # dibagi semua worker di host yg sama dan bertahan setelah restart
+    'state_path': os.environ.get('QUOTA_STATE_PATH', os.path.join(STATE_DIR, 'quota_state.json')),
+    'conserve_fraction': 0.2 # sisa kuota di bawah fraksi ini: pre-warm berhenti, hanya request pengguna
+}
+
+# Visual Crossing element lists per request type
+# hanya kolom yg dibaca: fitur model + field yg ditampilkan route harian (tanpa dewpoint, solarenergy, preciptype, description)
+DAILY_DISPLAY_ELEMENTS = ['datetime', 'tempmax', 'tempmin', 'conditions']
+DAILY_ELEMENTS = ",".join(dict.fromkeys(DAILY_DISPLAY_ELEMENTS + MODEL_CONFIG['feature_columns']))
+# (hourly routes share DAY_STORE_ELEMENTS from day_store)
+
+# Number of days served by the weekly routes
+WEEKLY_FORECAST_DAYS = 7
+
+# Limit and projectable fields of the full-range hourly endpoint (7 x 24 = 168 jam)
+HOURLY_RANGE_MAX_DAYS = 7
+HOURLY_RANGE_FIELDS = ("datetime", "date", "temp", "humidity", "windspeed", "feelslike", "uvindex",
+                       "visibility", "pressure", "condition", "description", "modelPredictionResult")
+
+# Content types of the streaming weekly forecast
+STREAM_FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'sse': 'text/event-stream'
+}
+
+# Multi-location batch endpoint configuration
+BATCH_CONFIG = {
+    'max_items': 500,
+    'max_concurrent_upstream': 8, # rentang yg diambil paralel dari visual crossing
+    'max_span_days': 31, # rentang tanggal berurutan yg lebih panjang dipecah
+    'max_location_length': 100,
+    # batas biaya per request, dicek sblm ada panggilan upstream (413 jika lebih, 429 jika kuota harian tidak cukup)
+    'max_locations': 10,
+    'max_upstream_records': 3 * 7 * 24 # mis. 3 lokasi x 7 hari data per jam
+}
+
+# Metrics configuration
+# METRICS_ENABLED=0 mematikan pencatatan (timer dan counter menjadi no-op)
+METRICS_CONFIG = {
+    'enabled': os.environ.get('METRICS_ENABLED', '1') == '1'
+}
+
+# On-demand request profiling configuration
+# header X-Profile-Token dgn nilai PROFILING_TOKEN memaksa profil utk satu request
+PROFILING_CONFIG = {
+    'enabled': os.environ.get('PROFILING_ENABLED', '0') == '1',
+    'sample_rate': float(os.environ.get('PROFILING_SAMPLE_RATE', '0.01')), # fraksi request yg diprofil
+    'token': os.environ.get('PROFILING_TOKEN'),
+    'header': 'X-Profile-Token',
+    'mode': os.environ.get('PROFILING_MODE', 'sampler'), # 'sampler' (collapsed stack) atau 'cprofile'
+    'interval_ms': 5,
+    'directory': os.environ.get('PROFILING_DIR', os.path.join(STATE_DIR, 'profiles')),
+    'max_profiles': 50 # profil lama dihapus (rotasi)
+}
+
+# Background pre-warming configuration
+# hari ini s/d 7 hari ke depan utk default_location di-refresh secara berkala
+# satu refresh = 8 hari x 24 record per jam = 192 record; tiap 12 jam -> 384 record/hari dari kuota default 1000
+PREWARM_CONFIG = {
+    'enabled': os.environ.get('PREWARM_ENABLED', '0') == '1', # PREWARM_ENABLED=1 mengaktifkan
+    'interval_seconds': 12 * 3600,
+    'days': WEEKLY_FORECAST_DAYS + 1,
+    'max_age_seconds': 24 * 3600 # entri yg lebih tua dari ini diabaikan jika refresh terhenti
 }
 
 # Global model variables
-svm_model = None
-scaler = None
-model_proba_enabled = False
+# model_bundle hanya diganti utuh (satu assignment); None berarti prediksi dummy
+model_bundle = None
+model_ready = threading.Event()
+model_reload_lock = threading.Lock()
+model_reload_status = {'reloads': 0, 'failures': 0, 'last_error': None, 'last_reload_at': None}
+STARTUP_TIMINGS = {}
 
 # Weather condition mappings
 # mapping kondisi cuaca dari bing ke indo, kondisi cuaca ke icon yg sesuai
@@ -115,41 +228,246 @@ PREDICTION_LABELS = {
 
 # memuat model SVM dan scaler yg sdh dilatih, jika gagal aplikasi ttp berjalan dgn prediksi dummy
 def initialize_model():
-    """Initialize SVM model and scaler with error handling."""
-    global svm_model, scaler, model_proba_enabled
+    """Load and warm up the model, then mark the worker ready (also when falling back to dummy)."""
+    global model_bundle
+    started = time.perf_counter()
+    try:
+        bundle = load_model_bundle()
+        if bundle is not None:
+            warmup_started = time.perf_counter()
+            bundle.engine.warm_up()
+            STARTUP_TIMINGS['model_warmup_ms'] = round((time.perf_counter() - warmup_started) * 1000, 2)
+        model_bundle = bundle
+        return bundle is not None
+    finally:
+        STARTUP_TIMINGS['model_load_ms'] = round((time.perf_counter() - started) * 1000, 2)
+        model_ready.set()
+
+# urutan pilihan artefak saat startup: mmap (dibagi antar worker), .npz (tanpa pickle/sklearn), lalu .pkl
+MODEL_ARTIFACTS = {'mmap': 'engine_flat_path', 'bundle': 'engine_bundle_path', 'pickle': 'svm_model_path'}
+
+def load_model_artifact(source, version=1):
+    """
+    Load exactly one artifact ('mmap', 'bundle' or 'pickle') into a new ModelBundle.
+
+    Raises:
+        Exception: Whatever the loader raises; there is no fallback to another artifact
+    """
+    path = MODEL_CONFIG[MODEL_ARTIFACTS[source]]
+    if source == 'mmap':
+        engine = SVCEngine.load_mapped(path)
+    elif source == 'bundle':
+        engine = SVCEngine.load(path)
+    else:
+        import joblib # utk loading model ML yg sdh dilatih
+        svm_model = joblib.load(path)
+        scaler = joblib.load(MODEL_CONFIG['scaler_path'])
+        engine = SVCEngine.from_estimators(svm_model, scaler, MODEL_CONFIG['feature_columns'])
+    return ModelBundle(engine, PREDICTION_LABELS, source, path, version)
+
+def load_model_bundle(version=1):
+    """
+    Load the model from the first usable artifact into a new ModelBundle (startup only).
+    
+    Returns:
+        ModelBundle: The loaded bundle, or None when no artifact could be loaded
+    """
+    # Prefer the memory-mapped flat bundle: its pages are shared by every worker on the host
+    if os.path.exists(MODEL_CONFIG['engine_flat_path']):
+        try:
+            bundle = load_model_artifact('mmap', version)
+            print(f"Bundle model '{MODEL_CONFIG['engine_flat_path']}' berhasil dibuka (mmap)!")
+            return bundle
+        except Exception as e:
+            print(f"Gagal membuka bundle model datar ({e}), mencoba bundle .npz...")
+
+    # Then the exported NumPy bundle; it needs neither pickle nor sklearn
+    if os.path.exists(MODEL_CONFIG['engine_bundle_path']):
+        try:
+            bundle = load_model_artifact('bundle', version)
+            print(f"Bundle model '{MODEL_CONFIG['engine_bundle_path']}' berhasil dimuat!")
+            return bundle
+        except Exception as e:
+            print(f"Gagal memuat bundle model ({e}), mencoba file .pkl...")
     
     try:
-        # Load SVM model
-        svm_model = joblib.load(MODEL_CONFIG['svm_model_path'])
+        bundle = load_model_artifact('pickle', version)
+        print("Scaler berhasil dimuat!")
         
         # Check if model supports probability prediction
-        if hasattr(svm_model, 'predict_proba') and callable(getattr(svm_model, 'predict_proba')):
+        if bundle.supports_probability:
             print("Model SVC berhasil dimuat dan mendukung probabilitas!")
-            model_proba_enabled = True
         else:
             print("Model SVC berhasil dimuat, TAPI TIDAK mendukung probabilitas. Pastikan melatih model dengan 'probability=True'.")
         
-        # Load scaler
-        scaler = joblib.load(MODEL_CONFIG['scaler_path'])
-        print("Scaler berhasil dimuat!")
-        
-        return True
+        return bundle
         
     except FileNotFoundError:
         print("\n--- PENTING: FILE MODEL ATAU SCALER TIDAK DITEMUKAN! ---")
         print("Pastikan 'svm_model_cuaca.pkl' dan 'scaler_cuaca.pkl' berada di direktori yang sama dengan app.py.")
         print("Aplikasi akan menggunakan logika prediksi dummy sebagai fallback.")
         print("------------------------------------------------------\n")
-        return False
+        return None
         
     except Exception as e:
         print(f"\n--- ERROR SAAT MEMUAT MODEL ATAU SCALER: {e} ---")
         print("Aplikasi akan menggunakan logika prediksi dummy sebagai fallback.")
         print("------------------------------------------------------\n")
-        return False
+        return None
+
+def start_model_loading():
+    """Load the model now ('eager') or in a daemon thread ('background')."""
+    if MODEL_CONFIG['load_mode'] == 'background':
+        threading.Thread(target=initialize_model, name='model-loader', daemon=True).start()
+    else:
+        initialize_model()
+
+def wait_for_model():
+    """Current model bundle, waiting (bounded) while a background load is still running."""
+    if not model_ready.is_set():
+        model_ready.wait(MODEL_CONFIG['ready_wait_seconds'])
+    return model_bundle
+
+def active_model_bundle():
+    """Model bundle for the current work, pinned per request so one response never mixes two models."""
+    if not has_request_context():
+        return wait_for_model()
+    if 'model_bundle' not in g:
+        g.model_bundle = wait_for_model()
+    return g.model_bundle
+
+def reload_source():
+    """
+    Artifact a reload loads, plus the checksum it must have.
+
+    The export stamp names the artifact an export just finished; without a
+    stamp the first artifact on disk (startup order) is used.
+    """
+    stamp = read_export_stamp(MODEL_CONFIG['export_stamp_path'])
+    if stamp is not None:
+        if stamp['source'] not in MODEL_ARTIFACTS:
+            raise ValueError(f"Stamp export menyebut artefak tidak dikenal: {stamp['source']}")
+        return stamp['source'], stamp['checksum']
+    for source, path_key in MODEL_ARTIFACTS.items():
+        if os.path.exists(MODEL_CONFIG[path_key]):
+            return source, None
+    raise ValueError("Tidak ada artefak model di disk")
+
+# model lama tetap melayani request sampai model baru lolos validasi dan di-warm-up
+def reload_model():
+    """
+    Load, validate and warm one artifact in the calling thread, then swap it in atomically.
+
+    Unlike startup there is no fallback chain: if the artifact is broken or
+    not the one the export stamp describes, the reload fails and the current
+    bundle keeps serving, rather than swapping in an older artifact.
+    
+    Returns:
+        ModelBundle: The bundle now serving requests
+    
+    Raises:
+        ValueError: If the artifact cannot be loaded or the new bundle fails validation
+    """
+    global model_bundle
+    with model_reload_lock:
+        try:
+            version = (model_bundle.version + 1) if model_bundle is not None else 1
+            source, checksum = reload_source()
+            try:
+                candidate = load_model_artifact(source, version)
+            except Exception as e:
+                raise ValueError(f"Artefak '{MODEL_CONFIG[MODEL_ARTIFACTS[source]]}' gagal dimuat: {e}") from e
+            if checksum is not None and candidate.checksum != checksum:
+                raise ValueError(f"Checksum '{candidate.path}' tidak sama dengan stamp export "
+                                 f"(export belum selesai atau artefak diganti manual)")
+            validate_bundle(candidate, MODEL_CONFIG['feature_columns'])
+            candidate.engine.warm_up()
+        except Exception as e:
+            model_reload_status['failures'] += 1
+            model_reload_status['last_error'] = str(e)
+            raise ValueError(str(e)) from e
+
+        model_bundle = candidate
+        model_ready.set()
+        model_reload_status['reloads'] += 1
+        model_reload_status['last_error'] = None
+        model_reload_status['last_reload_at'] = time.time()
+
+    print(f"🔄 Model versi {candidate.version} ({candidate.source}) aktif")
+    on_model_swapped()
+    return candidate
+
+def on_model_swapped():
+    """Drop results computed by the previous model and recompute forecasts in the background."""
+    prediction_memo.clear()
+    prediction_store.replace({})
+    if PREWARM_CONFIG['enabled']:
+        threading.Thread(target=forecast_prewarmer.run_once, name='prewarm-after-reload', daemon=True).start()
 
 # Initialize model on startup
-initialize_model()
+start_model_loading()
+
+# Per-stage and per-route latency histograms plus counters, served on /metrics
+metrics = Metrics(enabled=METRICS_CONFIG['enabled'])
+
+# Per-request profiles written to a rotating directory, listed on /api/profiles
+request_profiler = RequestProfiler(
+    directory=PROFILING_CONFIG['directory'],
+    enabled=PROFILING_CONFIG['enabled'],
+    sample_rate=PROFILING_CONFIG['sample_rate'],
+    token=PROFILING_CONFIG['token'],
+    mode=PROFILING_CONFIG['mode'],
+    interval_ms=PROFILING_CONFIG['interval_ms'],
+    max_profiles=PROFILING_CONFIG['max_profiles']
+)
+
+# Shared cache for Visual Crossing timeline days
+timeline_cache = TimelineCache(
+    max_bytes=CACHE_CONFIG['max_bytes'],
+    ttl_seconds=CACHE_CONFIG['ttl_seconds'],
+    disk_dir=CACHE_CONFIG['disk_dir']
+)
+
+# Model outputs per quantized feature vector, cleared on model reload
+prediction_memo = PredictionMemo(max_entries=CACHE_CONFIG['prediction_memo_max_entries'])
+
+# Parsed hourly days as float64 arrays, shared by every route
+day_store = DayStore(
+    max_entries=CACHE_CONFIG['day_store_max_entries'],
+    ttl_seconds=CACHE_CONFIG['ttl_seconds']
+)
+
+# Shared pool for parallel span fetches (/api/predict_batch and the streaming weekly route)
+batch_executor = ThreadPoolExecutor(max_workers=BATCH_CONFIG['max_concurrent_upstream'],
+                                    thread_name_prefix='batch-fetch')
+
+# Concurrent fetches of the same (or an enclosing) timeline span share one upstream call
+upstream_single_flight = SingleFlight()
+
+# Daily record budget shared by the workers through a locked state file
+quota_budget = QuotaBudget(
+    daily_limit=QUOTA_CONFIG['daily_records'],
+    state_path=QUOTA_CONFIG['state_path'],
+    conserve_fraction=QUOTA_CONFIG['conserve_fraction']
+)
+
+# Precomputed forecasts for the hot window, read by the API routes first
+prediction_store = PredictionStore(max_age_seconds=PREWARM_CONFIG['max_age_seconds'])
+
+# Pooled, timeout-bounded client used for every Visual Crossing call
+upstream_client = UpstreamClient(
+    pool_size=UPSTREAM_CONFIG['pool_size'],
+    connect_timeout=UPSTREAM_CONFIG['connect_timeout'],
+    read_timeout=UPSTREAM_CONFIG['read_timeout'],
+    max_retries=UPSTREAM_CONFIG['max_retries'],
+    backoff_base=UPSTREAM_CONFIG['backoff_base'],
+    backoff_max=UPSTREAM_CONFIG['backoff_max'],
+    breaker=CircuitBreaker(
+        failure_threshold=UPSTREAM_CONFIG['breaker_failure_threshold'],
+        reset_timeout=UPSTREAM_CONFIG['breaker_reset_timeout']
+    ),
+    metrics=metrics
+)
 
 # =====================================================================================
 # UTILITY FUNCTIONS
@@ -219,6 +537,170 @@ def create_error_response(message, status_code=404):
 # WEATHER DATA PROCESSING
 # =====================================================================================
 
+# URL timeline visual crossing; rentang tanggal ditulis sbg /awal/akhir
+def build_timeline_url(location, start_date_str, end_date_str, include, elements):
+    """Build a Visual Crossing timeline URL for a single date or a date range."""
+    date_path = start_date_str if end_date_str in (None, start_date_str) else f"{start_date_str}/{end_date_str}"
+    return (f"{VISUAL_CROSSING_BASE_URL}/{quote(location, safe=',')}/{date_path}?key={VISUAL_CROSSING_API_KEY}"
+            f"&unitGroup=metric&include={include}&elements={elements}&contentType=json")
+
+# hari yg sdh ada di cache tidak diminta ulang; sisanya diambil per rentang berurutan (hari di antaranya tidak ditagih lagi)
+def fetch_timeline(location, start_date_str, end_date_str=None, include='hours', elements=DAY_STORE_ELEMENTS,
+                   background=False):
+    """
+    Fetch timeline days, serving cached days and requesting only the missing spans.
+    
+    When the daily quota refuses a span, expired cached days are served
+    instead; the error is raised only if none of the span's days are cached.
+    
+    Args:
+        background (bool): Pre-warm fetch; charged with background priority and
+            never answered from expired cache days
+    
+    Raises:
+        requests.exceptions.RequestException: On network or HTTP errors
+    
+    Returns:
+        dict: Payload with a 'days' list ordered by date
+    """
+    date_strs = dates_between(start_date_str, end_date_str or start_date_str)
+    days_by_date = {}
+    missing_dates = []
+
+    for date_str in date_strs:
+        cached_day = timeline_cache.get((location, date_str, include, elements))
+        if cached_day is None:
+            missing_dates.append(date_str)
+        else:
+            days_by_date[date_str] = cached_day
+
+    for span_dates in group_contiguous_dates(missing_dates):
+        span_key = (location, span_dates[0], span_dates[-1], include, elements)
+        try:
+            fetched_days = fetch_span_coalesced(span_key, background)
+        except QuotaExceededError:
+            if background:
+                raise
+            fetched_days = read_stale_days(location, span_dates, include, elements)
+            if not fetched_days:
+                raise
+        for date_str, day in fetched_days.items():
+            days_by_date.setdefault(date_str, day)
+
+    return {"days": [days_by_date[date_str] for date_str in date_strs if date_str in days_by_date]}
+
+def fetch_span_coalesced(span_key, background=False):
+    """Fetch a span once, joining an in-flight fetch of the same or an enclosing span."""
+    location, start_date_str, end_date_str, include, elements = span_key
+    try:
+        # tanggal ISO bisa dibandingkan sbg string
+        joined, fetched_days = upstream_single_flight.join(
+            lambda key: key[0] == location and key[3:] == (include, elements)
+            and key[1] <= start_date_str and end_date_str <= key[2]
+        )
+        if not joined:
+            fetched_days = upstream_single_flight.do(span_key, lambda: fetch_and_cache_span(*span_key, background))
+    except QuotaExceededError as e:
+        # fetch yg di-join bisa berupa pre-warm yg ditolak saat kuota 'conserve'; request pengguna memesan sendiri
+        if background or not e.background:
+            raise
+        fetched_days = fetch_and_cache_span(*span_key)
+    return {date_str: day for date_str, day in fetched_days.items() if start_date_str <= date_str <= end_date_str}
+
+def read_stale_days(location, date_strs, include, elements):
+    """Expired cached days for dates upstream cannot be asked about (quota exhausted)."""
+    days_by_date = {}
+    for date_str in date_strs:
+        day = timeline_cache.get_stale((location, date_str, include, elements))
+        if day is not None:
+            days_by_date[date_str] = day
+    return days_by_date
+
+def fetch_and_cache_span(location, start_date_str, end_date_str, include, elements, background=False):
+    """Fetch a date span from Visual Crossing and store each returned day in the cache."""
+    fetched = fetch_timeline_from_vc(location, start_date_str, end_date_str, include, elements, background)
+    span_dates = set(dates_between(start_date_str, end_date_str))
+    days_by_date = {}
+
+    for date_str, day in split_days_by_date(fetched).items():
+        if date_str in span_dates:
+            timeline_cache.put((location, date_str, include, elements), day, date_str)
+            days_by_date[date_str] = day
+
+    return days_by_date
+
+def fetch_timeline_from_vc(location, start_date_str, end_date_str, include, elements, background=False):
+    """
+    Fetch a timeline payload from Visual Crossing, charged to the daily quota.
+    
+    Args:
+        background (bool): Pre-warm fetch; refused first when the quota runs low
+    
+    Raises:
+        requests.exceptions.RequestException: On network or HTTP errors, while
+            the circuit breaker is open, or QuotaExceededError when the budget is spent
+    
+    Returns:
+        dict: Parsed JSON payload
+    """
+    url_vc = build_timeline_url(location, start_date_str, end_date_str, include, elements)
+    cost = reserve_upstream_records(start_date_str, end_date_str, include, background)
+    try:
+        with metrics.stage('upstream_fetch'):
+            fetched = upstream_client.get_json(url_vc, name=f"timeline_{include}")
+    except BaseException:
+        quota_budget.settle(cost, 0)
+        raise
+    settle_upstream_records(cost, fetched)
+    return fetched
+
+def reserve_upstream_records(start_date_str, end_date_str, include, background=False):
+    """
+    Reserve the estimated records of a timeline call in the daily budget.
+    
+    Raises:
+        QuotaExceededError: If the call does not fit the remaining budget
+    
+    Returns:
+        int: Reserved records, to be passed to settle_upstream_records
+    """
+    cost = estimate_record_cost(len(dates_between(start_date_str, end_date_str)), include)
+    quota_budget.reserve(cost, background=background)
+    return cost
+
+def settle_upstream_records(cost, fetched):
+    """Replace the reservation by the queryCost visual crossing reports for the call."""
+    actual = (fetched or {}).get('queryCost') if isinstance(fetched, dict) else None
+    quota_budget.settle(cost, actual if isinstance(actual, int) else cost)
+
+def split_days_by_date(timeline_data):
+    """Index the 'days' entries of a timeline payload by their date string."""
+    return {day.get('datetime'): day for day in (timeline_data or {}).get('days') or []}
+
+def date_range_strings(start_date, num_days):
+    """List (date, date_str) pairs for consecutive days."""
+    dates = [start_date + timedelta(days=i) for i in range(num_days)]
+    return [(d, d.strftime('%Y-%m-%d')) for d in dates]
+
+def group_contiguous_dates(date_strs):
+    """Split sorted date strings into runs of consecutive days."""
+    spans = []
+    previous = None
+    for date_str in date_strs:
+        current = datetime.strptime(date_str, '%Y-%m-%d').date()
+        if previous is not None and (current - previous).days == 1:
+            spans[-1].append(date_str)
+        else:
+            spans.append([date_str])
+        previous = current
+    return spans
+
+def dates_between(start_date_str, end_date_str):
+    """List date strings from start to end (inclusive)."""
+    start_date = datetime.strptime(start_date_str, '%Y-%m-%d').date()
+    end_date = datetime.strptime(end_date_str, '%Y-%m-%d').date()
+    return [date_str for _, date_str in date_range_strings(start_date, (end_date - start_date).days + 1)]
+
 # mengambil data cuaca dari visual crossing API, error handling yg comprehensive
 def get_weather_data_from_vc(target_date_str, location=None):
     """
@@ -231,21 +713,26 @@ def get_weather_data_from_vc(target_date_str, location=None):
     Returns:
         tuple: (weather_data_dict, error_message)
     """
+    return get_weather_data_range_from_vc([target_date_str], location)[target_date_str]
+
+def get_weather_data_range_from_vc(date_strs, location=None):
+    """
+    Fetch daily weather data for consecutive dates with one range request.
+    
+    Args:
+        date_strs (list): Consecutive dates in YYYY-MM-DD format
+        location (str): Location string (optional)
+    
+    Returns:
+        dict: date_str -> (weather_data_dict, error_message)
+    """
     if location is None:
         location = MODEL_CONFIG['default_location']
-    
-    url_elements = "datetime,tempmax,tempmin,temp,humidity,windspeed,windgust,precip,preciptype,conditions,cloudcover,pressure,visibility,dewpoint,solarradiation,solarenergy,uvindex,description"
-    url_vc = f"{VISUAL_CROSSING_BASE_URL}/{location}/{target_date_str}?key={VISUAL_CROSSING_API_KEY}&unitGroup=metric&include=days&elements={url_elements}&contentType=json"
 
     try:
-        response_vc = requests.get(url_vc)
-        response_vc.raise_for_status()
-        weather_data_from_vc = response_vc.json()
-
-        if not weather_data_from_vc.get('days'):
-            return None, "Tidak ada data cuaca yang ditemukan untuk tanggal ini"
-
-        return weather_data_from_vc['days'][0], None
+        days_by_date = split_days_by_date(
+            fetch_timeline(location, date_strs[0], date_strs[-1], include='days', elements=DAILY_ELEMENTS)
+        )
 
     except requests.exceptions.HTTPError as e:
         status_code = e.response.status_code
@@ -253,10 +740,24 @@ def get_weather_data_from_vc(target_date_str, location=None):
             401: "API Key Visual Crossing tidak valid atau kuota habis",
             404: "Data cuaca tidak ditemukan untuk tanggal ini"
         }
-        return None, error_messages.get(status_code, f"Error dari Visual Crossing API (HTTP {status_code})")
+        error = error_messages.get(status_code, f"Error dari Visual Crossing API (HTTP {status_code})")
+        return {date_str: (None, error) for date_str in date_strs}
+
+    except QuotaExceededError as e:
+        return {date_str: (None, str(e)) for date_str in date_strs}
     
     except Exception as e:
-        return None, f"Kesalahan saat mengambil data cuaca: {str(e)}"
+        error = f"Kesalahan saat mengambil data cuaca: {str(e)}"
+        return {date_str: (None, error) for date_str in date_strs}
+
+    results = {}
+    for date_str in date_strs:
+        day = days_by_date.get(date_str)
+        if day:
+            results[date_str] = (day, None)
+        else:
+            results[date_str] = (None, "Tidak ada data cuaca yang ditemukan untuk tanggal ini")
+    return results
 
 def get_hourly_based_daily_prediction(target_date_str, location=None):
     """
@@ -269,53 +770,148 @@ def get_hourly_based_daily_prediction(target_date_str, location=None):
     Returns:
         tuple: (processed_data_dict, error_message)
     """
+    return get_hourly_based_daily_predictions([target_date_str], location)[target_date_str]
+
+# satu request rentang tanggal utk beberapa hari, lalu dipecah per hari
+def get_hourly_based_daily_predictions(date_strs, location=None):
+    """
+    Fetch hourly data for consecutive dates in one request and process each day.
+    
+    Args:
+        date_strs (list): Consecutive dates in YYYY-MM-DD format
+        location (str): Location string (optional)
+    
+    Returns:
+        dict: date_str -> (processed_data_dict, error_message)
+    """
     if location is None:
         location = MODEL_CONFIG['default_location']
-    
-    url_elements = "datetime,temp,humidity,windspeed,windgust,precip,preciptype,conditions,cloudcover,pressure,visibility,dewpoint,solarradiation,uvindex,description"
-    url_vc = f"{VISUAL_CROSSING_BASE_URL}/{location}/{target_date_str}?key={VISUAL_CROSSING_API_KEY}&unitGroup=metric&include=hours&elements={url_elements}&contentType=json"
 
     try:
-        response = requests.get(url_vc)
-        response.raise_for_status()
-        data = response.json()
+        frames = fetch_day_frames(date_strs, location)
+    except Exception as e:
+        error = describe_hourly_fetch_error(e)
+        return {date_str: (None, error) for date_str in date_strs}
+
+    return {date_str: select_daily_from_frame(frames.get(date_str), date_str) for date_str in date_strs}
 
-        if not data.get("days") or not data["days"][0].get("hours"):
-            return None, "Data per jam tidak tersedia untuk tanggal ini"
+# semua route membaca data per jam dari day store (array float64 per hari)
+def fetch_day_frames(date_strs, location=None):
+    """
+    Get hourly DayFrames, fetching days missing from the day store in one request.
+    
+    Raises:
+        requests.exceptions.RequestException: When the upstream request fails
+    
+    Returns:
+        dict: date_str -> DayFrame, or the exception raised while parsing that day
+    """
+    if location is None:
+        location = MODEL_CONFIG['default_location']
+
+    frames = {}
+    missing_dates = []
+    for date_str in date_strs:
+        frame = day_store.get(location, date_str)
+        if frame is None:
+            missing_dates.append(date_str)
+        else:
+            frames[date_str] = frame
+
+    if missing_dates:
+        fetched = fetch_timeline(location, missing_dates[0], missing_dates[-1],
+                                 include='hours', elements=DAY_STORE_ELEMENTS)
+        frames.update(build_day_frames(location, missing_dates, split_days_by_date(fetched)))
+
+    return frames
+
+def build_day_frames(location, date_strs, days_by_date):
+    """
+    Convert fetched timeline days into DayFrames and add them to the day store.
+    
+    Args:
+        days_by_date (dict): date_str -> timeline day, or an exception for that day
+    
+    Returns:
+        dict: date_str -> DayFrame or exception (days without hours are omitted)
+    """
+    frames = {}
+    for date_str in date_strs:
+        day = days_by_date.get(date_str)
+        if isinstance(day, Exception):
+            frames[date_str] = day
+            continue
+        if not day or not day.get("hours"):
+            continue
+
+        try:
+            with metrics.stage('day_frame_build'):
+                frame = DayFrame.from_timeline_day(day)
+        except Exception as e:
+            frames[date_str] = e
+            continue
+
+        day_store.put(location, frame)
+        frames[date_str] = frame
+
+    return frames
+
+def describe_hourly_fetch_error(exc):
+    """Map an hourly fetch exception to the per-day error message."""
+    metrics.count('weather_errors_total', kind='upstream_day')
+    if isinstance(exc, QuotaExceededError):
+        return str(exc)
+    if isinstance(exc, requests.exceptions.HTTPError):
+        return f"Error dari API (HTTP {exc.response.status_code})"
+    return f"Kesalahan saat ambil data per jam: {str(exc)}"
+
+def select_daily_from_frame(frame, target_date_str):
+    """
+    Reduce one day's hourly data to the row used for daily prediction.
+    
+    Args:
+        frame: DayFrame, exception raised while fetching the day, or None
+    
+    Returns:
+        tuple: (processed_data_dict, error_message)
+    """
+    if isinstance(frame, Exception):
+        return None, describe_hourly_fetch_error(frame)
 
-        hours = data["days"][0]["hours"]
+    if frame is None or not len(frame):
+        return None, "Data per jam tidak tersedia untuk tanggal ini"
 
+    try:
         # Try to find noon data (12:00)
-        noon_data = next((h for h in hours if h["datetime"].startswith("12:00")), None)
+        noon_row = frame.find_hour("12:00")
 
-        if noon_data:
-            selected = noon_data
+        if noon_row is not None:
+            selected = frame.record(noon_row)
         else:
             # Fallback: calculate average of all hours
-            selected = calculate_hourly_average(hours)
-            selected["conditions"] = hours[0].get("conditions", "")
-            selected["description"] = hours[0].get("description", "")
+            selected = calculate_hourly_average(frame)
+            selected["conditions"] = frame.conditions[0]
+            selected["description"] = frame.descriptions[0]
             selected["datetime"] = target_date_str
 
-        processed_data = process_hourly_data(selected, target_date_str)
-        return processed_data, None
+        return process_hourly_data(selected, target_date_str), None
 
-    except requests.exceptions.HTTPError as e:
-        return None, f"Error dari API (HTTP {e.response.status_code})"
     except Exception as e:
         return None, f"Kesalahan saat ambil data per jam: {str(e)}"
 
-def calculate_hourly_average(hours):
-    """Calculate average values from hourly data."""
-    selected = {}
+def calculate_hourly_average(frame):
+    """Calculate average values from hourly data (column means ignoring missing values)."""
     numeric_keys = ["temp", "humidity", "windspeed", "windgust", "precip",
                    "cloudcover", "pressure", "visibility", "solarradiation", "uvindex"]
     
-    for key in numeric_keys:
-        values = [h.get(key, 0) for h in hours if h.get(key) is not None]
-        selected[key] = round(sum(values) / len(values), 2) if values else 0
+    values = frame.columns(numeric_keys)
+    counts = np.count_nonzero(~np.isnan(values), axis=0)
+    totals = np.nansum(values, axis=0)
     
-    return selected
+    return {
+        key: round(float(total) / int(count), 2) if count else 0
+        for key, total, count in zip(numeric_keys, totals, counts)
+    }
 
 def process_hourly_data(selected, target_date_str):
     """Process hourly data into standardized format."""
@@ -352,72 +948,214 @@ def predict_with_your_model(weather_data_for_day):
     Returns:
         tuple: (condition_for_background, model_prediction_detail, probability)
     """
+    result = predict_batch([weather_data_for_day])[0]
+    return result.condition, result.detail, result.probability
+
+# hasil prediksi satu baris; label, probabilitas dan detail berasal dari satu kali evaluasi model
+class PredictionResult:
+    """Prediction outcome for one weather row, derived from a single model pass."""
+
+    __slots__ = ('condition_info', 'weather_data', 'probability', 'message')
+
+    def __init__(self, condition_info, weather_data, probability=None, message=None):
+        self.condition_info = condition_info
+        self.weather_data = weather_data
+        self.probability = probability
+        self.message = message
+
+    @property
+    def condition(self):
+        return self.condition_info['condition']
+
+    @property
+    def label(self):
+        return self.condition_info['label']
+
+    @property
+    def detail(self):
+        if self.message is not None:
+            return self.message
+        return build_model_detail_string(self.condition_info, self.weather_data, self.probability)
+
+# prediksi banyak baris sekaligus: satu matriks, satu kali scaling, satu kali evaluasi model
+def predict_batch(weather_rows, input_matrix=None):
+    """
+    Predict weather conditions for many rows in a single model call.
+    
+    Args:
+        weather_rows (list): List of weather data dictionaries
+        input_matrix (ndarray): Model features for the rows, already in
+            feature-column order (optional; built from weather_rows if omitted)
+    
+    Returns:
+        list: One PredictionResult per row
+    """
+    if not weather_rows:
+        return []
+
     # Fallback if model or scaler not loaded
-    if svm_model is None or scaler is None:
-        conditions_vc = weather_data_for_day.get('conditions', '').lower()
-        translated_condition = translate_condition_to_indonesian(conditions_vc)
-        return translated_condition.lower(), f"Model tidak tersedia. Prediksi dummy: {translated_condition}.", None
+    bundle = active_model_bundle()
+    if bundle is None:
+        metrics.count('weather_model_fallbacks_total', len(weather_rows), reason='no_model')
+        return [predict_dummy(row) for row in weather_rows]
 
     try:
-        # Get feature columns from model or use default
-        if hasattr(svm_model, "feature_names_in_"):
-            feature_columns = list(svm_model.feature_names_in_)
-        else:
-            feature_columns = MODEL_CONFIG['feature_columns']
+        feature_columns = bundle.feature_columns
 
-        # Prepare input data
-        input_data = prepare_model_input(weather_data_for_day, feature_columns)
-        
-        # Scale data
-        input_data_scaled = scaler.transform(input_data)
-        input_data_scaled = pd.DataFrame(input_data_scaled, columns=feature_columns)
-        
-        # Make prediction
-        prediction_label = svm_model.predict(input_data_scaled)[0]
-        
-        # Process prediction results
-        condition_info = get_prediction_info(prediction_label)
-        model_detail = build_model_detail_string(condition_info, weather_data_for_day)
-        
-        # Get probability if available
-        probability = get_prediction_probability(input_data_scaled) if model_proba_enabled else None
-        
-        return condition_info['condition'], model_detail, probability
+        # Prepare input matrix; rows with missing values are reported as failed
+        if input_matrix is None:
+            with metrics.stage('feature_matrix'):
+                input_matrix = prepare_model_matrix(weather_rows, feature_columns)
+        valid_rows = np.isfinite(input_matrix).all(axis=1)
+        if not valid_rows.all():
+            metrics.count('weather_model_fallbacks_total', int((~valid_rows).sum()), reason='incomplete_input')
+
+        results = [None] * len(weather_rows)
+        for index in np.flatnonzero(~valid_rows):
+            results[index] = create_failed_prediction(
+                weather_rows[index],
+                f"Input tidak lengkap untuk fitur model ({', '.join(feature_columns)})"
+            )
+
+        if valid_rows.any():
+            # Scale and predict (label and probability from the same kernel pass)
+            outputs = memoized_evaluate(input_matrix[valid_rows], bundle)
+
+            for (label, probability), index in zip(outputs, np.flatnonzero(valid_rows)):
+                results[index] = PredictionResult(bundle.label_info(label), weather_rows[index], probability)
+
+        return results
 
     except Exception as e:
         print(f"Kesalahan saat menjalankan prediksi model: {e}")
-        return "berawan", f"Gagal menjalankan model prediksi: {str(e)}", None
-
-def prepare_model_input(weather_data, feature_columns):
-    """Prepare weather data for model input."""
-    features_dict = {col: weather_data.get(col, 0) for col in feature_columns}
-    return pd.DataFrame([features_dict], columns=feature_columns)
-
-def get_prediction_info(prediction_label):
-    """Get prediction information based on label."""
-    return PREDICTION_LABELS.get(prediction_label, {
-        'condition': 'default',
-        'label': f'Kondisi tidak spesifik (kode: {prediction_label})',
-        'description': ''
-    })
+        metrics.count('weather_errors_total', kind='model')
+        metrics.count('weather_model_fallbacks_total', len(weather_rows), reason='model_error')
+        return [create_failed_prediction(row, str(e)) for row in weather_rows]
+
+def evaluate_model(input_matrix, bundle):
+    """
+    Run the SVM once over a raw (unscaled) batch.
+    
+    The engine scales the rows, evaluates the kernel once and derives both
+    labels and, when the model supports it, the class probabilities. Labels
+    are the one-vs-one vote (as svm_model.predict) and the probabilities
+    come from the same decision values. Each step is timed as a metrics stage.
+    
+    Returns:
+        tuple: (labels, max_probabilities_in_percent or None)
+    """
+    labels, class_probabilities = bundle.engine.evaluate(input_matrix, stage=metrics.stage)
+    if class_probabilities is None:
+        return labels, None
+    return labels, [round(float(p) * 100, 2) for p in np.max(class_probabilities, axis=1)]
 
-def get_prediction_probability(input_data_scaled):
-    """Get prediction probability from model."""
+# baris malam hari (uvindex 0, solarradiation 0, visibility 10) sangat sering berulang
+def memoized_evaluate(input_matrix, bundle):
+    """
+    Run evaluate_model only for feature vectors not seen before.
+    
+    Only the memo key is quantized (to `prediction_memo_decimals`); the
+    model always runs on the original rows. Rows sharing a key within the
+    batch are evaluated once.
+    
+    Returns:
+        list: (label, probability_in_percent or None) per row
+    """
+    if not prediction_memo.enabled:
+        labels, probabilities = evaluate_model(input_matrix, bundle)
+        return [(label, probabilities[i] if probabilities is not None else None) for i, label in enumerate(labels)]
+
+    # + 0.0 menyamakan -0.0 dgn 0.0 agar kuncinya sama
+    quantized = np.round(input_matrix, CACHE_CONFIG['prediction_memo_decimals']) + 0.0
+    row_bytes = np.ascontiguousarray(quantized).view(np.dtype((np.void, quantized.shape[1] * quantized.itemsize)))
+    keys = [(bundle.version, key) for key in row_bytes.ravel().tolist()]
+    outputs = prediction_memo.get_many(keys)
+
+    pending = {}
+    for index, output in enumerate(outputs):
+        if output is None:
+            pending.setdefault(keys[index], index)
+
+    if pending:
+        rows = list(pending.values())
+        labels, probabilities = evaluate_model(input_matrix[rows], bundle)
+        computed = {keys[row]: (labels[position], probabilities[position] if probabilities is not None else None)
+                    for position, row in enumerate(rows)}
+        prediction_memo.put_many(computed.items())
+        prediction_memo.count_deduplicated(sum(output is None for output in outputs) - len(rows))
+        outputs = [output if output is not None else computed[key] for output, key in zip(outputs, keys)]
+
+    return outputs
+
+def predict_dummy(weather_data):
+    """Fallback prediction based on Visual Crossing conditions."""
+    conditions_vc = (weather_data.get('conditions') or '').lower()
+    translated_condition = translate_condition_to_indonesian(conditions_vc)
+    condition_info = {
+        'condition': translated_condition.lower(),
+        'label': translated_condition,
+        'description': ''
+    }
+    return PredictionResult(condition_info, weather_data,
+                            message=f"Model tidak tersedia. Prediksi dummy: {translated_condition}.")
+
+def create_failed_prediction(weather_data, error_message):
+    """Create prediction result for rows the model could not evaluate."""
+    return PredictionResult(PREDICTION_LABELS[0], weather_data,
+                            message=f"Gagal menjalankan model prediksi: {error_message}")
+
+def frame_model_matrix(frame, rows):
+    """Model input for selected rows of a DayFrame, or None if the model needs other columns."""
+    bundle = active_model_bundle()
+    if bundle is None:
+        return None
     try:
-        probabilities = svm_model.predict_proba(input_data_scaled)
-        return round(np.max(probabilities) * 100, 2)
-    except Exception as e:
-        print(f"Error getting probability: {e}")
+        with metrics.stage('feature_matrix'):
+            return frame.columns(bundle.feature_columns, rows)
+    except KeyError:
         return None
 
-def build_model_detail_string(condition_info, weather_data):
+def predict_frame_hours(selections):
+    """
+    Predict selected hours of many day frames with a single model call.
+    
+    Args:
+        selections (list): (frame, rows, hour_predictions) tuples, where
+            hour_predictions is a pre-warmed per-hour list or None
+    
+    Returns:
+        list: Per selection, a list of (hour_record, PredictionResult) pairs
+    """
+    pending = [(frame, rows) for frame, rows, hour_predictions in selections if hour_predictions is None]
+    records = [frame.record(row) for frame, rows in pending for row in rows]
+    matrices = [frame_model_matrix(frame, rows) for frame, rows in pending]
+    input_matrix = np.vstack(matrices) if matrices and all(m is not None for m in matrices) else None
+    computed = iter(predict_batch(records, input_matrix) if records else [])
+    records = iter(records)
+
+    results = []
+    for frame, rows, hour_predictions in selections:
+        if hour_predictions is not None:
+            results.append([(frame.record(row), hour_predictions[row]) for row in rows])
+        else:
+            results.append([(next(records), next(computed)) for _ in rows])
+    return results
+
+def prepare_model_matrix(weather_rows, feature_columns):
+    """Prepare weather rows as a float matrix for model input (missing values become NaN)."""
+    matrix = np.empty((len(weather_rows), len(feature_columns)), dtype=np.float64)
+    for row_index, weather_data in enumerate(weather_rows):
+        for col_index, col in enumerate(feature_columns):
+            value = weather_data.get(col, 0)
+            matrix[row_index, col_index] = np.nan if value is None else value
+    return matrix
+
+def build_model_detail_string(condition_info, weather_data, probability=None):
     """Build detailed model prediction string."""
     model_detail = f"Prediksi Model: {condition_info['label']}"
     
-    if model_proba_enabled:
-        probability = get_prediction_probability(None)  # This needs to be passed properly
-        if probability:
-            model_detail += f" (Probabilitas: {probability}%)"
+    if probability:
+        model_detail += f" (Probabilitas: {probability}%)"
     
     model_detail += f" {condition_info['description']}"
     model_detail += (f" (Suhu: {weather_data.get('temp', 'N/A')}°C, "
@@ -426,6 +1164,84 @@ def build_model_detail_string(condition_info, weather_data):
     
     return model_detail
 
+# =====================================================================================
+# FORECAST PRE-WARMING
+# =====================================================================================
+
+# mengambil jendela hari ini s/d 7 hari ke depan sekali, lalu semua jam diprediksi dlm satu batch
+def refresh_prediction_store():
+    """Refresh the hot forecast window from upstream and precompute every prediction."""
+    location = MODEL_CONFIG['default_location']
+    date_strs = [date_str for _, date_str in date_range_strings(datetime.now().date(), PREWARM_CONFIG['days'])]
+
+    # lewat cache: hari yg masih segar tidak diminta ulang; background=True menunda refresh saat kuota menipis
+    fetched = fetch_timeline(location, date_strs[0], date_strs[-1], 'hours', DAY_STORE_ELEMENTS, background=True)
+    days_by_date = split_days_by_date(fetched)
+
+    # Parse every day into the day store
+    frames = build_day_frames(location, date_strs, days_by_date)
+
+    prepared = []
+    for date_str in date_strs:
+        daily_data, error = select_daily_from_frame(frames.get(date_str), date_str)
+        if not error:
+            prepared.append((date_str, daily_data, frames[date_str]))
+
+    # One model pass over every daily row and every hour in the window
+    rows = [daily_data for _, daily_data, _ in prepared]
+    for _, _, frame in prepared:
+        rows.extend(frame.record(row) for row in range(len(frame)))
+    predictions = predict_batch(rows)
+
+    entries = {}
+    offset = len(prepared)
+    for index, (date_str, daily_data, frame) in enumerate(prepared):
+        hour_predictions = predictions[offset:offset + len(frame)]
+        offset += len(frame)
+        entries[(location, date_str)] = ForecastEntry(daily_data, predictions[index], frame, hour_predictions)
+
+    prediction_store.replace(entries)
+
+def lookup_prewarmed_days(date_strs, location=None):
+    """
+    Collect pre-warmed daily data and predictions for the given dates.
+    
+    Returns:
+        tuple: (date_str -> (processed_data, None), date_str -> PredictionResult)
+    """
+    if location is None:
+        location = MODEL_CONFIG['default_location']
+
+    day_data, predictions = {}, {}
+    for date_str in date_strs:
+        entry = prediction_store.get(location, date_str)
+        if entry is not None:
+            day_data[date_str] = (entry.daily_data, None)
+            predictions[date_str] = entry.daily_prediction
+    return day_data, predictions
+
+forecast_prewarmer = ForecastPrewarmer(refresh_prediction_store, PREWARM_CONFIG['interval_seconds'])
+
+# scheduler dijalankan saat request pertama di tiap proses worker (aman utk gunicorn yg fork)
+@app.before_request
+def ensure_prewarmer_started():
+    """Start the background pre-warmer lazily in each worker process."""
+    if PREWARM_CONFIG['enabled']:
+        forecast_prewarmer.start()
+
+# Reloads the model once per finished export (the stamp is written after every artifact)
+model_watcher = ArtifactWatcher(
+    [MODEL_CONFIG['export_stamp_path']],
+    on_change=reload_model,
+    interval_seconds=MODEL_CONFIG['reload_poll_seconds']
+)
+
+@app.before_request
+def ensure_model_watcher_started():
+    """Start the artifact watcher lazily in each worker process."""
+    if MODEL_CONFIG['reload_watch']:
+        model_watcher.start()
+
 # =====================================================================================
 # STATIC FILE ROUTES
 # =====================================================================================
@@ -440,6 +1256,29 @@ def serve_static(path):
     """Serve static files."""
     return send_from_directory('.', path)
 
+def private_state_paths():
+    """Runtime data that must never be served as a static file, even when configured inside STATIC_ROOT."""
+    # lokasi lama (di dlm folder aplikasi) tetap ditolak, file sisa versi sebelumnya bisa masih ada
+    legacy_paths = [os.path.join(STATIC_ROOT, 'profiles'), os.path.join(STATIC_ROOT, 'quota_state.json')]
+    configured = [PROFILING_CONFIG['directory']] + ([QUOTA_CONFIG['state_path']] if QUOTA_CONFIG['state_path'] else [])
+    return configured + legacy_paths
+
+def is_private_static_path(path):
+    """True when a static URL path resolves into (or onto) one of private_state_paths()."""
+    resolved = os.path.realpath(os.path.join(STATIC_ROOT, path.lstrip('/')))
+    for private_path in private_state_paths():
+        private_path = os.path.realpath(private_path)
+        # private_path + '.' mencakup file pendamping (quota_state.json.lock, .<pid>.tmp)
+        if resolved == private_path or resolved.startswith((private_path + os.sep, private_path + '.')):
+            return True
+    return False
+
+# route statis flask ('static' dan serve_static) menyajikan seluruh folder aplikasi
+@app.before_request
+def refuse_private_static():
+    if request.endpoint in ('static', 'serve_static') and is_private_static_path(request.path):
+        return jsonify({"error": "File tidak ditemukan."}), 404
+
 # =====================================================================================
 # API ROUTES - WEATHER PREDICTION
 # =====================================================================================
@@ -457,16 +1296,34 @@ def predict_weather():
     if not validate_date_format(target_date_str):
         return jsonify({"error": "Format tanggal tidak valid. Gunakan YYYY-MM-DD."}), 400
 
+    # Serve from the pre-warmed store when the date is in the hot window
+    entry = prediction_store.get(MODEL_CONFIG['default_location'], target_date_str)
+    if entry is not None:
+        response_data, status_code = build_daily_prediction_response(
+            target_date_str, entry.daily_data, None, entry.daily_prediction
+        )
+        return jsonify(response_data), status_code
+
     # Get weather data using hourly prediction method
     processed_data, error = get_hourly_based_daily_prediction(target_date_str)
+    response_data, status_code = build_daily_prediction_response(target_date_str, processed_data, error)
+    return jsonify(response_data), status_code
+
+def build_daily_prediction_response(target_date_str, processed_data, error, prediction=None):
+    """
+    Build the /api/predict_weather response body.
     
+    Returns:
+        tuple: (response_dict, status_code)
+    """
     if error:
         error_response = create_error_response(error)
         error_response["visualCrossingData"]["datetime"] = target_date_str
-        return jsonify(error_response), 404
+        return error_response, 404
 
-    # Make prediction with model
-    predicted_condition, model_prediction_detail, probability = predict_with_your_model(processed_data)
+    # Make prediction with model unless it was precomputed
+    if prediction is None:
+        prediction = predict_batch([processed_data])[0]
 
     # Prepare response
     response_data = {
@@ -477,12 +1334,12 @@ def predict_weather():
             'conditions': processed_data.get('conditions', ''),
             'description': processed_data.get('description', '')
         },
-        "predictedCondition": predicted_condition,
-        "modelPredictionResult": model_prediction_detail,
-        "modelProbability": probability
+        "predictedCondition": prediction.condition,
+        "modelPredictionResult": prediction.detail,
+        "modelProbability": prediction.probability
     }
 
-    return jsonify(response_data)
+    return response_data, 200
 
 @app.route('/api/predict_weekly_weather')
 def predict_hourly_weather():
@@ -499,31 +1356,160 @@ def predict_hourly_weather():
             return jsonify({"error": "Format tanggal tidak valid. Gunakan YYYY-MM-DD."}), 400
         start_date = datetime.strptime(start_date_str, '%Y-%m-%d').date()
 
+    # Pre-warmed days are served from the store; the rest in one upstream request
+    week_dates = date_range_strings(start_date, WEEKLY_FORECAST_DAYS)
+    week_data, precomputed = lookup_prewarmed_days([date_str for _, date_str in week_dates])
+    missing_dates = [date_str for _, date_str in week_dates if date_str not in week_data]
+    if missing_dates:
+        week_data.update(get_hourly_based_daily_predictions(missing_dates))
+
+    return jsonify(build_weekly_forecast_response(start_date_str, week_dates, week_data, precomputed))
+
+def build_weekly_forecast_response(start_date_str, week_dates, week_data, precomputed=None):
+    """
+    Build the /api/predict_weekly_weather response body.
+    
+    Args:
+        start_date_str (str): First date of the forecast
+        week_dates (list): (date, date_str) pairs from date_range_strings
+        week_data (dict): date_str -> (processed_data_dict, error_message)
+        precomputed (dict): date_str -> PredictionResult already available (optional)
+    
+    Returns:
+        dict: Response body with weeklyForecast, status and errors
+    """
     # Generate hourly forecast (keeping 7-hour range for compatibility)
     hourly_forecast = []
     errors = []
 
-    for i in range(7):
-        current_date = start_date + timedelta(days=i)
-        current_date_str = current_date.strftime('%Y-%m-%d')
-        
-        # Get daily prediction data
-        processed_data, error = get_hourly_based_daily_prediction(current_date_str)
-        
+    for current_date_str, entry, error in build_weekly_entries(week_dates, week_data, precomputed):
         if error:
             errors.append(f"Tanggal {current_date_str}: {error}")
-            hourly_forecast.append(create_hourly_error_entry(current_date, current_date_str, error))
-        else:
-            hourly_forecast.append(create_hourly_success_entry(current_date, current_date_str, processed_data))
+        hourly_forecast.append(entry)
 
-    response_data = {
+    return {
         "status": "success" if not errors else "partial_success",
         "weeklyForecast": hourly_forecast,  # Keep same key name for JS compatibility
         "errors": errors if errors else None,
         "start_date": start_date_str
     }
 
-    return jsonify(response_data)
+def build_weekly_entries(week_dates, week_data, precomputed=None):
+    """
+    Build weekly forecast entries, predicting days without a precomputed result in one model call.
+    
+    Returns:
+        list: (date_str, entry_dict, error_message) per date, in the order of week_dates
+    """
+    precomputed = precomputed or {}
+    daily_data = [(d, date_str, *week_data[date_str]) for d, date_str in week_dates]
+
+    to_predict = [(date_str, data) for _, date_str, data, error in daily_data
+                  if not error and date_str not in precomputed]
+    predictions = dict(precomputed)
+    predictions.update(zip([date_str for date_str, _ in to_predict],
+                           predict_batch([data for _, data in to_predict])))
+
+    entries = []
+    for current_date, current_date_str, processed_data, error in daily_data:
+        if error:
+            entry = create_hourly_error_entry(current_date, current_date_str, error)
+        else:
+            entry = create_hourly_success_entry(current_date, current_date_str, processed_data,
+                                                predictions[current_date_str])
+        entries.append((current_date_str, entry, error))
+    return entries
+
+# versi streaming: tiap hari dikirim begitu siap, hari pertama tidak menunggu seluruh rentang
+@app.route('/api/predict_weekly_weather/stream')
+def predict_weekly_weather_stream():
+    """API endpoint streaming the 7-day forecast day by day as NDJSON or Server-Sent Events."""
+    start_date_str = request.args.get('date')
+    stream_format = request.args.get('format', 'ndjson')
+
+    if stream_format not in STREAM_FORMATS:
+        return jsonify({"error": "Parameter 'format' harus 'ndjson' atau 'sse'."}), 400
+
+    if not start_date_str:
+        start_date = datetime.now().date()
+        start_date_str = start_date.strftime('%Y-%m-%d')
+    else:
+        if not validate_date_format(start_date_str):
+            return jsonify({"error": "Format tanggal tidak valid. Gunakan YYYY-MM-DD."}), 400
+        start_date = datetime.strptime(start_date_str, '%Y-%m-%d').date()
+
+    week_dates = date_range_strings(start_date, WEEKLY_FORECAST_DAYS)
+    events = iter_weekly_forecast_events(start_date_str, week_dates)
+    return Response(encode_stream_events(events, stream_format), mimetype=STREAM_FORMATS[stream_format],
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+def iter_weekly_forecast_events(start_date_str, week_dates):
+    """
+    Yield weekly forecast events: one 'day' event per date as soon as it is ready, then a 'summary'.
+    
+    Pre-warmed days are emitted first. The first missing day is fetched on
+    its own, concurrently with one request for the remaining span, so the
+    first card does not wait for the whole week.
+    
+    Yields:
+        dict: {"type": "day", "index", "entry"} or {"type": "summary", "status", "errors", "start_date"}
+    """
+    week_data, precomputed = lookup_prewarmed_days([date_str for _, date_str in week_dates])
+    errors = {}
+
+    yield from build_weekly_day_events(week_dates, week_data, precomputed, errors)
+
+    futures = [batch_executor.submit(get_hourly_based_daily_predictions, group)
+               for group in split_first_missing_day(week_dates, week_data)]
+
+    for future in as_completed(futures):
+        yield from build_weekly_day_events(week_dates, future.result(), precomputed, errors)
+
+    yield build_weekly_summary_event(start_date_str, week_dates, errors)
+
+def split_first_missing_day(week_dates, week_data):
+    """Dates still to fetch, as [first missing day] and [remaining span] (empty groups dropped)."""
+    missing_dates = [date_str for _, date_str in week_dates if date_str not in week_data]
+    return [group for group in (missing_dates[:1], missing_dates[1:]) if group]
+
+def build_weekly_day_events(week_dates, day_data, precomputed, errors):
+    """
+    Build 'day' events for the dates present in day_data.
+    
+    Args:
+        errors (dict): Collects date_str -> error message for the summary event
+    
+    Returns:
+        list: {"type": "day", "index", "entry"} events
+    """
+    dated = [(index, pair) for index, pair in enumerate(week_dates) if pair[1] in day_data]
+    entries = build_weekly_entries([pair for _, pair in dated], day_data, precomputed)
+
+    events = []
+    for (index, _), (date_str, entry, error) in zip(dated, entries):
+        if error:
+            errors[date_str] = error
+        events.append({"type": "day", "index": index, "entry": entry})
+    return events
+
+def build_weekly_summary_event(start_date_str, week_dates, errors):
+    """Final stream event with the same status and errors as /api/predict_weekly_weather."""
+    error_list = [f"Tanggal {date_str}: {errors[date_str]}" for _, date_str in week_dates if date_str in errors]
+    return {
+        "type": "summary",
+        "status": "success" if not error_list else "partial_success",
+        "errors": error_list if error_list else None,
+        "start_date": start_date_str
+    }
+
+def encode_stream_events(events, stream_format):
+    """Serialize events as NDJSON lines or SSE messages (event name = the event's type)."""
+    for event in events:
+        payload = json.dumps(event)
+        if stream_format == 'sse':
+            yield f"event: {event['type']}\ndata: {payload}\n\n"
+        else:
+            yield payload + "\n"
 
 def create_hourly_error_entry(current_date, current_date_str, error):
     """Create error entry for hourly forecast."""
@@ -538,20 +1524,21 @@ def create_hourly_error_entry(current_date, current_date_str, error):
         "full_prediction": error,
     }
 
-def create_hourly_success_entry(current_date, current_date_str, processed_data):
+def create_hourly_success_entry(current_date, current_date_str, processed_data, prediction=None):
     """Create success entry for hourly forecast."""
-    predicted_condition, model_prediction_detail, probability = predict_with_your_model(processed_data)
+    if prediction is None:
+        prediction = predict_batch([processed_data])[0]
     
     return {
         "day": get_day_name_indonesian(current_date),
         "temp": processed_data.get("temp", 0),
-        "condition": predicted_condition,
-        "icon": get_weather_icon(predicted_condition),
+        "condition": prediction.condition,
+        "icon": get_weather_icon(prediction.condition),
         "date": current_date_str,
         "humidity": processed_data.get('humidity', 0),
         "windspeed": processed_data.get('windspeed', 0),
-        "full_prediction": model_prediction_detail,
-        "model_prob": probability
+        "full_prediction": prediction.detail,
+        "model_prob": prediction.probability
     }
 
 @app.route('/api/predict_hourly_weather')
@@ -567,51 +1554,561 @@ def predict_detailed_hourly_weather():
     if not validate_date_format(target_date_str):
         return jsonify({"error": "Format tanggal tidak valid. Gunakan YYYY-MM-DD."}), 400
 
-    # Prepare API URL for hourly data
-    url_elements = "datetime,temp,humidity,windspeed,feelslike,uvindex,visibility,pressure,conditions,description"
-    url_vc = f"{VISUAL_CROSSING_BASE_URL}/{MODEL_CONFIG['default_location']}/{target_date_str}?key={VISUAL_CROSSING_API_KEY}&unitGroup=metric&include=hours&elements={url_elements}&contentType=json"
+    # Serve from the pre-warmed store when the date is in the hot window
+    entry = prediction_store.get(MODEL_CONFIG['default_location'], target_date_str)
+    if entry is not None:
+        response_data, status_code = build_detailed_hourly_response(
+            entry.frame, hour, target_date_str, entry.hour_predictions
+        )
+        return jsonify(response_data), status_code
 
     try:
-        response = requests.get(url_vc)
-        response.raise_for_status()
-        data = response.json()
+        frame = fetch_day_frames([target_date_str]).get(target_date_str)
+        response_data, status_code = build_detailed_hourly_response(frame, hour, target_date_str)
+        return jsonify(response_data), status_code
+
+    except Exception as e:
+        return jsonify({"error": f"Gagal ambil data per jam: {str(e)}"}), 500
+
+def build_detailed_hourly_response(frame, start_hour, target_date_str, hour_predictions=None):
+    """
+    Build the /api/predict_hourly_weather response body from a day frame.
+    
+    Raises:
+        Exception: When the frame is an exception raised while fetching the day
+    
+    Returns:
+        tuple: (response_dict, status_code)
+    """
+    if isinstance(frame, Exception):
+        raise frame
+
+    if frame is None or not len(frame):
+        return {"error": "Data per jam tidak tersedia"}, 404
 
-        if not data.get("days") or not data["days"][0].get("hours"):
-            return jsonify({"error": "Data per jam tidak tersedia"}), 404
+    return {"hourlyForecast": process_hourly_forecast(frame, start_hour, target_date_str, hour_predictions)}, 200
 
-        hours = data["days"][0]["hours"]
-        selected_hours = process_hourly_forecast(hours, hour, target_date_str)
+def process_hourly_forecast(frame, start_hour, target_date_str, hour_predictions=None):
+    """Process hourly forecast data for selected time range (predictions may be precomputed per hour)."""
+    rows = frame.hour_rows(start_hour, start_hour + 5)
+    window = [frame.record(row) for row in rows]
 
-        return jsonify({"hourlyForecast": selected_hours})
+    if hour_predictions is not None:
+        predictions = [hour_predictions[row] for row in rows]
+    else:
+        # The selected rows of the day array go straight into the model
+        predictions = predict_batch(window, frame_model_matrix(frame, rows))
+    
+    return [build_hourly_entry(h, target_date_str, prediction) for h, prediction in zip(window, predictions)]
+
+def build_hourly_entry(hour_data, target_date_str, prediction):
+    """Create one hourly forecast entry in the /api/predict_hourly_weather format."""
+    h = hour_data
+    return {
+        "datetime": h["datetime"], 
+        "date": target_date_str, 
+        "temp": h.get("temp", 0),
+        "humidity": h.get("humidity", 0),
+        "windspeed": h.get("windspeed", 0),
+        "feelslike": h.get("feelslike", h.get("temp", 0)),
+        "uvindex": h.get("uvindex", 0),
+        "visibility": h.get("visibility", 10),
+        "pressure": h.get("pressure", 1013),
+        "condition": prediction.condition,
+        "description": h.get("description", ""),
+        "modelPredictionResult": prediction.detail
+    }
+
+@app.route('/api/predict_hourly_range')
+def predict_hourly_range():
+    """API endpoint returning every hour of a date range (up to 168 hours) in one call."""
+    params, error = parse_hourly_range_args(request.args)
+    if error:
+        return jsonify({"error": error}), 400
+
+    date_strs = params['date_strs']
+    location = MODEL_CONFIG['default_location']
+
+    # Pre-warmed days come with their hourly predictions already computed
+    frames, precomputed = {}, {}
+    for date_str in date_strs:
+        entry = prediction_store.get(location, date_str)
+        if entry is not None:
+            frames[date_str] = entry.frame
+            precomputed[date_str] = entry.hour_predictions
+
+    missing_dates = [date_str for date_str in date_strs if date_str not in frames]
+
+    try:
+        if missing_dates:
+            frames.update(fetch_day_frames(missing_dates, location))
+        return jsonify(build_hourly_range_response(params, frames, precomputed))
 
     except Exception as e:
         return jsonify({"error": f"Gagal ambil data per jam: {str(e)}"}), 500
 
-def process_hourly_forecast(hours, start_hour, target_date_str):
-    """Process hourly forecast data for selected time range."""
-    selected_hours = []
-    
-    for h in hours:
-        jam_int = int(h["datetime"].split(":")[0])
-        if start_hour <= jam_int < start_hour + 5:
-            predicted_condition, model_detail, prob = predict_with_your_model(h)
-
-            selected_hours.append({
-                "datetime": h["datetime"], 
-                "date": target_date_str, 
-                "temp": h.get("temp", 0),
-                "humidity": h.get("humidity", 0),
-                "windspeed": h.get("windspeed", 0),
-                "feelslike": h.get("feelslike", h.get("temp", 0)),
-                "uvindex": h.get("uvindex", 0),
-                "visibility": h.get("visibility", 10),
-                "pressure": h.get("pressure", 1013),
-                "condition": predicted_condition,
-                "description": h.get("description", ""),
-                "modelPredictionResult": model_detail
-            })
-    
-    return selected_hours
+def parse_hourly_range_args(args):
+    """
+    Validate the /api/predict_hourly_range query parameters.
+    
+    Args:
+        args: Query parameter mapping (date, days, hour_start, hour_end, fields)
+    
+    Returns:
+        tuple: (params_dict, error_message)
+    """
+    start_date_str = args.get('date')
+    if not start_date_str:
+        return None, "Parameter 'date' wajib."
+    if not validate_date_format(start_date_str):
+        return None, "Format tanggal tidak valid. Gunakan YYYY-MM-DD."
+
+    try:
+        num_days = int(args.get('days', 1))
+        hour_start = int(args.get('hour_start', 0))
+        hour_end = int(args.get('hour_end', 24))
+    except ValueError:
+        return None, "Parameter 'days', 'hour_start' dan 'hour_end' harus berupa angka."
+
+    if not 1 <= num_days <= HOURLY_RANGE_MAX_DAYS:
+        return None, f"Parameter 'days' harus antara 1 dan {HOURLY_RANGE_MAX_DAYS}."
+    if not 0 <= hour_start < hour_end <= 24:
+        return None, "Rentang jam tidak valid (0 <= hour_start < hour_end <= 24)."
+
+    fields = None
+    if args.get('fields'):
+        fields = [field.strip() for field in args.get('fields').split(',') if field.strip()]
+        unknown = [field for field in fields if field not in HOURLY_RANGE_FIELDS]
+        if unknown:
+            return None, f"Field tidak dikenal: {', '.join(unknown)}"
+
+    start_date = datetime.strptime(start_date_str, '%Y-%m-%d').date()
+    return {
+        'start_date_str': start_date_str,
+        'date_strs': [date_str for _, date_str in date_range_strings(start_date, num_days)],
+        'hour_start': hour_start,
+        'hour_end': hour_end,
+        'fields': fields
+    }, None
+
+def build_hourly_range_response(params, frames, precomputed=None):
+    """
+    Build the /api/predict_hourly_range response body.
+    
+    Hours of days without precomputed predictions are evaluated in one
+    model call across the whole range (see predict_frame_hours).
+    
+    Args:
+        params (dict): Parsed request parameters from parse_hourly_range_args
+        frames (dict): date_str -> DayFrame, or the exception raised for that day
+        precomputed (dict): date_str -> per-hour PredictionResult list (optional)
+    
+    Returns:
+        dict: Response body with the selected hours and per-day errors
+    """
+    precomputed = precomputed or {}
+    selected = []  # (date_str, frame, rows)
+    errors = []
+
+    for date_str in params['date_strs']:
+        frame = frames.get(date_str)
+        if isinstance(frame, Exception):
+            errors.append({"date": date_str, "error": describe_hourly_fetch_error(frame)})
+        elif frame is None or not len(frame):
+            errors.append({"date": date_str, "error": "Data per jam tidak tersedia"})
+        else:
+            selected.append((date_str, frame, frame.hour_rows(params['hour_start'], params['hour_end'])))
+
+    predicted = predict_frame_hours([(frame, rows, precomputed.get(date_str)) for date_str, frame, rows in selected])
+
+    hourly_forecast = []
+    for (date_str, _, _), hours in zip(selected, predicted):
+        for record, prediction in hours:
+            entry = build_hourly_entry(record, date_str, prediction)
+            if params['fields']:
+                entry = {field: entry[field] for field in params['fields']}
+            hourly_forecast.append(entry)
+
+    return {
+        "startDate": params['start_date_str'],
+        "days": len(params['date_strs']),
+        "hourStart": params['hour_start'],
+        "hourEnd": params['hour_end'],
+        "hourlyForecast": hourly_forecast,
+        "errors": errors
+    }
+
+@app.route('/api/predict_batch', methods=['POST'])
+def predict_batch_route():
+    """API endpoint predicting hours for many (location, date, hour range) items in one call."""
+    items, error = parse_batch_items(request.get_json(silent=True))
+    if error:
+        return jsonify({"error": error}), 400
+
+    frames, spans = plan_batch_fetches(items)
+    error, status = check_batch_budget(items, spans)
+    if error:
+        return jsonify({"error": error}), status
+
+    return jsonify(build_batch_response(items, fetch_batch_frames(frames, spans)))
+
+def parse_batch_items(payload):
+    """
+    Validate the /api/predict_batch request body.
+    
+    Args:
+        payload: Decoded JSON body, {"items": [{"location", "date", "hour_start", "hour_end"}], "fields": [...]}
+    
+    Returns:
+        tuple: (list of item dicts, error_message); invalid items carry their own 'error'
+    """
+    if not isinstance(payload, dict) or not isinstance(payload.get('items'), list):
+        return None, "Body JSON harus berisi list 'items'."
+    if not payload['items']:
+        return None, "List 'items' tidak boleh kosong."
+    if len(payload['items']) > BATCH_CONFIG['max_items']:
+        return None, f"Maksimal {BATCH_CONFIG['max_items']} item per request."
+
+    fields = payload.get('fields')
+    if fields is not None:
+        if not isinstance(fields, list) or any(field not in HOURLY_RANGE_FIELDS for field in fields):
+            return None, f"'fields' harus berupa list dari: {', '.join(HOURLY_RANGE_FIELDS)}"
+
+    items = []
+    for raw in payload['items']:
+        item = {'location': MODEL_CONFIG['default_location'], 'date': None,
+                'hour_start': 0, 'hour_end': 24, 'fields': fields, 'error': None}
+        if not isinstance(raw, dict):
+            item['error'] = "Item harus berupa object."
+            items.append(item)
+            continue
+
+        item['location'] = raw.get('location') or item['location']
+        item['date'] = raw.get('date')
+        try:
+            item['hour_start'] = int(raw.get('hour_start', 0))
+            item['hour_end'] = int(raw.get('hour_end', 24))
+        except (TypeError, ValueError):
+            item['error'] = "'hour_start' dan 'hour_end' harus berupa angka."
+
+        if item['error']:
+            pass
+        elif not isinstance(item['location'], str) or len(item['location']) > BATCH_CONFIG['max_location_length']:
+            item['error'] = "Lokasi tidak valid."
+        elif not isinstance(item['date'], str) or not validate_date_format(item['date']):
+            item['error'] = "Format tanggal tidak valid. Gunakan YYYY-MM-DD."
+        elif not 0 <= item['hour_start'] < item['hour_end'] <= 24:
+            item['error'] = "Rentang jam tidak valid (0 <= hour_start < hour_end <= 24)."
+        items.append(item)
+
+    return items, None
+
+# tanggal dikelompokkan per lokasi jadi rentang berurutan, tiap rentang diambil paralel
+def fetch_batch_frames(frames, spans):
+    """
+    Fetch day frames for every valid batch item.
+    
+    Spans from plan_batch_fetches are fetched concurrently, at most
+    BATCH_CONFIG['max_concurrent_upstream'] at once.
+    
+    Args:
+        frames (dict): Pre-warmed frames from plan_batch_fetches, completed in place
+        spans (list): (location, date span) pairs from plan_batch_fetches
+    
+    Returns:
+        dict: (location, date_str) -> (DayFrame or exception, hour_predictions or None)
+    """
+    futures = [(location, span, batch_executor.submit(fetch_day_frames, span, location)) for location, span in spans]
+
+    for location, span, future in futures:
+        try:
+            span_frames = future.result()
+        except Exception as e:
+            span_frames = {date_str: e for date_str in span}
+        for date_str in span:
+            frames[(location, date_str)] = (span_frames.get(date_str), None)
+
+    return frames
+
+def plan_batch_fetches(items):
+    """
+    Split batch items into pre-warmed days and per-location spans to fetch.
+    
+    Returns:
+        tuple: (pre-warmed frames dict as in fetch_batch_frames, list of (location, date span))
+    """
+    frames = {}
+    missing_by_location = {}
+
+    for item in items:
+        if item['error']:
+            continue
+        key = (item['location'], item['date'])
+        if key in frames:
+            continue
+        entry = prediction_store.get(*key)
+        if entry is not None:
+            frames[key] = (entry.frame, entry.hour_predictions)
+        else:
+            missing_by_location.setdefault(item['location'], set()).add(item['date'])
+
+    spans = [
+        (location, span[i:i + BATCH_CONFIG['max_span_days']])
+        for location, date_strs in missing_by_location.items()
+        for span in group_contiguous_dates(sorted(date_strs))
+        for i in range(0, len(span), BATCH_CONFIG['max_span_days'])
+    ]
+    return frames, spans
+
+def check_batch_budget(items, spans):
+    """
+    Refuse a batch before any upstream call when it is too expensive.
+    
+    Days already in the day store cost nothing; every other day is counted
+    as a full day of hourly records.
+    
+    Returns:
+        tuple: (error_message, http_status), or (None, None) when the batch may run
+    """
+    locations = {item['location'] for item in items if not item['error']}
+    if len(locations) > BATCH_CONFIG['max_locations']:
+        return f"Maksimal {BATCH_CONFIG['max_locations']} lokasi berbeda per request.", 413
+
+    records = sum(
+        estimate_record_cost(sum(not day_store.contains(location, date_str) for date_str in span), 'hours')
+        for location, span in spans
+    )
+    if records > BATCH_CONFIG['max_upstream_records']:
+        return (f"Batch membutuhkan sekitar {records} record Visual Crossing, "
+                f"maksimal {BATCH_CONFIG['max_upstream_records']} per request."), 413
+
+    remaining = quota_budget.remaining()
+    if remaining is not None and records > remaining:
+        return (f"Kuota harian Visual Crossing tidak cukup untuk batch ini "
+                f"({records} record diperlukan, sisa {remaining})."), 429
+    return None, None
+
+def build_batch_response(items, frames):
+    """
+    Build the /api/predict_batch response body, one result per item in request order.
+    
+    Args:
+        items (list): Parsed items from parse_batch_items
+        frames (dict): Result of fetch_batch_frames
+    
+    Returns:
+        dict: {"results": [...]} with 'hourlyForecast' or 'error' per item
+    """
+    results = []
+    selections = []
+
+    for item in items:
+        result = {"location": item['location'], "date": item['date'],
+                  "hourStart": item['hour_start'], "hourEnd": item['hour_end']}
+        results.append(result)
+
+        frame, hour_predictions = frames.get((item['location'], item['date']), (None, None))
+        if item['error']:
+            result["error"] = item['error']
+        elif isinstance(frame, Exception):
+            result["error"] = describe_hourly_fetch_error(frame)
+        elif frame is None or not len(frame):
+            result["error"] = "Data per jam tidak tersedia"
+        else:
+            rows = frame.hour_rows(item['hour_start'], item['hour_end'])
+            selections.append((result, item['fields'], (frame, rows, hour_predictions)))
+
+    # All hours of all items go through the model together
+    predicted = predict_frame_hours([selection for _, _, selection in selections])
+
+    for (result, fields, _), hours in zip(selections, predicted):
+        entries = [build_hourly_entry(record, result["date"], prediction) for record, prediction in hours]
+        if fields:
+            entries = [{field: entry[field] for field in fields} for entry in entries]
+        result["hourlyForecast"] = entries
+
+    return {"results": results}
+
+# =====================================================================================
+# API ROUTES - DIAGNOSTICS
+# =====================================================================================
+
+@app.route('/api/cache_stats')
+def cache_stats():
+    """API endpoint exposing cache, request coalescing and pre-warm counters."""
+    return jsonify({
+        "timelineCache": timeline_cache.stats(),
+        "upstreamSingleFlight": upstream_single_flight.stats(),
+        "dayStore": day_store.stats(),
+        "predictionMemo": prediction_memo.stats(),
+        "predictionStore": prediction_store.stats(),
+        "prewarmer": forecast_prewarmer.stats()
+    })
+
+@app.route('/metrics')
+def metrics_endpoint():
+    """Prometheus scrape endpoint (text exposition format)."""
+    if not metrics.enabled:
+        return jsonify({"error": "Metrics dinonaktifkan (METRICS_ENABLED=0)."}), 404
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
+@app.route('/api/ready')
+def readiness():
+    """Readiness probe: 503 until the model is loaded and warmed up, then model and startup details."""
+    if not model_ready.is_set():
+        return jsonify({"ready": False, "startup": STARTUP_TIMINGS}), 503
+    return jsonify({"ready": True, "model": describe_model(), "startup": STARTUP_TIMINGS})
+
+def describe_model():
+    """Source, bundle version and checksum of the serving model."""
+    bundle = model_bundle
+    if bundle is None:
+        return {"loaded": False, "source": None}
+    return {
+        "loaded": True,
+        "source": bundle.source,
+        "path": bundle.path,
+        "formatVersion": BUNDLE_FORMAT_VERSION if bundle.source in ('mmap', 'bundle') else None,
+        "checksum": bundle.checksum,
+        "probability": bundle.supports_probability,
+        "version": bundle.version,
+        "loadedAt": datetime.fromtimestamp(bundle.loaded_at, timezone.utc).isoformat(timespec='seconds')
+    }
+
+def is_admin_request(headers):
+    """True when the request carries the configured admin token."""
+    token = MODEL_CONFIG['admin_token']
+    supplied = headers.get('X-Admin-Token')
+    return bool(token) and supplied is not None and hmac.compare_digest(supplied.encode('utf-8'), token.encode('utf-8'))
+
+@app.route('/api/admin/reload_model', methods=['POST'])
+def reload_model_endpoint():
+    """Load, validate and swap in the model artifacts on disk; the old model serves until the swap."""
+    if not is_admin_request(request.headers):
+        return jsonify({"error": "Endpoint admin tidak tersedia."}), 404
+    try:
+        reload_model()
+    except ValueError as e:
+        return jsonify({"error": f"Reload model gagal, model lama tetap dipakai: {e}",
+                        "model": describe_model(), "reload": model_reload_status}), 422
+    return jsonify({"model": describe_model(), "reload": model_reload_status})
+
+@app.route('/api/memory')
+def memory_stats():
+    """API endpoint reporting this worker's memory and how much of the model is shared."""
+    return jsonify({"pid": os.getpid(), "process": process_memory(), "model": describe_model_memory()})
+
+def describe_model_memory():
+    """Model array size, split into memory-mapped (shared) and private bytes."""
+    bundle = model_bundle
+    if bundle is None:
+        return {"loaded": False}
+    report = {"loaded": True, "source": bundle.source, "arrayBytes": bundle.engine.nbytes}
+    if bundle.engine.mapped_path is not None:
+        report["mappedFile"] = bundle.engine.mapped_path
+        report["mapping"] = mapping_memory(bundle.engine.mapped_path)
+    return report
+
+@app.route('/api/upstream_stats')
+def upstream_stats():
+    """API endpoint exposing upstream circuit state, latency percentiles and the daily quota."""
+    return jsonify({"visualCrossing": upstream_client.stats(), "quota": describe_quota()})
+
+def describe_quota():
+    """Daily budget state plus the records each route type costs per day."""
+    return {
+        **quota_budget.stats(),
+        "recordsPerDay": {
+            "daily": {"elements": DAILY_ELEMENTS, "records": estimate_record_cost(1, 'days')},
+            "hourly": {"elements": DAY_STORE_ELEMENTS, "records": estimate_record_cost(1, 'hours')}
+        }
+    }
+
+# waktu request diukur per pola route (bukan per URL) agar jumlah seri tetap kecil
+@app.before_request
+def start_request_timer():
+    if metrics.enabled:
+        g.request_started = time.perf_counter()
+
+@app.after_request
+def record_request_metrics(response):
+    """Observe request latency per route; streamed bodies are timed up to the first byte."""
+    started = g.pop('request_started', None)
+    if started is not None:
+        route = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+        metrics.observe('weather_request_duration_seconds', time.perf_counter() - started, route=route)
+        metrics.count('weather_requests_total', route=route, status=str(response.status_code))
+        if response.status_code >= 500:
+            metrics.count('weather_errors_total', kind='request')
+    return response
+
+# profil dimulai setelah timer metrics dan selesai sebelum latensi request dicatat
+@app.before_request
+def start_request_profile():
+    if request.path.startswith('/api/profiles'):
+        return
+    if request_profiler.should_profile(request.headers.get(PROFILING_CONFIG['header'])):
+        route = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+        g.profile_session = request_profiler.start(route, request.path)
+
+@app.after_request
+def finish_request_profile(response):
+    """Write the request's profile; streamed bodies are profiled up to the first byte."""
+    session = g.pop('profile_session', None)
+    if session is not None:
+        try:
+            response.headers['X-Profile-Id'] = session.finish(response.status_code)['id']
+        except OSError as e:
+            print(f"Gagal menyimpan profil request: {e}")
+    return response
+
+# profil berisi path dan query request pengguna, jadi selalu butuh token (juga saat sampling aktif)
+def profiles_allowed():
+    """The profile index and downloads require the profiling token header."""
+    return request_profiler.is_authorized(request.headers.get(PROFILING_CONFIG['header']))
+
+@app.route('/api/profiles')
+def list_profiles():
+    """API endpoint listing recent request profiles (route, status, total time)."""
+    if not profiles_allowed():
+        return jsonify({"error": "Endpoint profiling tidak tersedia."}), 404
+    limit = request.args.get('limit', default=50, type=int)
+    return jsonify({
+        "profiler": request_profiler.stats(),
+        "profiles": request_profiler.recent(limit=max(1, limit))
+    })
+
+@app.route('/api/profiles/<path:filename>')
+def download_profile(filename):
+    """Download one profile file (.collapsed or .prof) listed by /api/profiles."""
+    if not profiles_allowed():
+        return jsonify({"error": "Endpoint profiling tidak tersedia."}), 404
+    return send_from_directory(request_profiler.directory, filename, as_attachment=True)
+
+def collect_store_metrics():
+    """Counter samples read from the caches' own statistics at scrape time."""
+    timeline = timeline_cache.stats()
+    for result in ('memory_hits', 'disk_hits', 'misses'):
+        yield 'weather_cache_lookups_total', {'cache': 'timeline', 'result': result}, timeline[result]
+    for name, store in (('day_store', day_store), ('prediction_memo', prediction_memo),
+                        ('prediction_store', prediction_store)):
+        store_stats = store.stats()
+        for result in ('hits', 'misses'):
+            yield 'weather_cache_lookups_total', {'cache': name, 'result': result}, store_stats[result]
+
+    yield 'weather_cache_lookups_total', {'cache': 'timeline', 'result': 'stale_hits'}, timeline['stale_hits']
+
+    coalescing = upstream_single_flight.stats()
+    yield 'weather_upstream_coalesced_total', {'client': 'sync', 'result': 'executed'}, coalescing['executions']
+    yield 'weather_upstream_coalesced_total', {'client': 'sync', 'result': 'shared'}, coalescing['shared']
+
+    quota = quota_budget.stats()
+    if quota['enabled']:
+        yield 'weather_upstream_quota_records', {'kind': 'used'}, quota['used']
+        yield 'weather_upstream_quota_records', {'kind': 'remaining'}, quota['remaining']
+    yield 'weather_upstream_quota_denied_total', {}, quota['denied']
+
+metrics.add_collector(collect_store_metrics)
 
 # =====================================================================================
 # TEMPLATE ROUTES - LEGACY COMPATIBILITY
@@ -656,16 +2153,19 @@ def hourly_result():
 
     hasil_hourly = []
     
-    for i in range(7):
-        tgl = start_date + timedelta(days=i)
-        tgl_str = tgl.strftime('%Y-%m-%d')
-        
-        target_day_data, error = get_weather_data_from_vc(tgl_str)
-        
+    # Fetch the whole week in one upstream request
+    week_dates = date_range_strings(start_date, WEEKLY_FORECAST_DAYS)
+    week_data = get_weather_data_range_from_vc([tgl_str for _, tgl_str in week_dates])
+    daily_data = [(tgl, *week_data[tgl_str]) for tgl, tgl_str in week_dates]
+
+    # Predict all successful days in one model call
+    predictions = iter(predict_batch([data for _, data, error in daily_data if not error]))
+
+    for tgl, target_day_data, error in daily_data:
         if error:
             hasil_hourly.append(create_legacy_error_result(tgl, error))
         else:
-            hasil_hourly.append(create_legacy_success_result(tgl, target_day_data))
+            hasil_hourly.append(create_legacy_success_result(tgl, target_day_data, next(predictions)))
 
     return render_template('weekly_result.html', data=hasil_hourly)
 
@@ -682,32 +2182,38 @@ def create_legacy_error_result(tanggal, error):
         'model_detail': error
     }
 
-def create_legacy_success_result(tanggal, target_day_data):
+def create_legacy_success_result(tanggal, target_day_data, prediction=None):
     """Create legacy format success result for templates."""
-    predicted_condition, model_prediction_detail, _ = predict_with_your_model(target_day_data)
+    if prediction is None:
+        prediction = predict_batch([target_day_data])[0]
     
     return {
         'tanggal': tanggal.strftime('%d %B %Y'),
-        'cuaca': predicted_condition,
+        'cuaca': prediction.condition,
         'suhu_min': target_day_data.get('tempmin', 'N/A'),
         'suhu_max': target_day_data.get('tempmax', 'N/A'),
         'kelembaban': target_day_data.get('humidity', 'N/A'),
         'angin': target_day_data.get('windspeed', 'N/A'),
-        'model_detail': model_prediction_detail
+        'model_detail': prediction.detail
     }
 
 # =====================================================================================
 # APPLICATION STARTUP
 # =====================================================================================
 
+# waktu inisialisasi modul (tanpa import flask), termasuk model jika load_mode='eager'
+STARTUP_TIMINGS['module_init_ms'] = round((time.perf_counter() - MODULE_INIT_STARTED) * 1000, 2)
+STARTUP_TIMINGS['load_mode'] = MODEL_CONFIG['load_mode']
+print(f"⏱️ Inisialisasi aplikasi: {STARTUP_TIMINGS['module_init_ms']} ms (model: {MODEL_CONFIG['load_mode']})")
+
 def print_startup_info():
     """Print application startup information."""
     if "YOUR_VISUAL_CROSSING_API_KEY" in VISUAL_CROSSING_API_KEY:
         print("\n!!! PENTING: Ganti 'YOUR_VISUAL_CROSSING_API_KEY' di app.py dengan API Key Anda yang sebenarnya !!!\n")
     
     print("🌤️ Aplikasi Prediksi Cuaca siap dijalankan!")
-    print("✅ Model SVC:", "Dimuat" if svm_model else "Menggunakan fallback")
-    print("✅ Scaler:", "Dimuat" if scaler else "Menggunakan fallback") 
+    print("✅ Model SVC:", "Dimuat" if model_bundle else "Menggunakan fallback")
+    print("✅ Scaler:", "Dimuat" if model_bundle else "Menggunakan fallback") 
     print("🌐 Server akan berjalan di: http://localhost:5000")
 
 if __name__ == '__main__':
@@ -0,0 +1,499 @@
+"""
+Description: ASGI (asyncio) serving mode for the weather prediction API
+
+Serves the same JSON contracts as app.py for /api/predict_weather,
+/api/predict_weekly_weather (plus its /stream variant), /api/predict_hourly_weather,
+/api/predict_hourly_range and /api/predict_batch, but holds
+upstream calls on the event loop instead of blocking a worker thread.
+
+Usage:
+    uvicorn asgi_app:app --host 0.0.0.0 --port 5000
+"""
+
+# =====================================================================================
+# IMPORTS AND DEPENDENCIES
+# =====================================================================================
+
+# Standard library imports
+import asyncio
+import contextlib
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+# Third-party imports
+from starlette.applications import Starlette
+from starlette.exceptions import HTTPException
+from starlette.responses import JSONResponse, Response, StreamingResponse
+from starlette.middleware import Middleware
+from starlette.routing import Mount, Route
+from starlette.staticfiles import StaticFiles
+
+# Local imports (model, cache and response builders are shared with the Flask app)
+import app as weather_app
+import memory_report
+from quota import QuotaExceededError
+from upstream import AsyncSingleFlight, AsyncUpstreamClient
+
+# =====================================================================================
+# ASYNC CONFIGURATION
+# =====================================================================================
+
+ASYNC_CONFIG = {
+    'max_concurrent_upstream': 20, # batas request visual crossing yg berjalan bersamaan
+    'model_threads': 4 # thread pool utk inferensi model agar event loop tidak terblokir
+}
+
+upstream_client = None
+upstream_semaphore = None
+upstream_single_flight = AsyncSingleFlight()
+model_executor = ThreadPoolExecutor(max_workers=ASYNC_CONFIG['model_threads'], thread_name_prefix='model')
+
+# =====================================================================================
+# ASYNC WEATHER DATA FETCHING
+# =====================================================================================
+
+# hari yg belum ada di cache dikelompokkan per rentang, tiap rentang diambil bersamaan
+async def fetch_days_async(location, date_strs, include, elements):
+    """
+    Fetch timeline days, serving cached days and fetching missing spans concurrently.
+
+    Returns:
+        dict: date_str -> day dict, or the exception raised while fetching its span
+    """
+    results = {}
+    missing_dates = []
+
+    for date_str in date_strs:
+        cached_day = weather_app.timeline_cache.get((location, date_str, include, elements))
+        if cached_day is None:
+            missing_dates.append(date_str)
+        else:
+            results[date_str] = cached_day
+
+    spans = weather_app.group_contiguous_dates(missing_dates)
+    fetched = await asyncio.gather(
+        *(fetch_span_async(location, span[0], span[-1], include, elements) for span in spans),
+        return_exceptions=True
+    )
+
+    for span, span_result in zip(spans, fetched):
+        if isinstance(span_result, QuotaExceededError):
+            # kuota habis: hari yg pernah di-cache tetap disajikan walau sdh kedaluwarsa
+            stale_days = weather_app.read_stale_days(location, span, include, elements)
+            span_result = stale_days or span_result
+        for date_str in span:
+            if isinstance(span_result, Exception):
+                results[date_str] = span_result
+            elif date_str in span_result:
+                results[date_str] = span_result[date_str]
+
+    return results
+
+async def fetch_span_async(location, start_date_str, end_date_str, include, elements):
+    """Fetch one date span once, joining an in-flight fetch of the same or an enclosing span."""
+    span_key = (location, start_date_str, end_date_str, include, elements)
+    joined, fetched_days = await upstream_single_flight.join(
+        lambda key: key[0] == location and key[3:] == (include, elements)
+        and key[1] <= start_date_str and end_date_str <= key[2]
+    )
+    if not joined:
+        fetched_days = await upstream_single_flight.do(span_key, lambda: fetch_and_cache_span_async(*span_key))
+    return {date_str: day for date_str, day in fetched_days.items() if start_date_str <= date_str <= end_date_str}
+
+async def fetch_and_cache_span_async(location, start_date_str, end_date_str, include, elements):
+    """Fetch a date span from Visual Crossing and store each returned day in the cache."""
+    url_vc = weather_app.build_timeline_url(location, start_date_str, end_date_str, include, elements)
+    # kuota memakai file lock (bisa menunggu worker lain), jadi dijalankan di thread agar event loop tidak terblokir
+    cost = await asyncio.to_thread(weather_app.reserve_upstream_records, start_date_str, end_date_str, include)
+
+    try:
+        async with upstream_semaphore:
+            with weather_app.metrics.stage('upstream_fetch'):
+                fetched = await upstream_client.get_json(url_vc, name=f"timeline_{include}")
+    except BaseException:
+        # thread tetap selesai meski task dibatalkan lagi, jadi refund tidak hilang
+        await asyncio.to_thread(weather_app.quota_budget.settle, cost, 0)
+        raise
+    await asyncio.to_thread(weather_app.settle_upstream_records, cost, fetched)
+
+    span_dates = set(weather_app.dates_between(start_date_str, end_date_str))
+    days_by_date = {}
+
+    for date_str, day in weather_app.split_days_by_date(fetched).items():
+        if date_str in span_dates:
+            weather_app.timeline_cache.put((location, date_str, include, elements), day, date_str)
+            days_by_date[date_str] = day
+
+    return days_by_date
+
+async def fetch_day_frames_async(location, date_strs):
+    """Async version of app.fetch_day_frames with per-day fetch errors."""
+    frames = {}
+    missing_dates = []
+    for date_str in date_strs:
+        frame = weather_app.day_store.get(location, date_str)
+        if frame is None:
+            missing_dates.append(date_str)
+        else:
+            frames[date_str] = frame
+
+    if missing_dates:
+        days = await fetch_days_async(location, missing_dates, 'hours', weather_app.DAY_STORE_ELEMENTS)
+        # parsing jam-jam payload ke DayFrame memakan CPU, jadi tidak dijalankan di event loop
+        frames.update(await run_in_model_thread(weather_app.build_day_frames, location, missing_dates, days))
+
+    return frames
+
+async def get_hourly_based_daily_predictions_async(date_strs, location=None):
+    """Async version of app.get_hourly_based_daily_predictions with per-day errors."""
+    if location is None:
+        location = weather_app.MODEL_CONFIG['default_location']
+
+    frames = await fetch_day_frames_async(location, date_strs)
+    return await run_in_model_thread(select_daily_from_frames, frames, date_strs)
+
+def select_daily_from_frames(frames, date_strs):
+    return {date_str: weather_app.select_daily_from_frame(frames.get(date_str), date_str) for date_str in date_strs}
+
+async def run_in_model_thread(fn, *args):
+    """Run CPU-bound work (DayFrame building, features, prediction) outside the event loop."""
+    return await asyncio.get_running_loop().run_in_executor(model_executor, fn, *args)
+
+# =====================================================================================
+# API ROUTES - WEATHER PREDICTION
+# =====================================================================================
+
+async def predict_weather(request):
+    """API endpoint for daily weather prediction."""
+    target_date_str = request.query_params.get('date')
+
+    # Validate input
+    if not target_date_str:
+        return JSONResponse({"error": "Parameter 'date' (tanggal) wajib."}, status_code=400)
+
+    if not weather_app.validate_date_format(target_date_str):
+        return JSONResponse({"error": "Format tanggal tidak valid. Gunakan YYYY-MM-DD."}, status_code=400)
+
+    # Serve from the pre-warmed store when the date is in the hot window
+    day_data, precomputed = weather_app.lookup_prewarmed_days([target_date_str])
+    if not day_data:
+        day_data = await get_hourly_based_daily_predictions_async([target_date_str])
+    processed_data, error = day_data[target_date_str]
+
+    response_data, status_code = await run_in_model_thread(
+        weather_app.build_daily_prediction_response, target_date_str, processed_data, error,
+        precomputed.get(target_date_str)
+    )
+    return JSONResponse(response_data, status_code=status_code)
+
+async def predict_weekly_weather(request):
+    """API endpoint for the 7-day forecast."""
+    start_date_str = request.query_params.get('date')
+
+    # Handle date input
+    if not start_date_str:
+        start_date = datetime.now().date()
+        start_date_str = start_date.strftime('%Y-%m-%d')
+    else:
+        if not weather_app.validate_date_format(start_date_str):
+            return JSONResponse({"error": "Format tanggal tidak valid. Gunakan YYYY-MM-DD."}, status_code=400)
+        start_date = datetime.strptime(start_date_str, '%Y-%m-%d').date()
+
+    week_dates = weather_app.date_range_strings(start_date, weather_app.WEEKLY_FORECAST_DAYS)
+    week_data, precomputed = weather_app.lookup_prewarmed_days([date_str for _, date_str in week_dates])
+    missing_dates = [date_str for _, date_str in week_dates if date_str not in week_data]
+    if missing_dates:
+        week_data.update(await get_hourly_based_daily_predictions_async(missing_dates))
+
+    response_data = await run_in_model_thread(
+        weather_app.build_weekly_forecast_response, start_date_str, week_dates, week_data, precomputed
+    )
+    return JSONResponse(response_data)
+
+async def predict_weekly_weather_stream(request):
+    """API endpoint streaming the 7-day forecast day by day as NDJSON or Server-Sent Events."""
+    start_date_str = request.query_params.get('date')
+    stream_format = request.query_params.get('format', 'ndjson')
+
+    if stream_format not in weather_app.STREAM_FORMATS:
+        return JSONResponse({"error": "Parameter 'format' harus 'ndjson' atau 'sse'."}, status_code=400)
+
+    if not start_date_str:
+        start_date = datetime.now().date()
+        start_date_str = start_date.strftime('%Y-%m-%d')
+    else:
+        if not weather_app.validate_date_format(start_date_str):
+            return JSONResponse({"error": "Format tanggal tidak valid. Gunakan YYYY-MM-DD."}, status_code=400)
+        start_date = datetime.strptime(start_date_str, '%Y-%m-%d').date()
+
+    week_dates = weather_app.date_range_strings(start_date, weather_app.WEEKLY_FORECAST_DAYS)
+    events = iter_weekly_forecast_events_async(start_date_str, week_dates)
+    return StreamingResponse(encode_stream_events_async(events, stream_format),
+                             media_type=weather_app.STREAM_FORMATS[stream_format],
+                             headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+async def iter_weekly_forecast_events_async(start_date_str, week_dates):
+    """Async version of app.iter_weekly_forecast_events."""
+    week_data, precomputed = weather_app.lookup_prewarmed_days([date_str for _, date_str in week_dates])
+    errors = {}
+
+    for event in await run_in_model_thread(
+            weather_app.build_weekly_day_events, week_dates, week_data, precomputed, errors):
+        yield event
+
+    tasks = [asyncio.ensure_future(get_hourly_based_daily_predictions_async(group))
+             for group in weather_app.split_first_missing_day(week_dates, week_data)]
+
+    for next_done in asyncio.as_completed(tasks):
+        day_data = await next_done
+        for event in await run_in_model_thread(
+                weather_app.build_weekly_day_events, week_dates, day_data, precomputed, errors):
+            yield event
+
+    yield weather_app.build_weekly_summary_event(start_date_str, week_dates, errors)
+
+async def encode_stream_events_async(events, stream_format):
+    """Async version of app.encode_stream_events."""
+    async for event in events:
+        for chunk in weather_app.encode_stream_events([event], stream_format):
+            yield chunk
+
+async def predict_detailed_hourly_weather(request):
+    """API endpoint for detailed hourly weather prediction."""
+    target_date_str = request.query_params.get('date')
+
+    try:
+        hour = int(request.query_params.get('hour', 12))
+    except ValueError:
+        return JSONResponse({"error": "Parameter 'hour' harus berupa angka."}, status_code=400)
+
+    # Validate input
+    if not target_date_str:
+        return JSONResponse({"error": "Parameter 'date' wajib."}, status_code=400)
+
+    if not weather_app.validate_date_format(target_date_str):
+        return JSONResponse({"error": "Format tanggal tidak valid. Gunakan YYYY-MM-DD."}, status_code=400)
+
+    location = weather_app.MODEL_CONFIG['default_location']
+
+    # Serve from the pre-warmed store when the date is in the hot window
+    entry = weather_app.prediction_store.get(location, target_date_str)
+    if entry is not None:
+        response_data, status_code = await run_in_model_thread(
+            weather_app.build_detailed_hourly_response,
+            entry.frame, hour, target_date_str, entry.hour_predictions
+        )
+        return JSONResponse(response_data, status_code=status_code)
+
+    try:
+        frames = await fetch_day_frames_async(location, [target_date_str])
+        response_data, status_code = await run_in_model_thread(
+            weather_app.build_detailed_hourly_response, frames.get(target_date_str), hour, target_date_str
+        )
+        return JSONResponse(response_data, status_code=status_code)
+
+    except Exception as e:
+        return JSONResponse({"error": f"Gagal ambil data per jam: {str(e)}"}, status_code=500)
+
+async def predict_hourly_range(request):
+    """API endpoint returning every hour of a date range (up to 168 hours) in one call."""
+    params, error = weather_app.parse_hourly_range_args(request.query_params)
+    if error:
+        return JSONResponse({"error": error}, status_code=400)
+
+    location = weather_app.MODEL_CONFIG['default_location']
+
+    # Pre-warmed days come with their hourly predictions already computed
+    frames, precomputed = {}, {}
+    for date_str in params['date_strs']:
+        entry = weather_app.prediction_store.get(location, date_str)
+        if entry is not None:
+            frames[date_str] = entry.frame
+            precomputed[date_str] = entry.hour_predictions
+
+    missing_dates = [date_str for date_str in params['date_strs'] if date_str not in frames]
+    if missing_dates:
+        frames.update(await fetch_day_frames_async(location, missing_dates))
+
+    response_data = await run_in_model_thread(
+        weather_app.build_hourly_range_response, params, frames, precomputed
+    )
+    return JSONResponse(response_data)
+
+async def predict_batch(request):
+    """API endpoint predicting hours for many (location, date, hour range) items in one call."""
+    try:
+        payload = await request.json()
+    except ValueError:
+        payload = None
+
+    items, error = weather_app.parse_batch_items(payload)
+    if error:
+        return JSONResponse({"error": error}, status_code=400)
+
+    frames, spans = weather_app.plan_batch_fetches(items)
+    error, status = await asyncio.to_thread(weather_app.check_batch_budget, items, spans)
+    if error:
+        return JSONResponse({"error": error}, status_code=status)
+
+    # Spans of every location are fetched together; the upstream semaphore bounds concurrency
+    fetched = await asyncio.gather(*(fetch_day_frames_async(location, span) for location, span in spans))
+    for (location, span), span_frames in zip(spans, fetched):
+        for date_str in span:
+            frames[(location, date_str)] = (span_frames.get(date_str), None)
+
+    response_data = await run_in_model_thread(weather_app.build_batch_response, items, frames)
+    return JSONResponse(response_data)
+
+# =====================================================================================
+# API ROUTES - DIAGNOSTICS
+# =====================================================================================
+
+async def cache_stats(request):
+    """API endpoint exposing cache, request coalescing and pre-warm counters."""
+    return JSONResponse({
+        "timelineCache": weather_app.timeline_cache.stats(),
+        "upstreamSingleFlight": upstream_single_flight.stats(),
+        "dayStore": weather_app.day_store.stats(),
+        "predictionMemo": weather_app.prediction_memo.stats(),
+        "predictionStore": weather_app.prediction_store.stats(),
+        "prewarmer": weather_app.forecast_prewarmer.stats()
+    })
+
+async def upstream_stats(request):
+    """API endpoint exposing upstream circuit state, latency percentiles and the daily quota."""
+    return JSONResponse({"visualCrossing": upstream_client.stats(), "quota": weather_app.describe_quota()})
+
+async def readiness(request):
+    """Readiness probe: 503 until the model is loaded and warmed up."""
+    if not weather_app.model_ready.is_set():
+        return JSONResponse({"ready": False, "startup": weather_app.STARTUP_TIMINGS}, status_code=503)
+    return JSONResponse({"ready": True, "model": weather_app.describe_model(), "startup": weather_app.STARTUP_TIMINGS})
+
+async def reload_model(request):
+    """Load, validate and swap in the model artifacts on disk (admin token required)."""
+    if not weather_app.is_admin_request(request.headers):
+        return JSONResponse({"error": "Endpoint admin tidak tersedia."}, status_code=404)
+    try:
+        await run_in_model_thread(weather_app.reload_model)
+    except ValueError as e:
+        return JSONResponse({"error": f"Reload model gagal, model lama tetap dipakai: {e}",
+                             "model": weather_app.describe_model(), "reload": weather_app.model_reload_status},
+                            status_code=422)
+    return JSONResponse({"model": weather_app.describe_model(), "reload": weather_app.model_reload_status})
+
+async def memory_stats(request):
+    """API endpoint reporting this worker's memory and how much of the model is shared."""
+    return JSONResponse({"pid": os.getpid(), "process": memory_report.process_memory(),
+                         "model": weather_app.describe_model_memory()})
+
+async def metrics_endpoint(request):
+    """Prometheus scrape endpoint (text exposition format)."""
+    if not weather_app.metrics.enabled:
+        return JSONResponse({"error": "Metrics dinonaktifkan (METRICS_ENABLED=0)."}, status_code=404)
+    return Response(weather_app.metrics.render(), media_type='text/plain; version=0.0.4')
+
+def collect_async_metrics():
+    """Coalescing counters of the asyncio single-flight (the sync one is exported by app.py)."""
+    coalescing = upstream_single_flight.stats()
+    yield 'weather_upstream_coalesced_total', {'client': 'async', 'result': 'executed'}, coalescing['executions']
+    yield 'weather_upstream_coalesced_total', {'client': 'async', 'result': 'shared'}, coalescing['shared']
+
+weather_app.metrics.add_collector(collect_async_metrics)
+
+# label route memakai path API (jumlah terbatas); file statis digabung jadi satu label
+class RequestMetricsMiddleware:
+    """Plain ASGI middleware timing each HTTP request up to its response headers."""
+
+    def __init__(self, wrapped_app, metrics):
+        self.app = wrapped_app
+        self.metrics = metrics
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http' or not self.metrics.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        path = scope['path']
+        route = path if path.startswith('/api/') or path == '/metrics' else 'static'
+        started = time.perf_counter()
+
+        async def send_with_metrics(message):
+            if message['type'] == 'http.response.start':
+                status = message['status']
+                self.metrics.observe('weather_request_duration_seconds', time.perf_counter() - started, route=route)
+                self.metrics.count('weather_requests_total', route=route, status=str(status))
+                if status >= 500:
+                    self.metrics.count('weather_errors_total', kind='request')
+            await send(message)
+
+        await self.app(scope, receive, send_with_metrics)
+
+# folder aplikasi disajikan sbg file statis; profil dan status kuota tidak boleh ikut tersaji
+class PrivateAwareStaticFiles(StaticFiles):
+    """StaticFiles that answers 404 for paths inside weather_app.private_state_paths()."""
+
+    async def get_response(self, path, scope):
+        if weather_app.is_private_static_path(path):
+            raise HTTPException(status_code=404)
+        return await super().get_response(path, scope)
+
+# =====================================================================================
+# APPLICATION SETUP
+# =====================================================================================
+
+@contextlib.asynccontextmanager
+async def lifespan(_app):
+    """Create the async upstream client per event loop and release resources on shutdown."""
+    global upstream_client, upstream_semaphore
+
+    config = weather_app.UPSTREAM_CONFIG
+    # breaker dan pencatat latensi dibagi dgn client sinkron agar statistiknya satu
+    upstream_client = AsyncUpstreamClient(
+        pool_size=max(config['pool_size'], ASYNC_CONFIG['max_concurrent_upstream']),
+        connect_timeout=config['connect_timeout'],
+        read_timeout=config['read_timeout'],
+        max_retries=config['max_retries'],
+        backoff_base=config['backoff_base'],
+        backoff_max=config['backoff_max'],
+        breaker=weather_app.upstream_client.breaker,
+        latency=weather_app.upstream_client.latency,
+        metrics=weather_app.metrics
+    )
+    upstream_semaphore = asyncio.Semaphore(ASYNC_CONFIG['max_concurrent_upstream'])
+
+    # Pre-warmer runs in its own thread with the synchronous client
+    if weather_app.PREWARM_CONFIG['enabled']:
+        weather_app.forecast_prewarmer.start()
+    if weather_app.MODEL_CONFIG['reload_watch']:
+        weather_app.model_watcher.start()
+
+    try:
+        yield
+    finally:
+        weather_app.forecast_prewarmer.stop(timeout=1)
+        weather_app.model_watcher.stop(timeout=1)
+        await upstream_client.aclose()
+        model_executor.shutdown(wait=False)
+
+app = Starlette(
+    routes=[
+        Route('/api/predict_weather', predict_weather),
+        Route('/api/predict_weekly_weather', predict_weekly_weather),
+        Route('/api/predict_weekly_weather/stream', predict_weekly_weather_stream),
+        Route('/api/predict_hourly_weather', predict_detailed_hourly_weather),
+        Route('/api/predict_hourly_range', predict_hourly_range),
+        Route('/api/predict_batch', predict_batch, methods=['POST']),
+        Route('/api/cache_stats', cache_stats),
+        Route('/api/upstream_stats', upstream_stats),
+        Route('/api/ready', readiness),
+        Route('/api/memory', memory_stats),
+        Route('/api/admin/reload_model', reload_model, methods=['POST']),
+        Route('/metrics', metrics_endpoint),
+        Mount('/', PrivateAwareStaticFiles(directory=weather_app.STATIC_ROOT, html=True))
+    ],
+    middleware=[Middleware(RequestMetricsMiddleware, metrics=weather_app.metrics)],
+    lifespan=lifespan
+)
@@ -0,0 +1,339 @@
+"""
+Description: Microbenchmarks for the inference and preprocessing hot path of app.py
+
+Times feature preparation, scaling, SVC prediction, hourly aggregation and
+full route handlers (Flask test client, upstream answered in-process by
+vc_stub.TimelineStub) at batch sizes 1/24/168/1000 built from DataCuaca.csv
+rows. Results are written as JSON and can be compared against a saved
+baseline; the exit code is 1 when a benchmark regresses past the threshold.
+
+Usage:
+    python benchmark.py --output bench_baseline.json
+    python benchmark.py --baseline bench_baseline.json --threshold 0.15
+"""
+
+# =====================================================================================
+# IMPORTS AND DEPENDENCIES
+# =====================================================================================
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+import warnings
+from datetime import date, datetime, timedelta
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+
+import app as weather_app
+from day_store import DayFrame
+from prediction_memo import PredictionMemo
+from quota import QuotaBudget
+from vc_stub import DEFAULT_CSV_PATH, TimelineStub, build_day, load_csv_days
+
+# =====================================================================================
+# BENCHMARK CONFIGURATION
+# =====================================================================================
+
+BATCH_SIZES = (1, 24, 168, 1000)
+
+BENCH_CONFIG = {
+    'rounds': 7, # pengulangan per benchmark; median dipakai utk perbandingan
+    'min_round_seconds': 0.05, # jumlah loop per round dikalibrasi sampai minimal selama ini
+    'threshold': 0.10 # regresi jika median lebih lambat >10% dari baseline
+}
+
+# tanggal tetap agar hasil antar run sebanding (semua di masa lalu -> cache tanpa TTL)
+ROUTE_DATE = date(2025, 1, 1)
+
+# =====================================================================================
+# TIMING
+# =====================================================================================
+
+def time_callable(fn, rounds, min_round_seconds):
+    """
+    Time fn() like timeit: calibrate loops per round, then take several rounds.
+
+    Returns:
+        dict: Median/min/max seconds per call, loops per round and rounds
+    """
+    loops = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_round_seconds or loops >= 1_000_000:
+            break
+        loops *= 2 if elapsed == 0 else max(2, min(10, int(min_round_seconds / elapsed) + 1))
+
+    per_call = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        per_call.append((time.perf_counter() - started) / loops)
+
+    return {
+        'median_us': round(statistics.median(per_call) * 1e6, 3),
+        'min_us': round(min(per_call) * 1e6, 3),
+        'max_us': round(max(per_call) * 1e6, 3),
+        'loops': loops,
+        'rounds': rounds
+    }
+
+# =====================================================================================
+# BENCHMARK INPUTS
+# =====================================================================================
+
+def load_weather_rows(csv_days, count):
+    """First `count` hourly rows of the dataset as weather dicts (cycled if needed)."""
+    hours = [hour for day in csv_days for hour in day if all(hour[field] is not None
+             for field in weather_app.MODEL_CONFIG['feature_columns'])]
+    return [dict(hours[i % len(hours)]) for i in range(count)]
+
+def build_frame(rows, date_str='2025-01-01'):
+    """DayFrame over arbitrary many hour rows (labels keep the real hour of day)."""
+    return DayFrame.from_timeline_day({'datetime': date_str, 'hours': rows})
+
+def install_stub_upstream(stub):
+    """Answer upstream calls from the in-process stub instead of the network."""
+    def get_json(url, name='upstream'):
+        parsed = urlparse(url)
+        status, body = stub.handle(parsed.path, parse_qs(parsed.query))
+        if status != 200:
+            raise RuntimeError(f"stub status {status}")
+        return body
+
+    weather_app.upstream_client.get_json = get_json
+    # stub tidak memakai kuota visual crossing; anggaran harian dimatikan agar hasil tidak bergantung pd sisa kuota
+    weather_app.quota_budget = QuotaBudget(daily_limit=0)
+
+def clear_caches():
+    weather_app.timeline_cache.clear()
+    weather_app.day_store.clear()
+    weather_app.prediction_memo.clear()
+
+# =====================================================================================
+# BENCHMARKS
+# =====================================================================================
+
+def collect_benchmarks(csv_days):
+    """
+    Build the benchmark table.
+
+    Returns:
+        list: (name, callable) pairs; names carry the batch size as [n=...]
+    """
+    engine = weather_app.model_bundle.engine if weather_app.model_bundle is not None else None
+    features = weather_app.MODEL_CONFIG['feature_columns']
+    benchmarks = []
+
+    for n in BATCH_SIZES:
+        rows = load_weather_rows(csv_days, n)
+        matrix = weather_app.prepare_model_matrix(rows, features)
+        frame = build_frame(rows)
+
+        benchmarks.append((f"prepare_model_matrix[n={n}]",
+                           lambda rows=rows: weather_app.prepare_model_matrix(rows, features)))
+        benchmarks.append((f"frame_model_matrix[n={n}]",
+                           lambda frame=frame: weather_app.frame_model_matrix(frame, slice(None))))
+        benchmarks.append((f"calculate_hourly_average[n={n}]",
+                           lambda frame=frame: weather_app.calculate_hourly_average(frame)))
+        benchmarks.append((f"predict_batch[n={n}]", lambda rows=rows: weather_app.predict_batch(rows)))
+
+        if engine is not None:
+            scaled = engine.transform(matrix)
+            benchmarks.append((f"engine.transform[n={n}]", lambda matrix=matrix: engine.transform(matrix)))
+            benchmarks.append((f"engine.predict[n={n}]", lambda matrix=matrix: engine.predict(matrix)))
+            benchmarks.append((f"engine.decision_values[n={n}]",
+                               lambda scaled=scaled: engine.decision_values(scaled)))
+            if engine.supports_probability:
+                benchmarks.append((f"engine.predict_proba[n={n}]",
+                                   lambda matrix=matrix: engine.predict_proba(matrix)))
+
+        benchmarks.extend(sklearn_benchmarks(n, matrix))
+
+    # Hourly window and full-day processing on one real day
+    day = build_day(ROUTE_DATE.isoformat(), csv_days[ROUTE_DATE.toordinal() % len(csv_days)])
+    day_frame = DayFrame.from_timeline_day(day)
+    benchmarks.append(("process_hourly_forecast[n=5]",
+                       lambda: weather_app.process_hourly_forecast(day_frame, 12, ROUTE_DATE.isoformat())))
+    benchmarks.append(("DayFrame.from_timeline_day[n=24]", lambda: DayFrame.from_timeline_day(day)))
+
+    return benchmarks + route_benchmarks()
+
+def sklearn_benchmarks(n, matrix):
+    """Reference timings of the original sklearn objects, when sklearn and the .pkl files are available."""
+    svm_model, scaler = load_sklearn_estimators()
+    if svm_model is None:
+        return []
+
+    benchmarks = [
+        (f"sklearn.scaler.transform[n={n}]", lambda: scaler.transform(matrix)),
+        (f"sklearn.svm.predict[n={n}]", lambda scaled=scaler.transform(matrix): svm_model.predict(scaled))
+    ]
+    if getattr(svm_model, 'probability', False):
+        benchmarks.append((f"sklearn.svm.predict_proba[n={n}]",
+                           lambda scaled=scaler.transform(matrix): svm_model.predict_proba(scaled)))
+    return benchmarks
+
+_sklearn_estimators = None
+
+def load_sklearn_estimators():
+    global _sklearn_estimators
+    if _sklearn_estimators is None:
+        try:
+            import joblib
+            _sklearn_estimators = (joblib.load(weather_app.MODEL_CONFIG['svm_model_path']),
+                                   joblib.load(weather_app.MODEL_CONFIG['scaler_path']))
+        except Exception as e:
+            print(f"Benchmark sklearn dilewati: {e}")
+            _sklearn_estimators = (None, None)
+    return _sklearn_estimators
+
+def route_benchmarks():
+    """Full route handlers through the Flask test client; 'cold' clears the caches before each call."""
+    client = weather_app.app.test_client()
+    date_str = ROUTE_DATE.isoformat()
+    batch_body = {'items': [{'location': location, 'date': (ROUTE_DATE + timedelta(days=offset)).isoformat()}
+                            for location in ('Ambon, Maluku', 'Masohi, Maluku', 'Tual, Maluku')
+                            for offset in range(7)]}
+
+    routes = {
+        'daily': lambda: client.get(f"/api/predict_weather?date={date_str}"),
+        'weekly': lambda: client.get(f"/api/predict_weekly_weather?date={date_str}"),
+        'hourly': lambda: client.get(f"/api/predict_hourly_weather?date={date_str}&hour=12"),
+        'hourly_range': lambda: client.get(f"/api/predict_hourly_range?date={date_str}&days=7"),
+        'batch': lambda: client.post("/api/predict_batch", json=batch_body)
+    }
+
+    def checked(call):
+        response = call()
+        if response.status_code != 200:
+            raise RuntimeError(f"route returned HTTP {response.status_code}")
+        return response
+
+    def cold(call):
+        clear_caches()
+        return checked(call)
+
+    benchmarks = []
+    for name, call in routes.items():
+        benchmarks.append((f"route.{name}.warm", lambda call=call: checked(call)))
+        benchmarks.append((f"route.{name}.cold", lambda call=call: cold(call)))
+    return benchmarks
+
+# =====================================================================================
+# BASELINE COMPARISON
+# =====================================================================================
+
+def compare_with_baseline(results, baseline, threshold):
+    """
+    Compare median timings with a baseline run.
+
+    Returns:
+        tuple: (rows of (name, baseline_us, current_us, ratio, status), regressed names)
+    """
+    rows = []
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get('results', {}).get(name)
+        if previous is None:
+            rows.append((name, None, current['median_us'], None, 'baru'))
+            continue
+
+        ratio = current['median_us'] / previous['median_us'] if previous['median_us'] else float('inf')
+        if ratio > 1 + threshold:
+            status = 'REGRESI'
+            regressions.append(name)
+        elif ratio < 1 - threshold:
+            status = 'lebih cepat'
+        else:
+            status = 'ok'
+        rows.append((name, previous['median_us'], current['median_us'], ratio, status))
+
+    return rows, regressions
+
+def print_results(results):
+    print(f"{'benchmark':<42}{'median_us':>14}{'min_us':>14}{'loops':>9}")
+    for name, stats in results.items():
+        print(f"{name:<42}{stats['median_us']:>14.1f}{stats['min_us']:>14.1f}{stats['loops']:>9}")
+
+def print_comparison(rows, threshold):
+    print(f"\nPerbandingan dgn baseline (ambang {threshold:.0%}):")
+    print(f"{'benchmark':<42}{'baseline_us':>14}{'current_us':>14}{'ratio':>8}  status")
+    for name, previous, current, ratio, status in rows:
+        previous_text = f"{previous:.1f}" if previous is not None else '-'
+        ratio_text = f"{ratio:.2f}" if ratio is not None else '-'
+        print(f"{name:<42}{previous_text:>14}{current:>14.1f}{ratio_text:>8}  {status}")
+
+# =====================================================================================
+# COMMAND LINE
+# =====================================================================================
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Microbenchmarks for the weather prediction hot path')
+    parser.add_argument('--csv', default=DEFAULT_CSV_PATH, help='Hourly dataset (default: ../DataCuaca.csv)')
+    parser.add_argument('--filter', help='Only run benchmarks whose name contains this text')
+    parser.add_argument('--rounds', type=int, default=BENCH_CONFIG['rounds'])
+    parser.add_argument('--min-round-seconds', type=float, default=BENCH_CONFIG['min_round_seconds'])
+    parser.add_argument('--output', help='Write results to this JSON file (e.g. to save a baseline)')
+    parser.add_argument('--baseline', help='Compare against a previous JSON result')
+    parser.add_argument('--threshold', type=float, default=BENCH_CONFIG['threshold'],
+                        help='Relative slowdown that counts as a regression (0.10 = 10%%)')
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    # sklearn warns on every call when given plain arrays; the timings are what matter here
+    warnings.filterwarnings('ignore', message='X does not have valid feature names')
+
+    # Route benchmarks must not depend on the background pre-warmer or the network
+    weather_app.PREWARM_CONFIG['enabled'] = False
+    install_stub_upstream(TimelineStub(args.csv))
+    # memo hasil model mati agar predict_batch dan route .cold mengukur evaluasi model, bukan memo hit
+    weather_app.prediction_memo = PredictionMemo(max_entries=0)
+    csv_days = load_csv_days(args.csv)
+
+    results = {}
+    for name, fn in collect_benchmarks(csv_days):
+        if args.filter and args.filter not in name:
+            continue
+        results[name] = time_callable(fn, args.rounds, args.min_round_seconds)
+    print_results(results)
+
+    report = {
+        'meta': {
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'model_engine': weather_app.model_bundle is not None
+        },
+        'results': results
+    }
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as output_file:
+            json.dump(report, output_file, indent=2)
+        print(f"\n📄 Hasil disimpan ke {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as baseline_file:
+            baseline = json.load(baseline_file)
+        rows, regressions = compare_with_baseline(results, baseline, args.threshold)
+        print_comparison(rows, args.threshold)
+        if regressions:
+            print(f"\n❌ {len(regressions)} benchmark melambat lebih dari {args.threshold:.0%}: {', '.join(regressions)}")
+            return 1
+        print("\n✅ Tidak ada regresi")
+
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,538 @@
+"""
+Description: Column-oriented, memory-mapped binary cache of the hourly weather CSV
+
+The CSV is parsed once (in chunks) into one raw file per column plus a JSON
+manifest: float32 features, uint8 label codes, int64 timestamps and uint32
+codes for other text columns (e.g. a station name). Later loads memory-map
+the column files instead of parsing text. The cache is rebuilt automatically
+when the source CSV changes.
+
+Usage:
+    python dataset_cache.py ../DataCuaca.csv
+    python dataset_cache.py ../DataCuaca.csv --rebuild
+"""
+
+# =====================================================================================
+# IMPORTS AND DEPENDENCIES
+# =====================================================================================
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import shutil
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+# =====================================================================================
+# CACHE CONFIGURATION
+# =====================================================================================
+
+# versi format cache; versi lain dianggap kedaluwarsa dan dibangun ulang
+CACHE_FORMAT_VERSION = 1
+
+DEFAULT_CSV_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'DataCuaca.csv')
+DEFAULT_LABEL_COLUMN = 'weather'
+DEFAULT_DATETIME_COLUMN = 'datetime'
+DEFAULT_CHUNK_ROWS = 200_000
+
+MANIFEST_NAME = 'manifest.json'
+
+# kode label utk baris tanpa label (maks. 255 kelas)
+MISSING_LABEL = 255
+
+# nilai dgn desimal sebanyak ini atau kurang bisa dikembalikan persis dari float32 (lihat column())
+MAX_EXACT_DECIMALS = 6
+FLOAT32_EXACT_LIMIT = 2 ** 23
+
+# jam tanpa tanggal ("HH:MM:SS"); hari baru dimulai saat jam kembali ke nilai yg lebih kecil
+TIME_OF_DAY_PATTERN = re.compile(r'^\d{1,2}:\d{2}(:\d{2})?$')
+
+SECONDS_PER_DAY = 86400
+
+# waktu kosong disimpan sbg nilai int64 terkecil (sama dgn NaT di NumPy/pandas)
+MISSING_TIMESTAMP = np.iinfo(np.int64).min
+
+# =====================================================================================
+# CACHE LOADING
+# =====================================================================================
+
+def default_cache_dir(csv_path):
+    """`DataCuaca.csv` -> `DataCuaca.columnar/` next to the CSV."""
+    return f"{os.path.splitext(os.path.abspath(csv_path))[0]}.columnar"
+
+def load_dataset(csv_path=DEFAULT_CSV_PATH, cache_dir=None, rebuild=False, **build_kwargs):
+    """
+    Open the columnar cache of `csv_path`, building it first if missing or stale.
+
+    Args:
+        csv_path (str): Source CSV
+        cache_dir (str): Cache directory (default: next to the CSV, see default_cache_dir)
+        rebuild (bool): Rebuild even when the cache is fresh
+        **build_kwargs: Passed to build_cache (label_column, datetime_column, chunk_rows)
+
+    Returns:
+        ColumnarDataset: Read-only view of the memory-mapped columns
+    """
+    cache_dir = cache_dir or default_cache_dir(csv_path)
+    manifest = None if rebuild else read_manifest(cache_dir)
+
+    if manifest is None or not refresh_source_stamp(manifest, csv_path, cache_dir):
+        manifest = build_cache(csv_path, cache_dir, **build_kwargs)
+
+    return ColumnarDataset(cache_dir, manifest)
+
+def read_manifest(cache_dir):
+    """Parsed manifest, or None if the cache is missing, unreadable or of another format version."""
+    try:
+        with open(os.path.join(cache_dir, MANIFEST_NAME), encoding='utf-8') as manifest_file:
+            manifest = json.load(manifest_file)
+    except (OSError, ValueError):
+        return None
+    return manifest if manifest.get('format_version') == CACHE_FORMAT_VERSION else None
+
+# ukuran + mtime cukup utk cek cepat; sha256 hanya dihitung jika mtime berubah tapi ukuran sama
+def refresh_source_stamp(manifest, csv_path, cache_dir):
+    """
+    Check that the cache still matches the source CSV.
+
+    A CSV that was only touched (same size and content, new mtime) keeps its
+    cache; the manifest's stamp is updated so the next check is fast again.
+
+    Returns:
+        bool: True when the cache is up to date
+    """
+    source = manifest['source']
+    try:
+        stat = os.stat(csv_path)
+    except OSError:
+        return False
+
+    if stat.st_size != source['size']:
+        return False
+    if stat.st_mtime_ns == source['mtime_ns']:
+        return True
+    if file_sha256(csv_path) != source['sha256']:
+        return False
+
+    source['mtime_ns'] = stat.st_mtime_ns
+    write_manifest(cache_dir, manifest)
+    return True
+
+def file_sha256(path, block_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as source_file:
+        for block in iter(lambda: source_file.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def write_manifest(cache_dir, manifest, name=MANIFEST_NAME):
+    path = os.path.join(cache_dir, name)
+    temp_path = f"{path}.tmp-{os.getpid()}"
+    with open(temp_path, 'w', encoding='utf-8') as manifest_file:
+        json.dump(manifest, manifest_file, indent=2)
+    os.replace(temp_path, path)
+
+# =====================================================================================
+# COLUMNAR DATASET
+# =====================================================================================
+
+class ColumnarDataset:
+    """
+    Memory-mapped columns of one cache build.
+
+    Feature columns are float32 on disk; `column()` and `feature_matrix()`
+    return float64 values rounded back to the decimals seen in the CSV,
+    which reproduces what pandas parses from the text exactly.
+    """
+
+    def __init__(self, cache_dir, manifest):
+        self.cache_dir = cache_dir
+        self.manifest = manifest
+        self.num_rows = manifest['num_rows']
+        self.feature_columns = [name for name, info in manifest['columns'].items() if info['kind'] == 'feature']
+        self.label_column = manifest['label_column']
+        self.classes = manifest['columns'][self.label_column]['classes'] if self.label_column else None
+        self._arrays = {name: self._open(name, info) for name, info in manifest['columns'].items()}
+
+    def _open(self, name, info):
+        dtype = np.dtype(info['dtype'])
+        if self.num_rows == 0:
+            return np.empty(0, dtype=dtype)
+        return np.memmap(os.path.join(self.cache_dir, info['file']), dtype=dtype, mode='r', shape=(self.num_rows,))
+
+    def raw(self, name):
+        """On-disk array of a column (float32, uint8 or uint32 codes, int64 timestamps), read-only."""
+        return self._arrays[name]
+
+    def column(self, name, exact=True, start=0, stop=None):
+        """
+        One feature column (rows [start, stop)) as float64.
+
+        Args:
+            exact (bool): Round to the column's CSV decimals (same values as pd.read_csv);
+                columns whose values do not fit float32 exactly are only widened
+        """
+        values = self._arrays[name][start:stop].astype(np.float64)
+        decimals = self.manifest['columns'][name].get('decimals')
+        if exact and decimals is not None:
+            np.round(values, decimals, out=values)
+        return values
+
+    def feature_matrix(self, columns=None, exact=True):
+        """(rows, features) float64 matrix in `columns` order (default: CSV order)."""
+        columns = columns or self.feature_columns
+        matrix = np.empty((self.num_rows, len(columns)), dtype=np.float64)
+        for index, name in enumerate(columns):
+            matrix[:, index] = self.column(name, exact)
+        return matrix
+
+    def label_codes(self):
+        """uint8 label codes; classes are sorted like sklearn's LabelEncoder, MISSING_LABEL if absent."""
+        return self._arrays[self.label_column]
+
+    def label_names(self):
+        codes = self.label_codes()
+        names = np.array(self.classes + [None], dtype=object)
+        return names[np.where(codes == MISSING_LABEL, len(self.classes), codes)]
+
+    def timestamps(self):
+        """int64 seconds: Unix time, or seconds since the first day for time-of-day CSVs (MISSING_TIMESTAMP if empty)."""
+        return self._arrays[self.manifest['datetime_column']]
+
+    def category_names(self, name):
+        info = self.manifest['columns'][name]
+        return np.array(info['categories'] + [None], dtype=object)[self._arrays[name]]
+
+    def to_frame(self):
+        """
+        DataFrame with the columns and values pd.read_csv gives for the source CSV.
+
+        Time-of-day timestamps are formatted back to "HH:MM:SS"; Unix
+        timestamps are returned as datetime64 values.
+        """
+        data = {}
+        for name, info in self.manifest['columns'].items():
+            if info['kind'] == 'feature':
+                data[name] = self.column(name)
+            elif info['kind'] == 'label':
+                data[name] = self.label_names()
+            elif info['kind'] == 'category':
+                data[name] = self.category_names(name)
+            else:
+                data[name] = format_timestamps(np.asarray(self.timestamps()), info['timestamp_kind'])
+        return pd.DataFrame(data, columns=list(self.manifest['columns']))
+
+    def stats(self):
+        return {
+            'rows': self.num_rows,
+            'features': self.feature_columns,
+            'classes': self.classes,
+            'bytes': sum(int(array.nbytes) for array in self._arrays.values()),
+            'source': self.manifest['source']['path'],
+            'built_at': self.manifest['built_at']
+        }
+
+def format_timestamps(seconds, timestamp_kind):
+    if timestamp_kind == 'unix':
+        return pd.to_datetime(seconds.astype('datetime64[s]'))
+    missing = seconds == MISSING_TIMESTAMP
+    seconds_of_day = seconds % SECONDS_PER_DAY
+    return np.array([None if is_missing else f"{s // 3600:02d}:{s // 60 % 60:02d}:{s % 60:02d}"
+                     for s, is_missing in zip(seconds_of_day.tolist(), missing.tolist())], dtype=object)
+
+# =====================================================================================
+# CACHE BUILDING
+# =====================================================================================
+
+def build_cache(csv_path, cache_dir=None, label_column=DEFAULT_LABEL_COLUMN,
+                datetime_column=DEFAULT_DATETIME_COLUMN, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """
+    Convert the CSV into column files, streaming it in chunks of `chunk_rows`.
+
+    The build is written to a temporary directory and renamed over
+    `cache_dir` when complete, so readers never see a half-written cache.
+
+    A column that looked numeric in its first chunks but holds text further
+    down is not guessed around: the build restarts with that column stored as
+    a category, so every chunk of a column is encoded the same way.
+
+    Raises:
+        ValueError: On a timestamp column mixing formats, an unknown timestamp
+            format or more than 255 label classes
+
+    Returns:
+        dict: The written manifest
+    """
+    cache_dir = cache_dir or default_cache_dir(csv_path)
+    stat = os.stat(csv_path)
+    temp_dir = f"{cache_dir}.tmp-{os.getpid()}"
+    category_columns = set()
+
+    try:
+        while True:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+            os.makedirs(temp_dir)
+            builder = ColumnBuilder(temp_dir, label_column, datetime_column, category_columns)
+            try:
+                for chunk in pd.read_csv(csv_path, encoding='utf-8-sig', dtype=str, chunksize=chunk_rows):
+                    builder.append(chunk)
+                break
+            except ColumnKindChanged as e:
+                builder.close()
+                print(f"⚠️ Kolom '{e.column}' berisi teks mulai baris {e.row}; dibangun ulang sbg kategori")
+                category_columns.add(e.column)
+        manifest = builder.finish()
+        manifest['source'] = {
+            'path': os.path.abspath(csv_path),
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'sha256': file_sha256(csv_path)
+        }
+        write_manifest(temp_dir, manifest)
+        replace_directory(temp_dir, cache_dir)
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    return manifest
+
+def replace_directory(new_dir, target_dir):
+    """Swap `new_dir` in place of `target_dir` (the old build is removed afterwards)."""
+    old_dir = f"{target_dir}.old-{os.getpid()}"
+    if os.path.exists(target_dir):
+        os.replace(target_dir, old_dir)
+    os.replace(new_dir, target_dir)
+    shutil.rmtree(old_dir, ignore_errors=True)
+
+class ColumnKindChanged(ValueError):
+    """A column built as a feature holds a non-numeric value in a later chunk."""
+
+    def __init__(self, column, row):
+        super().__init__(f"Kolom '{column}' berisi nilai non-numerik mulai baris {row}")
+        self.column = column
+        self.row = row
+
+# jenis kolom ditentukan dari chunk pertama lalu dicek ulang tiap chunk;
+# label dikodekan per chunk dgn kosakata yg tumbuh, lalu dipetakan ke urutan kelas terurut di finish()
+class ColumnBuilder:
+    """Appends CSV chunks to per-column files and collects what the manifest needs."""
+
+    def __init__(self, directory, label_column, datetime_column, category_columns=()):
+        self.directory = directory
+        self.label_column = label_column
+        self.datetime_column = datetime_column
+        self.category_columns = set(category_columns)
+        self.columns = None
+        self.num_rows = 0
+        self._files = {}
+        self._label_index = {} # label -> kode urutan kemunculan pertama
+        self._day_offset = 0
+        self._previous_seconds = None
+
+    def append(self, chunk):
+        if self.columns is None:
+            self.columns = {name: self._column_info(name, chunk[name]) for name in chunk.columns}
+
+        for name, info in self.columns.items():
+            values = chunk[name]
+            if info['kind'] == 'feature':
+                self._append_feature(name, info, values)
+            elif info['kind'] == 'label':
+                self._write(name, self._encode_labels(values))
+            elif info['kind'] == 'category':
+                self._append_category(name, info, values)
+            else:
+                self._write(name, self._parse_timestamps(info, values))
+
+        self.num_rows += len(chunk)
+
+    def finish(self):
+        """Encode the labels, close the files and return the manifest (without 'source')."""
+        if self.columns is None:
+            raise ValueError("File CSV tidak memiliki kolom")
+
+        self.close()
+
+        if self.label_column in self.columns:
+            classes = sorted(self._label_index)
+            self._sort_label_codes(classes)
+            self.columns[self.label_column]['classes'] = classes
+
+        for info in self.columns.values():
+            if info['kind'] == 'timestamp' and info['timestamp_kind'] is None:
+                info['timestamp_kind'] = 'time_of_day' # kolom kosong seluruhnya
+            info.pop('max_decimals', None)
+            info.pop('max_abs', None)
+
+        return {
+            'format_version': CACHE_FORMAT_VERSION,
+            'num_rows': self.num_rows,
+            'label_column': self.label_column if self.label_column in self.columns else None,
+            'datetime_column': self.datetime_column if self.datetime_column in self.columns else None,
+            'columns': self.columns,
+            'built_at': time.strftime('%Y-%m-%dT%H:%M:%S')
+        }
+
+    def close(self):
+        for output_file in self._files.values():
+            output_file.close()
+        self._files = {}
+
+    # ---------------------------------------------------------------------------------
+    # Internal helpers
+    # ---------------------------------------------------------------------------------
+
+    def _column_info(self, name, values):
+        if name == self.label_column:
+            return {'kind': 'label', 'dtype': 'uint8', 'file': f"{name}.u8"}
+        if name == self.datetime_column:
+            # None sampai ada chunk dgn nilai (lihat _parse_timestamps)
+            return {'kind': 'timestamp', 'dtype': 'int64', 'file': f"{name}.i64", 'timestamp_kind': None}
+        category = {'kind': 'category', 'dtype': 'uint32', 'file': f"{name}.u32", 'categories': []}
+        if name in self.category_columns:
+            return category
+        try:
+            pd.to_numeric(values)
+        except (TypeError, ValueError):
+            return category
+        return {'kind': 'feature', 'dtype': 'float32', 'file': f"{name}.f32",
+                'decimals': 0, 'max_decimals': 0, 'max_abs': 0.0, 'nan_count': 0}
+
+    def _write(self, name, array):
+        output_file = self._files.get(name)
+        if output_file is None:
+            output_file = self._files[name] = open(os.path.join(self.directory, self.columns[name]['file']), 'wb')
+        output_file.write(np.ascontiguousarray(array).tobytes())
+
+    def _append_feature(self, name, info, values):
+        numbers = pd.to_numeric(values, errors='coerce').to_numpy(dtype=np.float64)
+        text = np.flatnonzero(np.isnan(numbers) & values.notna().to_numpy())
+        if len(text):
+            raise ColumnKindChanged(name, self.num_rows + int(text[0]))
+
+        present = numbers[~np.isnan(numbers)]
+        info['nan_count'] += int(len(numbers) - len(present))
+        if len(present):
+            info['max_abs'] = max(info['max_abs'], float(np.max(np.abs(present))))
+            info['max_decimals'] = max(info['max_decimals'], decimals_needed(present))
+
+        # desimal yg bisa dipulihkan persis: nilai x 10^desimal harus muat di presisi float32
+        fits = (info['max_decimals'] <= MAX_EXACT_DECIMALS
+                and info['max_abs'] * 10 ** info['max_decimals'] < FLOAT32_EXACT_LIMIT)
+        info['decimals'] = info['max_decimals'] if fits else None
+        self._write(name, numbers.astype(np.float32))
+
+    def _append_category(self, name, info, values):
+        categories = info['categories']
+        index = {category: code for code, category in enumerate(categories)}
+        codes = np.empty(len(values), dtype=np.uint32)
+        for row, value in enumerate(values.tolist()):
+            key = None if pd.isna(value) else value
+            code = index.get(key)
+            if code is None:
+                code = index[key] = len(categories)
+                categories.append(key)
+            codes[row] = code
+        self._write(name, codes)
+
+    def _encode_labels(self, values):
+        """uint8 codes in first-seen order; finish() maps them to sorted class order."""
+        index = self._label_index
+        codes = np.full(len(values), MISSING_LABEL, dtype=np.uint8)
+        present = values.notna().to_numpy()
+        uniques, inverse = np.unique(values[present].to_numpy(dtype=str), return_inverse=True)
+        for label in uniques.tolist():
+            if label not in index:
+                if len(index) + 1 >= MISSING_LABEL:
+                    raise ValueError(f"Terlalu banyak kelas label (lebih dari {MISSING_LABEL - 1})")
+                index[label] = len(index)
+        codes[present] = np.array([index[label] for label in uniques.tolist()], dtype=np.uint8)[inverse]
+        return codes
+
+    def _sort_label_codes(self, classes, block_rows=DEFAULT_CHUNK_ROWS):
+        """Rewrite the label file in place so codes follow `classes` (LabelEncoder order)."""
+        lookup = np.arange(MISSING_LABEL + 1, dtype=np.uint8)
+        for position, label in enumerate(classes):
+            lookup[self._label_index[label]] = position
+        if self.num_rows == 0 or np.array_equal(lookup, np.arange(MISSING_LABEL + 1)):
+            return
+
+        path = os.path.join(self.directory, self.columns[self.label_column]['file'])
+        codes = np.memmap(path, dtype=np.uint8, mode='r+', shape=(self.num_rows,))
+        for start in range(0, self.num_rows, block_rows):
+            codes[start:start + block_rows] = lookup[codes[start:start + block_rows]]
+        codes.flush()
+        del codes
+
+    def _parse_timestamps(self, info, values):
+        present = values.dropna()
+        if not present.empty:
+            time_of_day = present.str.match(TIME_OF_DAY_PATTERN)
+            kind = 'time_of_day' if time_of_day.all() else 'unix'
+            if time_of_day.any() and kind == 'unix' or info['timestamp_kind'] not in (None, kind):
+                raise ValueError(f"Kolom '{self.datetime_column}' mencampur jam ('HH:MM:SS') dan tanggal "
+                                 f"(chunk mulai baris {self.num_rows})")
+            info['timestamp_kind'] = kind
+        if info['timestamp_kind'] is None:
+            return np.full(len(values), MISSING_TIMESTAMP, dtype=np.int64)
+
+        if info['timestamp_kind'] == 'unix':
+            # NaT menjadi MISSING_TIMESTAMP
+            return pd.to_datetime(values, format='ISO8601').to_numpy(dtype='datetime64[s]').astype(np.int64)
+
+        missing = values.isna().to_numpy()
+        timestamps = np.full(len(values), MISSING_TIMESTAMP, dtype=np.int64)
+        present = values[~missing]
+        if present.empty:
+            return timestamps
+
+        parts = present.str.split(':', expand=True).astype(int)
+        seconds = parts[0] * 3600 + parts[1] * 60 + (parts[2] if 2 in parts.columns else 0)
+        seconds = seconds.to_numpy(dtype=np.int64)
+
+        # hari baru saat jam tidak naik dibanding baris sebelumnya (sama dgn vc_stub.load_csv_days)
+        previous = np.concatenate(([self._previous_seconds if self._previous_seconds is not None else SECONDS_PER_DAY],
+                                   seconds[:-1]))
+        day_index = self._day_offset + np.cumsum(seconds <= previous) - 1
+        self._day_offset = int(day_index[-1]) + 1
+        self._previous_seconds = int(seconds[-1])
+        timestamps[~missing] = day_index * SECONDS_PER_DAY + seconds
+        return timestamps
+
+def decimals_needed(values):
+    """Smallest number of decimals (up to MAX_EXACT_DECIMALS + 1) that represents every value."""
+    for decimals in range(MAX_EXACT_DECIMALS + 1):
+        if np.array_equal(np.round(values, decimals), values):
+            return decimals
+    return MAX_EXACT_DECIMALS + 1
+
+# =====================================================================================
+# COMMAND LINE
+# =====================================================================================
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Build or check the columnar cache of an hourly weather CSV')
+    parser.add_argument('csv', nargs='?', default=DEFAULT_CSV_PATH, help='Source CSV (default: ../DataCuaca.csv)')
+    parser.add_argument('--cache-dir', help='Cache directory (default: <csv>.columnar next to the CSV)')
+    parser.add_argument('--rebuild', action='store_true', help='Rebuild even if the cache is up to date')
+    parser.add_argument('--chunk-rows', type=int, default=DEFAULT_CHUNK_ROWS, help='CSV rows parsed per chunk')
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    started = time.perf_counter()
+    dataset = load_dataset(args.csv, args.cache_dir, rebuild=args.rebuild, chunk_rows=args.chunk_rows)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    stats = dataset.stats()
+    print(f"📦 Cache kolom '{dataset.cache_dir}': {stats['rows']} baris, {len(stats['features'])} fitur, "
+          f"kelas {stats['classes']}, {stats['bytes'] / 1024:.1f} KiB ({elapsed_ms:.1f} ms)")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
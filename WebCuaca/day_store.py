@@ -0,0 +1,167 @@
+"""
+Description: Compact per-day hourly feature store (float64 arrays) shared by all API routes
+"""
+
+# =====================================================================================
+# IMPORTS AND DEPENDENCIES
+# =====================================================================================
+
+import threading
+import time
+from collections import OrderedDict
+from datetime import date
+
+import numpy as np # utk array fitur per jam
+
+# =====================================================================================
+# STORE LAYOUT
+# =====================================================================================
+
+# kolom numerik yg dibutuhkan semua route (fitur model + feelslike utk route per jam)
+NUMERIC_FIELDS = ('temp', 'humidity', 'windspeed', 'windgust', 'precip', 'cloudcover',
+                  'pressure', 'visibility', 'solarradiation', 'uvindex', 'feelslike')
+TEXT_FIELDS = ('conditions', 'description')
+FIELD_INDEX = {field: index for index, field in enumerate(NUMERIC_FIELDS)}
+
+# elemen visual crossing yg diminta utk mengisi store
+DAY_STORE_ELEMENTS = ",".join(('datetime',) + NUMERIC_FIELDS + TEXT_FIELDS)
+
+# =====================================================================================
+# DAY FRAME
+# =====================================================================================
+
+class DayFrame:
+    """
+    One (location, date) of hourly data as a contiguous float64 matrix.
+
+    `values` has one row per hour and one column per NUMERIC_FIELDS entry,
+    holding the exact numbers of the upstream JSON; null or missing values
+    are NaN. Hour labels and the condition and description strings are kept
+    in small side lists.
+    """
+
+    __slots__ = ('date_str', 'hour_labels', 'hour_of_day', 'values', 'conditions', 'descriptions')
+
+    def __init__(self, date_str, hour_labels, values, conditions, descriptions):
+        self.date_str = date_str
+        self.hour_labels = hour_labels
+        self.hour_of_day = np.array([int(label.split(":")[0]) for label in hour_labels], dtype=np.int16)
+        self.values = values
+        self.conditions = conditions
+        self.descriptions = descriptions
+
+    @classmethod
+    def from_timeline_day(cls, day):
+        """Build a frame from a timeline 'days' entry fetched with include=hours."""
+        hours = day.get("hours") or []
+        # float64 langsung dari nilai JSON: dibaca berulang oleh semua route tanpa konversi ulang
+        values = np.full((len(hours), len(NUMERIC_FIELDS)), np.nan, dtype=np.float64)
+
+        for row, hour in enumerate(hours):
+            for column, field in enumerate(NUMERIC_FIELDS):
+                value = hour.get(field)
+                if value is not None:
+                    values[row, column] = value
+
+        return cls(
+            day.get("datetime"),
+            [hour["datetime"] for hour in hours],
+            values,
+            [hour.get("conditions", "") for hour in hours],
+            [hour.get("description", "") for hour in hours]
+        )
+
+    def __len__(self):
+        return len(self.hour_labels)
+
+    @property
+    def nbytes(self):
+        return self.values.nbytes + self.hour_of_day.nbytes
+
+    def columns(self, fields, rows=slice(None)):
+        """Float64 matrix of the given fields, exactly as the upstream decimals."""
+        indices = [FIELD_INDEX[field] for field in fields]
+        return self.values[rows][:, indices]
+
+    def hour_rows(self, start_hour, end_hour):
+        """Row indices whose hour of day is in [start_hour, end_hour)."""
+        return np.flatnonzero((self.hour_of_day >= start_hour) & (self.hour_of_day < end_hour))
+
+    def find_hour(self, label_prefix):
+        """Index of the first hour whose label starts with the prefix, or None."""
+        return next((row for row, label in enumerate(self.hour_labels) if label.startswith(label_prefix)), None)
+
+    def record(self, row):
+        """One hour as a dict (NaN becomes None), like the upstream hour object."""
+        record = {field: (None if np.isnan(value) else float(value))
+                  for field, value in zip(NUMERIC_FIELDS, self.values[row])}
+        record["datetime"] = self.hour_labels[row]
+        record["conditions"] = self.conditions[row]
+        record["description"] = self.descriptions[row]
+        return record
+
+# =====================================================================================
+# DAY STORE
+# =====================================================================================
+
+# tanggal lampau disimpan tanpa kedaluwarsa, hari ini dan masa depan memakai TTL
+class DayStore:
+    """
+    LRU of DayFrame objects keyed by (location, date_str).
+
+    Uses the same expiry policy as the timeline cache: past dates never
+    expire, today and future dates expire after `ttl_seconds`.
+    """
+
+    def __init__(self, max_entries=512, ttl_seconds=600, today_fn=date.today):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.today_fn = today_fn
+        self._frames = OrderedDict()  # key -> (frame, expires_at or None)
+        self._lock = threading.Lock()
+        self._counters = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+    def get(self, location, date_str):
+        key = (location, date_str)
+        with self._lock:
+            entry = self._frames.get(key)
+            if entry is not None and (entry[1] is None or entry[1] > time.time()):
+                self._frames.move_to_end(key)
+                self._counters['hits'] += 1
+                return entry[0]
+            if entry is not None:
+                del self._frames[key]
+            self._counters['misses'] += 1
+            return None
+
+    def contains(self, location, date_str):
+        """True when a fresh frame is stored; leaves LRU order and hit counters untouched."""
+        with self._lock:
+            entry = self._frames.get((location, date_str))
+            return entry is not None and (entry[1] is None or entry[1] > time.time())
+
+    def put(self, location, frame):
+        try:
+            immutable = date.fromisoformat(frame.date_str) < self.today_fn()
+        except (TypeError, ValueError):
+            immutable = False
+        expires_at = None if immutable else time.time() + self.ttl_seconds
+
+        with self._lock:
+            self._frames[(location, frame.date_str)] = (frame, expires_at)
+            self._frames.move_to_end((location, frame.date_str))
+            while len(self._frames) > self.max_entries:
+                self._frames.popitem(last=False)
+                self._counters['evictions'] += 1
+
+    def clear(self):
+        """Drop all frames."""
+        with self._lock:
+            self._frames.clear()
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._counters)
+            stats['entries'] = len(self._frames)
+            stats['bytes'] = sum(frame.nbytes for frame, _ in self._frames.values())
+        return stats
@@ -0,0 +1,420 @@
+"""
+Description: Parallel grid of the four resampling scenarios (dasar, oversampling, undersampling, hybrid)
+
+Loads and preprocesses DataCuaca.csv once (dataset_cache.py + preprocessing.py),
+writes the scaled training matrix to .npy files that every worker
+memory-maps, then scores one SVC(kernel='rbf', class_weight='balanced') per
+scenario x strategy x C x gamma by stratified k-fold cross-validation on the
+training split in a process pool. Results go to results.csv/results.json.
+The best grid point is refitted on the whole training split, evaluated once
+on the test split (which never takes part in the selection) and exported as
+svm_model_cuaca.pkl, scaler_cuaca.pkl and the NumPy bundles app.py loads.
+
+Usage:
+    python experiment_runner.py ../DataCuaca.csv --workers 8
+    python experiment_runner.py --scenarios dasar,hybrid --C 1,10 --gamma scale,0.1
+    python experiment_runner.py --export-dir .    # ganti model yg dipakai app.py
+"""
+
+# =====================================================================================
+# IMPORTS AND DEPENDENCIES
+# =====================================================================================
+
+import argparse
+import csv
+import itertools
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+from dataset_cache import DEFAULT_CSV_PATH, load_dataset
+from model_config import MODEL_CONFIG # hanya nama file artefak dan kolom fitur yg diharapkan app.py
+from preprocessing import default_prepared_dir, preprocess
+
+# =====================================================================================
+# EXPERIMENT CONFIGURATION
+# =====================================================================================
+
+# strategi resampling per skenario; None = tanpa resampling (notebook dasar)
+# 'middle' (hybrid): kelas mayoritas di-undersample dan minoritas di-SMOTE ke jumlah kelas tengah, spt notebook hybrid
+EXPERIMENT_GRID = {
+    'scenarios': {
+        'dasar': [None],
+        'undersampling': ['auto', 'majority'],
+        'oversampling': ['auto', 'minority'],
+        'hybrid': ['middle', 'mean']
+    },
+    'C': [0.1, 1.0, 10.0, 100.0],
+    'gamma': ['scale', 0.01, 0.1, 1.0]
+}
+
+# sama dgn notebook
+RANDOM_STATE = 42
+
+# jumlah fold cross-validation pada split train; split test hanya dipakai utk model terpilih
+CV_FOLDS = 5
+
+# metrik pemilihan model terbaik (rata-rata cross-validation, lebih besar lebih baik)
+SELECTION_METRICS = ('macro_f1', 'balanced_accuracy', 'accuracy')
+
+DEFAULT_RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'experiments')
+
+# kolom results.csv: metrik rata-rata antar fold (metrik test hanya utk model terpilih, di results.json)
+RESULT_FIELDS = ('scenario', 'strategy', 'C', 'gamma', 'train_rows', 'cv_accuracy', 'cv_balanced_accuracy',
+                 'cv_macro_f1', 'cv_macro_f1_std', 'n_support', 'fit_seconds', 'predict_seconds', 'error')
+
+# =====================================================================================
+# RESAMPLING
+# =====================================================================================
+
+def make_resampler_steps(scenario, strategy, y_train):
+    """
+    imblearn samplers applied in order for one scenario.
+
+    Raises:
+        ImportError: If imbalanced-learn is not installed (every scenario except 'dasar')
+    """
+    if scenario == 'dasar':
+        return []
+
+    from imblearn.over_sampling import SMOTE # hanya dibutuhkan utk skenario dgn resampling
+    from imblearn.under_sampling import RandomUnderSampler
+
+    if scenario == 'undersampling':
+        return [RandomUnderSampler(sampling_strategy=strategy, random_state=RANDOM_STATE)]
+    if scenario == 'oversampling':
+        return [SMOTE(sampling_strategy=strategy, random_state=RANDOM_STATE)]
+
+    under_targets, over_targets = hybrid_targets(y_train, strategy)
+    return [RandomUnderSampler(sampling_strategy=under_targets, random_state=RANDOM_STATE),
+            SMOTE(sampling_strategy=over_targets, random_state=RANDOM_STATE)]
+
+def hybrid_targets(y_train, strategy):
+    """
+    Per-class sample counts of the hybrid scenario.
+
+    'middle' reproduces the notebook ({0: 476, 1: 476, 2: 160} undersampling,
+    then {2: 476} SMOTE): every class ends at the median class count.
+    'mean' uses the mean class count instead.
+
+    Returns:
+        tuple: (RandomUnderSampler strategy dict, SMOTE strategy dict)
+    """
+    classes, counts = np.unique(y_train, return_counts=True)
+    if strategy == 'middle':
+        target = int(np.median(counts))
+    elif strategy == 'mean':
+        target = int(counts.mean())
+    else:
+        raise ValueError(f"Strategi hybrid tidak dikenal: {strategy}")
+
+    under_targets = {int(label): int(min(count, target)) for label, count in zip(classes, counts)}
+    over_targets = {int(label): target for label, count in zip(classes, counts) if count < target}
+    return under_targets, over_targets
+
+def resample(scenario, strategy, X_train, y_train):
+    for sampler in make_resampler_steps(scenario, strategy, y_train):
+        X_train, y_train = sampler.fit_resample(X_train, y_train)
+    return X_train, y_train
+
+# =====================================================================================
+# WORKER PROCESS
+# =====================================================================================
+
+# array dibuka sekali per proses worker dgn mmap; halaman dibagi antar worker lewat page cache
+_shared = {}
+
+def init_worker(shared_dir):
+    for name in ('X_train', 'y_train', 'folds'):
+        _shared[name] = np.load(os.path.join(shared_dir, f"{name}.npy"), mmap_mode='r')
+
+def run_experiment(params):
+    """
+    Cross-validate one grid point on the training split in a worker process.
+
+    Resampling is applied inside each fold to the fold's training rows only,
+    so synthetic or dropped rows never leak into the rows it is scored on.
+
+    Returns:
+        dict: params plus mean fold metrics ('cv_*') and timings, or 'error'
+    """
+    result = dict(params, error=None)
+    try:
+        folds = np.asarray(_shared['folds'])
+        scores, train_rows, n_support, fit_times, predict_times = [], [], [], [], []
+        for fold in range(int(folds.max()) + 1):
+            X_fold, y_fold = resample(params['scenario'], params['strategy'],
+                                      _shared['X_train'][folds != fold], _shared['y_train'][folds != fold])
+            model, fit_seconds = fit_model(X_fold, y_fold, params['C'], params['gamma'])
+
+            started = time.perf_counter()
+            y_pred = model.predict(_shared['X_train'][folds == fold])
+            predict_times.append(time.perf_counter() - started)
+
+            scores.append(evaluate_predictions(_shared['y_train'][folds == fold], y_pred))
+            train_rows.append(len(y_fold))
+            n_support.append(int(model.n_support_.sum()))
+            fit_times.append(fit_seconds)
+
+        for metric in SELECTION_METRICS:
+            result[f"cv_{metric}"] = round(float(np.mean([score[metric] for score in scores])), 4)
+        result['cv_macro_f1_std'] = round(float(np.std([score['macro_f1'] for score in scores])), 4)
+        result.update(train_rows=int(np.mean(train_rows)), n_support=int(np.mean(n_support)),
+                      fit_seconds=round(float(np.mean(fit_times)), 4),
+                      predict_seconds=round(float(np.mean(predict_times)), 4))
+    except Exception as e:
+        result['error'] = f"{type(e).__name__}: {e}"
+    return result
+
+def fit_model(X_train, y_train, C, gamma):
+    """SVC as in the notebooks (rbf, class_weight='balanced', random_state=42)."""
+    from sklearn.svm import SVC
+
+    model = SVC(kernel='rbf', C=C, gamma=gamma, class_weight='balanced', random_state=RANDOM_STATE)
+    started = time.perf_counter()
+    model.fit(X_train, y_train)
+    return model, time.perf_counter() - started
+
+def evaluate_predictions(y_true, y_pred):
+    from sklearn.metrics import accuracy_score, balanced_accuracy_score, confusion_matrix, f1_score, recall_score
+
+    labels = np.unique(np.concatenate([np.asarray(y_true), np.asarray(y_pred)]))
+    return {
+        'accuracy': round(float(accuracy_score(y_true, y_pred)), 4),
+        'balanced_accuracy': round(float(balanced_accuracy_score(y_true, y_pred)), 4),
+        'macro_f1': round(float(f1_score(y_true, y_pred, average='macro', zero_division=0)), 4),
+        'recall_per_class': [round(float(value), 4) for value in
+                             recall_score(y_true, y_pred, labels=labels, average=None, zero_division=0)],
+        'confusion_matrix': confusion_matrix(y_true, y_pred, labels=labels).tolist()
+    }
+
+# =====================================================================================
+# EXPERIMENT RUN
+# =====================================================================================
+
+def build_grid(scenarios, c_values, gamma_values):
+    """Grid points, most expensive scenarios (largest resampled train sets) first for better pool packing."""
+    cost_order = {'oversampling': 0, 'dasar': 1, 'hybrid': 2, 'undersampling': 3}
+    grid = [
+        {'scenario': scenario, 'strategy': strategy, 'C': c_value, 'gamma': gamma}
+        for scenario in scenarios
+        for strategy, c_value, gamma in itertools.product(EXPERIMENT_GRID['scenarios'][scenario], c_values, gamma_values)
+    ]
+    return sorted(grid, key=lambda params: (cost_order.get(params['scenario'], 0), -params['C']))
+
+# scaler di-fit pada DataFrame, jadi input transform harus punya nama kolom yg sama (tanpa warning sklearn)
+def scale_features(scaler, rows, feature_columns):
+    return scaler.transform(pd.DataFrame(np.asarray(rows), columns=feature_columns))
+
+# worker hanya melihat split train; split test tidak pernah ikut pemilihan
+def prepare_shared_arrays(prepared, scaler, shared_dir, cv_folds=CV_FOLDS):
+    """Write the scaled training matrix and its stratified fold ids once for the workers to memory-map."""
+    from sklearn.model_selection import StratifiedKFold
+
+    os.makedirs(shared_dir, exist_ok=True)
+    y_train = np.asarray(prepared.y_train)
+    folds = np.empty(len(y_train), dtype=np.int8)
+    splitter = StratifiedKFold(n_splits=cv_folds, shuffle=True, random_state=RANDOM_STATE)
+    for fold, (_, validation_rows) in enumerate(splitter.split(np.zeros(len(y_train)), y_train)):
+        folds[validation_rows] = fold
+
+    arrays = {
+        'X_train': scale_features(scaler, prepared.X_train, prepared.feature_columns),
+        'y_train': y_train,
+        'folds': folds
+    }
+    for name, array in arrays.items():
+        np.save(os.path.join(shared_dir, f"{name}.npy"), array)
+
+def run_grid(grid, shared_dir, workers):
+    """Run every grid point in a process pool and return the results in completion order."""
+    results = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(shared_dir,)) as executor:
+        futures = [executor.submit(run_experiment, params) for params in grid]
+        for done, future in enumerate(as_completed(futures), 1):
+            result = future.result()
+            results.append(result)
+            status = result['error'] or (f"CV macro F1 {result['cv_macro_f1']:.4f} "
+                                         f"(±{result['cv_macro_f1_std']:.4f}), CV akurasi {result['cv_accuracy']:.4f}")
+            print(f"[{done}/{len(grid)}] {result['scenario']}/{result['strategy']} "
+                  f"C={result['C']} gamma={result['gamma']}: {status}")
+    return results
+
+def select_best(results, metric):
+    """Grid point with the best mean cross-validation `metric`; test metrics play no part."""
+    successful = [result for result in results if result['error'] is None]
+    if not successful:
+        return None
+    # seri: model dgn lebih sedikit support vector (inferensi lebih cepat)
+    return max(successful, key=lambda result: (result[f"cv_{metric}"], -result['n_support']))
+
+def write_results(results, results_dir, summary):
+    os.makedirs(results_dir, exist_ok=True)
+    ordered = sorted(results, key=lambda result: (result['scenario'], str(result['strategy']), result['C'], str(result['gamma'])))
+
+    with open(os.path.join(results_dir, 'results.csv'), 'w', encoding='utf-8', newline='') as results_file:
+        writer = csv.DictWriter(results_file, fieldnames=RESULT_FIELDS, extrasaction='ignore')
+        writer.writeheader()
+        writer.writerows(ordered)
+
+    with open(os.path.join(results_dir, 'results.json'), 'w', encoding='utf-8') as results_file:
+        json.dump(dict(summary, results=ordered), results_file, indent=2)
+
+# =====================================================================================
+# FINAL MODEL
+# =====================================================================================
+
+def fit_winner(best, prepared, scaler):
+    """
+    Refit the winning grid point on the whole training split and score it once on the test split.
+
+    The model is fitted on a DataFrame so it records feature_names_in_ like
+    the notebooks' svm_model_cuaca.pkl.
+
+    Returns:
+        tuple: (fitted SVC, test metrics dict)
+    """
+    columns = prepared.feature_columns
+    X_train = pd.DataFrame(scale_features(scaler, prepared.X_train, columns), columns=columns)
+    X_train, y_train = resample(best['scenario'], best['strategy'], X_train, np.asarray(prepared.y_train))
+    model, fit_seconds = fit_model(X_train, y_train, best['C'], best['gamma'])
+
+    X_test = pd.DataFrame(scale_features(scaler, prepared.X_test, columns), columns=columns)
+    test_metrics = evaluate_predictions(np.asarray(prepared.y_test), model.predict(X_test))
+    test_metrics.update(train_rows=len(y_train), n_support=int(model.n_support_.sum()),
+                        fit_seconds=round(fit_seconds, 4))
+    return model, test_metrics
+
+def export_winner(model, prepared, scaler, export_dir):
+    """
+    Write the artifacts app.py loads for the refitted winner.
+
+    Raises:
+        ValueError: If the dataset's features differ from MODEL_CONFIG['feature_columns']
+    """
+    import joblib
+
+    from svc_engine import export_bundle, export_flat_bundle, write_export_stamp
+
+    if sorted(prepared.feature_columns) != sorted(MODEL_CONFIG['feature_columns']):
+        raise ValueError(f"Kolom fitur dataset {prepared.feature_columns} "
+                         f"tidak sama dengan MODEL_CONFIG {MODEL_CONFIG['feature_columns']}")
+
+    os.makedirs(export_dir, exist_ok=True)
+    paths = {key: os.path.join(export_dir, os.path.basename(MODEL_CONFIG[key]))
+             for key in ('svm_model_path', 'scaler_path', 'engine_bundle_path', 'engine_flat_path',
+                         'export_stamp_path')}
+    joblib.dump(model, paths['svm_model_path'])
+    joblib.dump(scaler, paths['scaler_path'])
+    arrays = export_bundle(model, scaler, paths['engine_bundle_path'], prepared.feature_columns)
+    header = export_flat_bundle(arrays, paths['engine_flat_path'])
+    write_export_stamp(paths['export_stamp_path'], 'mmap', header['checksum'])
+    return paths
+
+# =====================================================================================
+# COMMAND LINE
+# =====================================================================================
+
+def parse_list(value, convert):
+    return [convert(item.strip()) for item in value.split(',') if item.strip()]
+
+def parse_gamma(value):
+    return value if value in ('scale', 'auto') else float(value)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Run the resampling scenario x SVC hyperparameter grid in parallel')
+    parser.add_argument('csv', nargs='?', default=DEFAULT_CSV_PATH, help='Source CSV (default: ../DataCuaca.csv)')
+    parser.add_argument('--scenarios', default=','.join(EXPERIMENT_GRID['scenarios']),
+                        help='Comma-separated scenarios (default: all four)')
+    parser.add_argument('--C', dest='c_values', default=','.join(str(c) for c in EXPERIMENT_GRID['C']),
+                        help='Comma-separated C values')
+    parser.add_argument('--gamma', default=','.join(str(g) for g in EXPERIMENT_GRID['gamma']),
+                        help="Comma-separated gamma values ('scale', 'auto' or numbers)")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help='Worker processes (default: CPU count)')
+    parser.add_argument('--select-by', choices=SELECTION_METRICS, default='macro_f1',
+                        help='Mean cross-validation metric used to pick the exported model')
+    parser.add_argument('--cv-folds', type=int, default=CV_FOLDS,
+                        help='Stratified folds of the training split used for selection')
+    parser.add_argument('--results-dir', default=DEFAULT_RESULTS_DIR, help='Where results.csv/results.json are written')
+    parser.add_argument('--export-dir', help='Export the best model here (default: <results-dir>/best; '
+                                             "'.' replaces the model served by app.py)")
+    parser.add_argument('--no-export', action='store_true', help='Only write the results table')
+    args = parser.parse_args(argv)
+
+    args.scenarios = parse_list(args.scenarios, str)
+    unknown = [scenario for scenario in args.scenarios if scenario not in EXPERIMENT_GRID['scenarios']]
+    if unknown:
+        parser.error(f"Skenario tidak dikenal: {', '.join(unknown)}")
+    args.c_values = parse_list(args.c_values, float)
+    args.gamma = parse_list(args.gamma, parse_gamma)
+    if args.cv_folds < 2:
+        parser.error("--cv-folds minimal 2")
+    return args
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    if any(scenario != 'dasar' for scenario in args.scenarios):
+        try:
+            import imblearn # noqa: F401
+        except ImportError:
+            print("Paket imbalanced-learn belum terpasang (pip install imbalanced-learn); "
+                  "jalankan dgn --scenarios dasar atau pasang paketnya.")
+            return 1
+
+    started = time.perf_counter()
+    dataset = load_dataset(args.csv)
+    prepared = preprocess(dataset, default_prepared_dir(dataset))
+    scaler = prepared.fit_scaler()
+    shared_dir = os.path.join(prepared.directory, 'scaled')
+    prepare_shared_arrays(prepared, scaler, shared_dir, args.cv_folds)
+    prepare_seconds = time.perf_counter() - started
+
+    grid = build_grid(args.scenarios, args.c_values, args.gamma)
+    print(f"🧪 {len(grid)} eksperimen x {args.cv_folds} fold, {args.workers} worker, {prepared.train_size} baris train / "
+          f"{prepared.num_rows - prepared.train_size} baris test (persiapan {prepare_seconds:.1f} s)")
+
+    started = time.perf_counter()
+    results = run_grid(grid, shared_dir, args.workers)
+    grid_seconds = time.perf_counter() - started
+
+    best = select_best(results, args.select_by)
+    model, test_metrics = fit_winner(best, prepared, scaler) if best is not None else (None, None)
+    summary = {
+        'csv': os.path.abspath(args.csv),
+        'classes': prepared.classes,
+        'feature_columns': prepared.feature_columns,
+        'train_rows': prepared.train_size,
+        'test_rows': prepared.num_rows - prepared.train_size,
+        'workers': args.workers,
+        'prepare_seconds': round(prepare_seconds, 2),
+        'grid_seconds': round(grid_seconds, 2),
+        'cv_folds': args.cv_folds,
+        'select_by': args.select_by,
+        'best': best,
+        'test': test_metrics # hanya model terpilih, setelah pemilihan selesai
+    }
+    write_results(results, args.results_dir, summary)
+    print(f"Hasil disimpan ke '{args.results_dir}' ({grid_seconds:.1f} s)")
+
+    if best is None:
+        print("Semua eksperimen gagal; tidak ada model yang diekspor.")
+        return 1
+
+    print(f"🏆 Terbaik (CV {args.select_by}): {best['scenario']}/{best['strategy']} C={best['C']} gamma={best['gamma']} "
+          f"-> CV macro F1 {best['cv_macro_f1']:.4f}; test: macro F1 {test_metrics['macro_f1']:.4f}, "
+          f"akurasi {test_metrics['accuracy']:.4f}")
+
+    if not args.no_export:
+        paths = export_winner(model, prepared, scaler, args.export_dir or os.path.join(args.results_dir, 'best'))
+        print("Model terbaik diekspor ke " + ", ".join(f"'{path}'" for path in paths.values()))
+
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,98 @@
+"""
+Description: Export svm_model_cuaca.pkl and scaler_cuaca.pkl into NumPy bundles for svc_engine
+
+Writes the .npz bundle and the flat bundle that app.py memory-maps, then
+the export stamp that tells a running app.py to reload.
+
+Usage:
+    python export_model.py
+    python export_model.py --verify ../DataCuaca.csv
+"""
+
+# =====================================================================================
+# IMPORTS AND DEPENDENCIES
+# =====================================================================================
+
+import argparse
+import sys
+
+import joblib # utk loading model ML yg sdh dilatih
+import numpy as np
+import pandas as pd
+
+from dataset_cache import load_dataset
+from model_config import MODEL_CONFIG
+from svc_engine import SVCEngine, export_bundle, export_flat_bundle, write_export_stamp
+
+# =====================================================================================
+# PARITY CHECK
+# =====================================================================================
+
+# membandingkan hasil engine NumPy dgn sklearn pada baris-baris DataCuaca.csv
+def verify_parity(svm_model, scaler, engine, csv_path, tolerance=1e-9):
+    """
+    Compare engine output with sklearn on the rows of a CSV file.
+
+    Returns:
+        bool: True when labels match exactly and probabilities within tolerance
+    """
+    # dibaca dari cache kolom (dibuat otomatis saat pertama kali / saat CSV berubah)
+    dataset = load_dataset(csv_path)
+    features = pd.DataFrame(dataset.feature_matrix(engine.feature_columns), columns=engine.feature_columns).dropna()
+    features_scaled = pd.DataFrame(scaler.transform(features), columns=engine.feature_columns)
+
+    expected_labels = svm_model.predict(features_scaled)
+    engine_labels = engine.predict(features.to_numpy())
+    label_mismatches = int(np.sum(expected_labels != engine_labels))
+    print(f"Baris diuji: {len(features)}, label berbeda: {label_mismatches}")
+
+    passed = label_mismatches == 0
+
+    if engine.supports_probability:
+        expected_proba = svm_model.predict_proba(features_scaled)
+        engine_proba = engine.predict_proba(features.to_numpy())
+        max_difference = float(np.max(np.abs(expected_proba - engine_proba)))
+        print(f"Selisih probabilitas maksimum: {max_difference:.3e}")
+        passed = passed and max_difference <= tolerance
+
+    return passed
+
+# =====================================================================================
+# COMMAND LINE
+# =====================================================================================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export model SVC dan scaler ke bundle NumPy.")
+    parser.add_argument('--model', default=MODEL_CONFIG['svm_model_path'])
+    parser.add_argument('--scaler', default=MODEL_CONFIG['scaler_path'])
+    parser.add_argument('--output', default=MODEL_CONFIG['engine_bundle_path'])
+    parser.add_argument('--flat-output', default=MODEL_CONFIG['engine_flat_path'],
+                        help="Bundle datar yg dibuka dgn mmap oleh app.py")
+    parser.add_argument('--stamp-output', default=MODEL_CONFIG['export_stamp_path'],
+                        help="Stamp yg ditulis terakhir; app.py dgn MODEL_RELOAD_WATCH=1 reload saat file ini berubah")
+    parser.add_argument('--verify', metavar='CSV', help="Cek kesesuaian hasil dgn sklearn pada file CSV")
+    args = parser.parse_args(argv)
+
+    svm_model = joblib.load(args.model)
+    scaler = joblib.load(args.scaler)
+
+    arrays = export_bundle(svm_model, scaler, args.output, MODEL_CONFIG['feature_columns'])
+    print(f"Bundle disimpan ke '{args.output}' "
+          f"({arrays['support_vectors'].shape[0]} support vector, {len(arrays['feature_columns'])} fitur)")
+    header = export_flat_bundle(arrays, args.flat_output)
+    print(f"Bundle datar (mmap) disimpan ke '{args.flat_output}'")
+
+    if args.verify:
+        for engine in (SVCEngine.load(args.output), SVCEngine.load_mapped(args.flat_output)):
+            if not verify_parity(svm_model, scaler, engine, args.verify):
+                print("Hasil engine TIDAK sama dengan sklearn!")
+                return 1
+        print("Hasil engine sama dengan sklearn.")
+
+    # stamp terakhir (dan hanya jika verifikasi lolos), agar server memuat export yg sdh lengkap
+    write_export_stamp(args.stamp_output, 'mmap', header['checksum'])
+    print(f"Stamp export ditulis ke '{args.stamp_output}'")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,208 @@
+"""
+Description: Open-loop load generator for the weather prediction API routes
+
+Sends requests at a fixed target rate (independent of response times) to a
+running app and reports p50/p95/p99 latency, throughput and error rate per
+route. Point the app at vc_stub.py so no Visual Crossing quota is used.
+
+Usage:
+    python vc_stub.py --latency-ms 150 &
+    VISUAL_CROSSING_BASE_URL=http://127.0.0.1:8765/VisualCrossingWebServices/rest/services/timeline python app.py &
+    python load_test.py --base-url http://127.0.0.1:5000 --rps 50 --duration 30 --output hasil_beban.json
+"""
+
+# =====================================================================================
+# IMPORTS AND DEPENDENCIES
+# =====================================================================================
+
+import argparse
+import json
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+import requests # utk mengirim request ke aplikasi
+
+from upstream import percentile_ms
+
+# =====================================================================================
+# ROUTE SCENARIOS
+# =====================================================================================
+
+# setiap skenario membuat (method, path, json_body) utk tanggal acak
+def daily_request(start_date):
+    return 'GET', f"/api/predict_weather?date={start_date}", None
+
+def weekly_request(start_date):
+    return 'GET', f"/api/predict_weekly_weather?date={start_date}", None
+
+def weekly_stream_request(start_date):
+    return 'GET', f"/api/predict_weekly_weather/stream?date={start_date}", None
+
+def hourly_request(start_date):
+    return 'GET', f"/api/predict_hourly_weather?date={start_date}&hour={random.randint(0, 19)}", None
+
+def hourly_range_request(start_date):
+    return 'GET', f"/api/predict_hourly_range?date={start_date}&days={random.randint(1, 7)}", None
+
+def batch_request(start_date):
+    items = [
+        {'location': location, 'date': (start_date + timedelta(days=offset)).isoformat(),
+         'hour_start': 6, 'hour_end': 18}
+        for location in ('Ambon, Maluku', 'Masohi, Maluku', 'Tual, Maluku')
+        for offset in range(3)
+    ]
+    return 'POST', "/api/predict_batch", {'items': items}
+
+ROUTE_SCENARIOS = {
+    'daily': daily_request,
+    'weekly': weekly_request,
+    'weekly_stream': weekly_stream_request,
+    'hourly': hourly_request,
+    'hourly_range': hourly_range_request,
+    'batch': batch_request
+}
+
+# =====================================================================================
+# LOAD GENERATION
+# =====================================================================================
+
+class LoadResults:
+    """Thread-safe collection of per-route latencies and failures."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies = {}
+        self.errors = {}
+        self.status_counts = {}
+
+    def record(self, route, seconds, status):
+        with self._lock:
+            self.latencies.setdefault(route, []).append(seconds)
+            self.status_counts.setdefault(route, {})
+            self.status_counts[route][status] = self.status_counts[route].get(status, 0) + 1
+            if not isinstance(status, int) or status >= 400:
+                self.errors[route] = self.errors.get(route, 0) + 1
+
+    def summary(self, elapsed):
+        """Per-route and overall latency percentiles (ms), throughput (req/s) and error rate."""
+        with self._lock:
+            latencies = {route: sorted(samples) for route, samples in self.latencies.items()}
+            errors = dict(self.errors)
+            status_counts = {route: dict(counts) for route, counts in self.status_counts.items()}
+
+        all_samples = sorted(sample for samples in latencies.values() for sample in samples)
+        report = {route: summarize(samples, errors.get(route, 0), elapsed) for route, samples in latencies.items()}
+        for route, counts in status_counts.items():
+            report[route]['status'] = {str(status): count for status, count in counts.items()}
+        report['overall'] = summarize(all_samples, sum(errors.values()), elapsed)
+        return report
+
+def summarize(sorted_samples, error_count, elapsed):
+    if not sorted_samples:
+        return {'requests': 0}
+    return {
+        'requests': len(sorted_samples),
+        'throughput_rps': round(len(sorted_samples) / elapsed, 2),
+        'error_rate': round(error_count / len(sorted_samples), 4),
+        'p50_ms': percentile_ms(sorted_samples, 50),
+        'p95_ms': percentile_ms(sorted_samples, 95),
+        'p99_ms': percentile_ms(sorted_samples, 99),
+        'max_ms': round(sorted_samples[-1] * 1000, 2)
+    }
+
+def send_request(session, base_url, route, scenario, start_date, timeout, results):
+    """Send one request and record its latency (the full body is read, incl. streams)."""
+    method, path, body = scenario(start_date)
+    started = time.perf_counter()
+    try:
+        response = session.request(method, base_url + path, json=body, timeout=timeout)
+        status = response.status_code
+    except requests.exceptions.RequestException as e:
+        status = type(e).__name__
+    results.record(route, time.perf_counter() - started, status)
+
+def run_load(base_url, routes, rps, duration, start_date, date_span_days, concurrency, timeout):
+    """
+    Send requests at `rps` for `duration` seconds, cycling through `routes`.
+
+    Requests are scheduled on a fixed timetable, so a slow server shows up as
+    higher latency instead of a lower send rate (open-loop load).
+
+    Returns:
+        dict: Report from LoadResults.summary plus the run settings
+    """
+    results = LoadResults()
+    session = requests.Session()
+    session.mount('http://', requests.adapters.HTTPAdapter(pool_connections=concurrency, pool_maxsize=concurrency))
+
+    total_requests = int(rps * duration)
+    interval = 1.0 / rps
+    started = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for index in range(total_requests):
+            delay = started + index * interval - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+
+            route = routes[index % len(routes)]
+            request_date = start_date + timedelta(days=random.randrange(date_span_days))
+            executor.submit(send_request, session, base_url, route, ROUTE_SCENARIOS[route],
+                            request_date, timeout, results)
+
+    elapsed = time.perf_counter() - started
+    return {
+        'settings': {'base_url': base_url, 'routes': routes, 'target_rps': rps, 'duration_s': duration,
+                     'concurrency': concurrency, 'elapsed_s': round(elapsed, 2)},
+        'routes': results.summary(elapsed)
+    }
+
+def print_report(report):
+    """Print a compact table of the per-route results."""
+    print(f"{'route':<15}{'req':>7}{'rps':>9}{'err%':>8}{'p50':>10}{'p95':>10}{'p99':>10}{'max':>10}")
+    for route, stats in report['routes'].items():
+        if not stats.get('requests'):
+            continue
+        print(f"{route:<15}{stats['requests']:>7}{stats['throughput_rps']:>9}{stats['error_rate'] * 100:>8.2f}"
+              f"{stats['p50_ms']:>10}{stats['p95_ms']:>10}{stats['p99_ms']:>10}{stats['max_ms']:>10}")
+
+# =====================================================================================
+# COMMAND LINE
+# =====================================================================================
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Load-test the weather prediction API at a target request rate')
+    parser.add_argument('--base-url', default='http://127.0.0.1:5000')
+    parser.add_argument('--routes', default=','.join(ROUTE_SCENARIOS),
+                        help=f"Comma-separated subset of: {', '.join(ROUTE_SCENARIOS)}")
+    parser.add_argument('--rps', type=float, default=20, help='Target requests per second')
+    parser.add_argument('--duration', type=float, default=30, help='Test length in seconds')
+    parser.add_argument('--start-date', default=date.today().isoformat(), help='First date requested')
+    parser.add_argument('--date-span', type=int, default=8, help='Dates are drawn from start-date + [0, span)')
+    parser.add_argument('--concurrency', type=int, default=64, help='Maximum requests in flight')
+    parser.add_argument('--timeout', type=float, default=30)
+    parser.add_argument('--output', help='Write the JSON report to this file')
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    routes = [route.strip() for route in args.routes.split(',') if route.strip()]
+    unknown = [route for route in routes if route not in ROUTE_SCENARIOS]
+    if unknown:
+        raise SystemExit(f"Route tidak dikenal: {', '.join(unknown)}")
+
+    print(f"🚀 Uji beban {args.base_url}: {args.rps} req/s selama {args.duration} detik")
+    report = run_load(args.base_url, routes, args.rps, args.duration, date.fromisoformat(args.start_date),
+                      args.date_span, args.concurrency, args.timeout)
+    print_report(report)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as output_file:
+            json.dump(report, output_file, indent=2)
+        print(f"📄 Laporan disimpan ke {args.output}")
+
+if __name__ == '__main__':
+    main()
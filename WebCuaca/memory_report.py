@@ -0,0 +1,84 @@
+"""
+Description: Per-process memory footprint, incl. how much of a memory-mapped file is shared
+
+Reads /proc/self/status and /proc/self/smaps (Linux). On other platforms only
+the peak RSS from `resource` is reported.
+"""
+
+# =====================================================================================
+# IMPORTS AND DEPENDENCIES
+# =====================================================================================
+
+import os
+import sys
+
+# =====================================================================================
+# PROCESS MEMORY
+# =====================================================================================
+
+# field /proc/self/status yg dilaporkan (nilai dlm kB)
+STATUS_FIELDS = ('VmRSS', 'VmHWM', 'RssAnon', 'RssFile', 'RssShmem')
+
+# field /proc/self/smaps per mapping; Pss membagi halaman bersama dgn jumlah proses yg memakainya
+SMAPS_FIELDS = ('Size', 'Rss', 'Pss', 'Shared_Clean', 'Private_Clean', 'Private_Dirty')
+
+def process_memory():
+    """
+    Resident memory of the current process.
+
+    Returns:
+        dict: Field name -> kB from /proc/self/status, or {'maxRssKb': ...} when /proc is unavailable
+    """
+    try:
+        with open('/proc/self/status', encoding='ascii') as status_file:
+            lines = status_file.read().splitlines()
+    except OSError:
+        return peak_rss_fallback()
+
+    report = {}
+    for line in lines:
+        name, _, value = line.partition(':')
+        if name in STATUS_FIELDS:
+            report[f"{name}Kb"] = int(value.split()[0])
+    return report
+
+def peak_rss_fallback():
+    try:
+        import resource
+    except ImportError:
+        return {}
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS melaporkan byte, Linux kB
+    return {'maxRssKb': max_rss // 1024 if sys.platform == 'darwin' else max_rss}
+
+def mapping_memory(path):
+    """
+    Memory of every mapping of `path` in this process, summed.
+
+    Shared_Clean close to Rss means the pages come from the page cache shared
+    with other workers; Pss is this process' fair share of them.
+
+    Returns:
+        dict: Field name -> kB, or None if the file is not mapped (or /proc is unavailable)
+    """
+    target = os.path.realpath(path)
+    totals = None
+    in_target = False
+
+    try:
+        with open('/proc/self/smaps', encoding='utf-8', errors='replace') as smaps_file:
+            for line in smaps_file:
+                parts = line.split()
+                if not parts:
+                    continue
+                if not parts[0].endswith(':'):
+                    # baris header mapping: "alamat perms offset dev inode [path]"
+                    in_target = ' '.join(parts[5:]) == target
+                    if in_target and totals is None:
+                        totals = dict.fromkeys((f"{field}Kb" for field in SMAPS_FIELDS), 0)
+                elif in_target and parts[0][:-1] in SMAPS_FIELDS:
+                    totals[f"{parts[0][:-1]}Kb"] += int(parts[1])
+    except OSError:
+        return None
+
+    return totals
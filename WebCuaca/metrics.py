@@ -0,0 +1,167 @@
+"""
+Description: In-process latency histograms and counters exported in Prometheus text format
+"""
+
+# =====================================================================================
+# IMPORTS AND DEPENDENCIES
+# =====================================================================================
+
+import threading
+import time
+from bisect import bisect_left
+
+# =====================================================================================
+# METRIC FAMILIES
+# =====================================================================================
+
+# batas bucket histogram dlm detik (dari tahap model ~0.5 ms s/d request upstream yg lambat)
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+METRIC_FAMILIES = {
+    'weather_stage_duration_seconds': ('histogram', 'Time spent per processing stage'),
+    'weather_request_duration_seconds': ('histogram', 'HTTP request latency per route'),
+    'weather_requests_total': ('counter', 'HTTP requests per route and status code'),
+    'weather_upstream_requests_total': ('counter', 'Visual Crossing call attempts by outcome'),
+    'weather_model_fallbacks_total': ('counter', 'Rows not predicted by the SVC model, by reason'),
+    'weather_errors_total': ('counter', 'Errors by kind'),
+    'weather_cache_lookups_total': ('counter', 'Cache and store lookups by result'),
+    'weather_upstream_coalesced_total': ('counter', 'Upstream fetches executed vs. shared by concurrent requests'),
+    'weather_upstream_quota_records': ('gauge', 'Visual Crossing records of the daily budget (used, remaining)'),
+    'weather_upstream_quota_denied_total': ('counter', 'Upstream calls refused by the daily record budget')
+}
+
+# =====================================================================================
+# METRICS REGISTRY
+# =====================================================================================
+
+class _StageTimer:
+    """Context manager observing its elapsed time into a histogram series."""
+
+    __slots__ = ('metrics', 'family', 'labels', 'started')
+
+    def __init__(self, metrics, family, labels):
+        self.metrics = metrics
+        self.family = family
+        self.labels = labels
+        self.started = None
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.metrics.observe_series(self.family, self.labels, time.perf_counter() - self.started)
+        return False
+
+class _NullTimer:
+    """Shared no-op timer returned while metrics are disabled."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+NULL_TIMER = _NullTimer()
+
+# saat dinonaktifkan, stage() dan count() langsung kembali tanpa mengunci atau mencatat
+class Metrics:
+    """
+    Thread-safe histograms and counters keyed by family name and labels.
+
+    Collectors registered with `add_collector` are called at render time,
+    so counters that other components already keep (cache stats) do not
+    need a second hot-path increment.
+    """
+
+    def __init__(self, enabled=True, buckets=DEFAULT_BUCKETS):
+        self.enabled = enabled
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._histograms = {}  # (family, labels) -> [bucket_counts, sum, count]
+        self._counters = {}  # (family, labels) -> value
+        self._collectors = []
+
+    def stage(self, name):
+        """Time a processing stage: `with metrics.stage('scaling'): ...`."""
+        if not self.enabled:
+            return NULL_TIMER
+        return _StageTimer(self, 'weather_stage_duration_seconds', (('stage', name),))
+
+    def observe(self, family, seconds, **labels):
+        if self.enabled:
+            self.observe_series(family, tuple(sorted(labels.items())), seconds)
+
+    def observe_series(self, family, labels, seconds):
+        index = bisect_left(self.buckets, seconds)
+        with self._lock:
+            series = self._histograms.get((family, labels))
+            if series is None:
+                series = self._histograms[(family, labels)] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += seconds
+            series[2] += 1
+
+    def count(self, family, amount=1, **labels):
+        if not self.enabled:
+            return
+        key = (family, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def add_collector(self, collector):
+        """Register collector() -> iterable of (family, labels_dict, value) counter samples."""
+        self._collectors.append(collector)
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+
+    def render(self):
+        """Prometheus text exposition format (version 0.0.4)."""
+        with self._lock:
+            histograms = {key: (list(series[0]), series[1], series[2]) for key, series in self._histograms.items()}
+            counters = dict(self._counters)
+
+        for collector in self._collectors:
+            for family, labels, value in collector():
+                counters[(family, tuple(sorted(labels.items())))] = value
+
+        families = {}
+        for (family, labels), value in sorted(histograms.items()):
+            families.setdefault(family, []).extend(self._histogram_lines(family, labels, *value))
+        for (family, labels), value in sorted(counters.items()):
+            families.setdefault(family, []).append(f"{family}{format_labels(labels)} {format_value(value)}")
+
+        lines = []
+        for family in sorted(families):
+            metric_type, help_text = METRIC_FAMILIES.get(family, ('untyped', ''))
+            lines.append(f"# HELP {family} {help_text}")
+            lines.append(f"# TYPE {family} {metric_type}")
+            lines.extend(families[family])
+        return "\n".join(lines) + "\n"
+
+    def _histogram_lines(self, family, labels, bucket_counts, total, count):
+        lines = []
+        cumulative = 0
+        for bound, bucket_count in zip(self.buckets + (float('inf'),), bucket_counts):
+            cumulative += bucket_count
+            le = '+Inf' if bound == float('inf') else format_value(bound)
+            lines.append(f"{family}_bucket{format_labels(labels + (('le', le),))} {cumulative}")
+        lines.append(f"{family}_sum{format_labels(labels)} {format_value(total)}")
+        lines.append(f"{family}_count{format_labels(labels)} {count}")
+        return lines
+
+def format_labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{escape_label_value(value)}"' for name, value in labels) + '}'
+
+def escape_label_value(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def format_value(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
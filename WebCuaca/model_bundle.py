@@ -0,0 +1,164 @@
+"""
+Description: Immutable model bundle and the file watcher used for zero-downtime model reloads
+"""
+
+# =====================================================================================
+# IMPORTS AND DEPENDENCIES
+# =====================================================================================
+
+import json
+import os
+import threading
+import time
+from types import MappingProxyType
+
+import numpy as np
+
+# =====================================================================================
+# MODEL BUNDLE
+# =====================================================================================
+
+# satu objek berisi engine (model + scaler) dan mapping label; diganti utuh saat reload
+class ModelBundle:
+    """
+    Engine, label mapping and provenance of one loaded model.
+
+    Bundles are never modified after creation. A reload builds a new bundle
+    and replaces the module reference in one assignment, so a request that
+    already holds the old bundle finishes with it unchanged.
+    """
+
+    __slots__ = ('engine', 'labels', 'source', 'path', 'checksum', 'version', 'loaded_at')
+
+    def __init__(self, engine, labels, source, path, version=1):
+        for name, value in (('engine', engine), ('labels', MappingProxyType(dict(labels))),
+                            ('source', source), ('path', path), ('checksum', engine.checksum),
+                            ('version', version), ('loaded_at', time.time())):
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("ModelBundle tidak dapat diubah; muat bundle baru")
+
+    @property
+    def supports_probability(self):
+        return self.engine.supports_probability
+
+    @property
+    def feature_columns(self):
+        return self.engine.feature_columns
+
+    def label_info(self, label):
+        """Condition info for a predicted class label."""
+        return self.labels.get(label, {
+            'condition': 'default',
+            'label': f'Kondisi tidak spesifik (kode: {label})',
+            'description': ''
+        })
+
+def validate_bundle(bundle, feature_columns, test_batch_size=32):
+    """
+    Check a freshly loaded bundle before it is swapped in.
+
+    Runs a synthetic batch around the scaler means through the engine (which
+    also warms it up) and checks that every predicted label has a mapping.
+
+    Raises:
+        ValueError: If the feature sets differ or the test batch fails
+    """
+    # urutan boleh berbeda: matriks input selalu disusun menurut urutan kolom engine
+    if sorted(bundle.feature_columns) != sorted(feature_columns):
+        raise ValueError(f"Kolom fitur model baru {list(bundle.feature_columns)} "
+                         f"tidak sama dengan MODEL_CONFIG {list(feature_columns)}")
+
+    engine = bundle.engine
+    rng = np.random.default_rng(0)
+    test_batch = engine.scaler_mean + rng.standard_normal((test_batch_size, len(feature_columns))) * engine.scaler_scale
+    labels, class_probabilities = engine.evaluate(test_batch)
+
+    unknown = sorted({int(label) for label in labels} - set(bundle.labels))
+    if unknown:
+        raise ValueError(f"Model baru menghasilkan label tanpa mapping: {unknown}")
+    if class_probabilities is not None and not np.isfinite(class_probabilities).all():
+        raise ValueError("Model baru menghasilkan probabilitas tidak valid")
+
+# =====================================================================================
+# ARTIFACT WATCHER
+# =====================================================================================
+
+def read_export_stamp(path):
+    """
+    Stamp written last by an export (svc_engine.write_export_stamp), or None if there is none.
+
+    Raises:
+        ValueError: If the stamp exists but is unreadable or incomplete
+    """
+    try:
+        with open(path, encoding='utf-8') as stamp_file:
+            stamp = json.load(stamp_file)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        raise ValueError(f"Stamp export model tidak terbaca: {e}") from e
+    if not isinstance(stamp, dict) or not {'source', 'checksum'} <= stamp.keys():
+        raise ValueError("Stamp export model tidak lengkap")
+    return stamp
+
+def file_signature(paths):
+    """(mtime_ns, size) per existing path; changes when an artifact is replaced."""
+    signature = {}
+    for path in paths:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        signature[path] = (stat.st_mtime_ns, stat.st_size)
+    return signature
+
+class ArtifactWatcher:
+    """
+    Daemon thread that polls model artifact files and calls `on_change` when they change.
+
+    app.py watches only the export stamp, which an export writes after all
+    artifacts are in place: one export triggers one reload, never one per
+    artifact or one in the middle of an export.
+    """
+
+    def __init__(self, paths, on_change, interval_seconds=5):
+        self.paths = list(paths)
+        self.on_change = on_change
+        self.interval_seconds = interval_seconds
+        self._signature = file_signature(self.paths)
+        self._stop = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Start watching once per process; later calls are no-ops."""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return False
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='model-watcher', daemon=True)
+            self._thread.start()
+            return True
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def poll(self):
+        """Compare signatures once; returns True when `on_change` was called."""
+        signature = file_signature(self.paths)
+        if signature == self._signature:
+            return False
+        self._signature = signature
+        try:
+            self.on_change()
+        except Exception as e:
+            print(f"Reload model gagal: {e}")
+        return True
+
+    def _run(self):
+        while not self._stop.wait(self.interval_seconds):
+            self.poll()
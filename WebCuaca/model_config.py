@@ -0,0 +1,36 @@
+"""
+Description: Model artifact paths and feature columns shared by app.py and the offline tools
+
+Kept free of Flask and network imports so export_model.py and
+experiment_runner.py can read it without booting the application.
+"""
+
+# =====================================================================================
+# IMPORTS AND DEPENDENCIES
+# =====================================================================================
+
+import os
+
+# =====================================================================================
+# MODEL CONFIGURATION
+# =====================================================================================
+
+# konfigurasi model SVM dan scaler yg digunakan utk prediksi
+MODEL_CONFIG = {
+    'svm_model_path': 'svm_model_cuaca.pkl',
+    'scaler_path': 'scaler_cuaca.pkl',
+    'engine_flat_path': 'svm_engine_cuaca.bin', # hasil export_model.py, dibuka read-only dgn mmap (dibagi antar worker)
+    'engine_bundle_path': 'svm_engine_cuaca.npz', # hasil export_model.py, dipakai sebelum file .pkl
+    'export_stamp_path': 'model_export.json', # ditulis terakhir oleh export; satu-satunya file yg dipantau watcher
+    # 'eager' memuat model saat import; 'background' memuatnya di thread agar worker cepat menerima koneksi
+    'load_mode': os.environ.get('MODEL_LOAD_MODE', 'eager'),
+    'ready_wait_seconds': 10, # batas tunggu prediksi selama model masih dimuat di background
+    # MODEL_RELOAD_WATCH=1 memuat ulang model otomatis saat export selesai (stamp export diganti)
+    'reload_watch': os.environ.get('MODEL_RELOAD_WATCH', '0') == '1',
+    'reload_poll_seconds': 5,
+    'admin_token': os.environ.get('ADMIN_TOKEN'), # header X-Admin-Token utk POST /api/admin/reload_model
+    'default_location': "Teluk Ambon, Maluku, Indonesia", # lokasi default dan kolom fitur utk machine learning
+    'feature_columns': ['temp', 'humidity', 'precip', 'windspeed',
+                       'windgust', 'cloudcover', 'visibility',
+                       'uvindex', 'solarradiation', 'pressure']
+}
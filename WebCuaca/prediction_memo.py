@@ -0,0 +1,75 @@
+"""
+Description: Bounded LRU memo of model outputs keyed on quantized feature vectors
+"""
+
+# =====================================================================================
+# IMPORTS AND DEPENDENCIES
+# =====================================================================================
+
+import threading
+from collections import OrderedDict
+
+# =====================================================================================
+# PREDICTION MEMO
+# =====================================================================================
+
+# kunci = (versi model, byte vektor fitur yg sdh dibulatkan); reload model mengosongkan memo
+class PredictionMemo:
+    """
+    Thread-safe LRU of (label, probability) per quantized feature vector.
+
+    Keys include the model version, so results of a replaced model are never
+    returned even if they are stored after the memo was cleared.
+    """
+
+    def __init__(self, max_entries=65536):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {'hits': 0, 'misses': 0, 'evictions': 0, 'deduplicated': 0}
+
+    @property
+    def enabled(self):
+        return self.max_entries > 0
+
+    def get_many(self, keys):
+        """Cached value per key, or None for keys not in the memo."""
+        values = []
+        with self._lock:
+            for key in keys:
+                value = self._entries.get(key)
+                if value is None:
+                    self._counters['misses'] += 1
+                else:
+                    self._entries.move_to_end(key)
+                    self._counters['hits'] += 1
+                values.append(value)
+        return values
+
+    def put_many(self, items):
+        with self._lock:
+            for key, value in items:
+                self._entries[key] = value
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._counters['evictions'] += 1
+
+    def count_deduplicated(self, amount):
+        """Record misses answered by an identical row evaluated in the same batch."""
+        with self._lock:
+            self._counters['deduplicated'] += amount
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._counters)
+            stats['entries'] = len(self._entries)
+            stats['max_entries'] = self.max_entries
+
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_ratio'] = round(stats['hits'] / lookups, 4) if lookups else None
+        return stats
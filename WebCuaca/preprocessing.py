@@ -0,0 +1,347 @@
+"""
+Description: Streaming version of the notebooks' preprocessing (dropna, z-score filter, split, StandardScaler)
+
+Reproduces the cells shared by the Skenario notebooks:
+
+    data_bersih = data.dropna()
+    z_scores = np.abs(stats.zscore(data_bersih.select_dtypes(include=np.number)))
+    df = data_bersih[(z_scores < 3).all(axis=1)]
+    train_df, test_df = df.iloc[:int(len(df) * 0.8)], df.iloc[int(len(df) * 0.8):]
+    scaler = StandardScaler().fit(X_train)
+
+without holding the dataset in memory. Rows are read in chunks from the
+memory-mapped column cache (dataset_cache.py): pass 1 accumulates the
+column means and variances, pass 2 drops incomplete rows and outliers and
+appends the kept rows to disk, and the scaler is fitted with partial_fit
+over the kept training rows.
+
+Usage:
+    python preprocessing.py ../DataCuaca.csv --scaler-output scaler_cuaca.pkl
+    python preprocessing.py ../DataCuaca.csv --verify
+"""
+
+# =====================================================================================
+# IMPORTS AND DEPENDENCIES
+# =====================================================================================
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from dataset_cache import DEFAULT_CSV_PATH, MISSING_LABEL, MISSING_TIMESTAMP, load_dataset, write_manifest
+
+# =====================================================================================
+# PREPROCESSING CONFIGURATION
+# =====================================================================================
+
+# sama dgn notebook: threshold z-score 3, 80% baris pertama utk training
+ZSCORE_THRESHOLD = 3
+TRAIN_FRACTION = 0.8
+
+DEFAULT_CHUNK_ROWS = 100_000
+
+PREPARED_FORMAT_VERSION = 1
+PREPARED_MANIFEST_NAME = 'prepared.json'
+
+# =====================================================================================
+# RUNNING STATISTICS
+# =====================================================================================
+
+# mean dan M2 per kolom digabung antar chunk (algoritma paralel Chan dkk.)
+class RunningMoments:
+    """Count, mean and sum of squared deviations per column, updated one block at a time."""
+
+    def __init__(self, num_columns):
+        self.count = 0
+        self.mean = np.zeros(num_columns)
+        self.m2 = np.zeros(num_columns)
+
+    def update(self, block):
+        """Add the rows of a (rows, columns) float64 block."""
+        if len(block) == 0:
+            return
+        block_count = len(block)
+        block_mean = block.mean(axis=0)
+        block_m2 = ((block - block_mean) ** 2).sum(axis=0)
+
+        if self.count == 0:
+            self.count, self.mean, self.m2 = block_count, block_mean, block_m2
+            return
+
+        total = self.count + block_count
+        delta = block_mean - self.mean
+        self.mean = self.mean + delta * (block_count / total)
+        self.m2 = self.m2 + block_m2 + delta ** 2 * (self.count * block_count / total)
+        self.count = total
+
+    @property
+    def std(self):
+        """Population standard deviation (ddof=0, as scipy.stats.zscore uses)."""
+        return np.sqrt(self.m2 / self.count) if self.count else np.full(len(self.mean), np.nan)
+
+# =====================================================================================
+# STREAMING PASSES
+# =====================================================================================
+
+def iter_row_ranges(num_rows, chunk_rows):
+    for start in range(0, num_rows, chunk_rows):
+        yield start, min(start + chunk_rows, num_rows)
+
+def read_chunk(dataset, feature_columns, start, stop):
+    """
+    Feature block and completeness mask of rows [start, stop).
+
+    A row is complete when no column of the CSV is empty, like DataFrame.dropna().
+
+    Returns:
+        tuple: ((rows, features) float64 array, bool mask)
+    """
+    block = np.empty((stop - start, len(feature_columns)))
+    for index, name in enumerate(feature_columns):
+        block[:, index] = dataset.column(name, start=start, stop=stop)
+
+    complete = ~np.isnan(block).any(axis=1)
+    for name, info in dataset.manifest['columns'].items():
+        if name in feature_columns:
+            continue
+        values = dataset.raw(name)[start:stop]
+        if info['kind'] == 'feature':
+            complete &= ~np.isnan(values)
+        elif info['kind'] == 'label':
+            complete &= values != MISSING_LABEL
+        elif info['kind'] == 'timestamp':
+            complete &= values != MISSING_TIMESTAMP
+        elif None in info['categories']:
+            complete &= values != info['categories'].index(None)
+    return block, complete
+
+def zscore_moments(dataset, feature_columns, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """Pass 1: mean and standard deviation of every feature over the complete rows."""
+    moments = RunningMoments(len(feature_columns))
+    for start, stop in iter_row_ranges(dataset.num_rows, chunk_rows):
+        block, complete = read_chunk(dataset, feature_columns, start, stop)
+        moments.update(block[complete])
+    return moments
+
+def inlier_mask(block, complete, mean, std, threshold=ZSCORE_THRESHOLD):
+    """Complete rows whose |z| is below `threshold` in every column (NaN z, e.g. zero std, drops the row)."""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        z_scores = np.abs((block - mean) / std)
+    return complete & (z_scores < threshold).all(axis=1)
+
+# =====================================================================================
+# PREPARED DATASET
+# =====================================================================================
+
+class PreparedData:
+    """
+    Kept rows of a preprocessing run, memory-mapped from `directory`.
+
+    `features` holds the unscaled rows in dataset order; the first
+    `train_size` rows are the training split, the rest the test split.
+    Opening the same directory in several processes shares the pages.
+    """
+
+    def __init__(self, directory):
+        with open(os.path.join(directory, PREPARED_MANIFEST_NAME), encoding='utf-8') as manifest_file:
+            self.manifest = json.load(manifest_file)
+        self.directory = directory
+        self.feature_columns = self.manifest['feature_columns']
+        self.classes = self.manifest['classes']
+        self.num_rows = self.manifest['num_rows']
+        self.train_size = self.manifest['train_size']
+        self.features = self._open('features.f64', np.float64, (self.num_rows, len(self.feature_columns)))
+        self.labels = self._open('labels.u8', np.uint8, (self.num_rows,))
+
+    def _open(self, name, dtype, shape):
+        if self.num_rows == 0:
+            return np.empty(shape, dtype=dtype)
+        return np.memmap(os.path.join(self.directory, name), dtype=dtype, mode='r', shape=shape)
+
+    @property
+    def X_train(self):
+        return self.features[:self.train_size]
+
+    @property
+    def X_test(self):
+        return self.features[self.train_size:]
+
+    @property
+    def y_train(self):
+        return self.labels[:self.train_size]
+
+    @property
+    def y_test(self):
+        return self.labels[self.train_size:]
+
+    def fit_scaler(self, chunk_rows=DEFAULT_CHUNK_ROWS):
+        """
+        StandardScaler fitted on the training rows, chunk by chunk with partial_fit.
+
+        Chunks are passed as DataFrames so the scaler records feature_names_in_
+        like the notebooks' scaler_cuaca.pkl.
+        """
+        from sklearn.preprocessing import StandardScaler # hanya dibutuhkan saat membuat scaler
+
+        scaler = StandardScaler()
+        for start, stop in iter_row_ranges(self.train_size, chunk_rows):
+            scaler.partial_fit(pd.DataFrame(self.features[start:stop], columns=self.feature_columns))
+        return scaler
+
+    def stats(self):
+        return {key: self.manifest[key] for key in ('source_rows', 'complete_rows', 'num_rows', 'train_size', 'classes')}
+
+def preprocess(dataset, output_dir, feature_columns=None, threshold=ZSCORE_THRESHOLD,
+               train_fraction=TRAIN_FRACTION, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """
+    Run both streaming passes over `dataset` and write the kept rows to `output_dir`.
+
+    Args:
+        dataset (ColumnarDataset): Source rows (see dataset_cache.load_dataset)
+        feature_columns (list): Numeric columns to filter and scale (default: every feature column)
+
+    Raises:
+        ValueError: If the dataset has no label column
+
+    Returns:
+        PreparedData: Kept rows, split point and the statistics used
+    """
+    if dataset.label_column is None:
+        raise ValueError("Dataset tidak memiliki kolom label")
+
+    feature_columns = list(feature_columns or dataset.feature_columns)
+    moments = zscore_moments(dataset, feature_columns, chunk_rows)
+    mean, std = moments.mean, moments.std
+
+    temp_dir = f"{output_dir}.tmp-{os.getpid()}"
+    shutil.rmtree(temp_dir, ignore_errors=True)
+    os.makedirs(temp_dir)
+    num_rows = 0
+
+    try:
+        with open(os.path.join(temp_dir, 'features.f64'), 'wb') as features_file, \
+                open(os.path.join(temp_dir, 'labels.u8'), 'wb') as labels_file:
+            for start, stop in iter_row_ranges(dataset.num_rows, chunk_rows):
+                block, complete = read_chunk(dataset, feature_columns, start, stop)
+                kept = inlier_mask(block, complete, mean, std, threshold)
+                features_file.write(np.ascontiguousarray(block[kept]).tobytes())
+                labels_file.write(np.ascontiguousarray(dataset.label_codes()[start:stop][kept]).tobytes())
+                num_rows += int(kept.sum())
+
+        write_manifest(temp_dir, {
+            'format_version': PREPARED_FORMAT_VERSION,
+            'source': dataset.manifest['source'],
+            'feature_columns': feature_columns,
+            'classes': dataset.classes,
+            'source_rows': dataset.num_rows,
+            'complete_rows': moments.count,
+            'num_rows': num_rows,
+            'train_size': int(num_rows * train_fraction),
+            'zscore_threshold': threshold,
+            'zscore_mean': mean.tolist(),
+            'zscore_std': std.tolist()
+        }, name=PREPARED_MANIFEST_NAME)
+        if os.path.exists(output_dir):
+            shutil.rmtree(output_dir)
+        os.replace(temp_dir, output_dir)
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    return PreparedData(output_dir)
+
+def default_prepared_dir(dataset):
+    return os.path.join(dataset.cache_dir, 'prepared')
+
+# =====================================================================================
+# NOTEBOOK PARITY CHECK
+# =====================================================================================
+
+# pipeline notebook apa adanya (semua data di memori), hanya utk membandingkan hasil
+def notebook_preprocess(csv_path):
+    """
+    The notebooks' cells on the whole CSV in memory.
+
+    Returns:
+        tuple: (X_train DataFrame, kept row count, fitted StandardScaler)
+    """
+    from scipy import stats
+    from sklearn.preprocessing import StandardScaler
+
+    data_bersih = pd.read_csv(csv_path, encoding='utf-8-sig').dropna()
+    z_scores = np.abs(stats.zscore(data_bersih.select_dtypes(include=np.number)))
+    df = data_bersih[(z_scores < ZSCORE_THRESHOLD).all(axis=1)].reset_index(drop=True)
+    train_df = df.iloc[:int(len(df) * TRAIN_FRACTION)]
+    X_train = train_df.select_dtypes(include=np.number)
+    return X_train, len(df), StandardScaler().fit(X_train)
+
+def verify_against_notebook(prepared, scaler, csv_path, tolerance=1e-12):
+    """
+    Compare the streaming result with the in-memory notebook pipeline.
+
+    Returns:
+        bool: True when row counts and training rows match exactly and the scaler within tolerance
+    """
+    X_train, kept_rows, expected = notebook_preprocess(csv_path)
+    print(f"Baris bersih: {prepared.num_rows} (notebook: {kept_rows}), "
+          f"train: {prepared.train_size} (notebook: {len(X_train)})")
+
+    passed = prepared.num_rows == kept_rows and prepared.train_size == len(X_train)
+    passed = passed and list(X_train.columns) == prepared.feature_columns
+    passed = passed and np.array_equal(X_train.to_numpy(), np.asarray(prepared.X_train))
+    if not passed:
+        return False
+
+    max_difference = max(
+        float(np.max(np.abs(scaler.mean_ - expected.mean_) / np.abs(expected.scale_))),
+        float(np.max(np.abs(scaler.scale_ - expected.scale_) / expected.scale_))
+    )
+    print(f"Selisih relatif scaler maksimum: {max_difference:.3e}")
+    return max_difference <= tolerance
+
+# =====================================================================================
+# COMMAND LINE
+# =====================================================================================
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Streaming preprocessing of the hourly dataset (notebook-equivalent)')
+    parser.add_argument('csv', nargs='?', default=DEFAULT_CSV_PATH, help='Source CSV (default: ../DataCuaca.csv)')
+    parser.add_argument('--output-dir', help='Directory of the kept rows (default: <cache>/prepared)')
+    parser.add_argument('--chunk-rows', type=int, default=DEFAULT_CHUNK_ROWS, help='Rows read per chunk')
+    parser.add_argument('--scaler-output', help='Save the fitted StandardScaler here (joblib, like scaler_cuaca.pkl)')
+    parser.add_argument('--verify', action='store_true', help='Compare with the in-memory notebook pipeline')
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    started = time.perf_counter()
+    dataset = load_dataset(args.csv)
+    prepared = preprocess(dataset, args.output_dir or default_prepared_dir(dataset), chunk_rows=args.chunk_rows)
+    scaler = prepared.fit_scaler(args.chunk_rows)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    stats = prepared.stats()
+    print(f"🧹 {stats['source_rows']} baris -> {stats['complete_rows']} lengkap -> {stats['num_rows']} tanpa outlier "
+          f"(train {stats['train_size']}, test {stats['num_rows'] - stats['train_size']}) dalam {elapsed_ms:.1f} ms")
+
+    if args.scaler_output:
+        import joblib
+        joblib.dump(scaler, args.scaler_output)
+        print(f"Scaler disimpan ke '{args.scaler_output}'")
+
+    if args.verify:
+        if not verify_against_notebook(prepared, scaler, args.csv):
+            print("Hasil TIDAK sama dengan pipeline notebook!")
+            return 1
+        print("Hasil sama dengan pipeline notebook.")
+
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
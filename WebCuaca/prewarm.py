@@ -0,0 +1,129 @@
+"""
+Description: Background refresh scheduler and in-memory store for precomputed forecasts
+"""
+
+# =====================================================================================
+# IMPORTS AND DEPENDENCIES
+# =====================================================================================
+
+import threading
+import time
+
+# =====================================================================================
+# PREDICTION STORE
+# =====================================================================================
+
+class ForecastEntry:
+    """Precomputed data and predictions for one (location, date)."""
+
+    __slots__ = ('daily_data', 'daily_prediction', 'frame', 'hour_predictions')
+
+    def __init__(self, daily_data, daily_prediction, frame, hour_predictions):
+        self.daily_data = daily_data
+        self.daily_prediction = daily_prediction
+        self.frame = frame
+        self.hour_predictions = hour_predictions
+
+# snapshot diganti utuh setiap refresh, jadi pembaca tidak perlu lock
+class PredictionStore:
+    """
+    Read-mostly store of ForecastEntry objects keyed by (location, date_str).
+
+    Each refresh replaces the whole snapshot in one assignment. Entries older
+    than `max_age_seconds` are ignored so a stalled refresher never serves
+    stale forecasts indefinitely.
+    """
+
+    def __init__(self, max_age_seconds=1800):
+        self.max_age_seconds = max_age_seconds
+        self._snapshot = {}
+        self._refreshed_at = None
+        self._counters = {'hits': 0, 'misses': 0}
+
+    def get(self, location, date_str):
+        """Return the entry for a date, or None when missing or stale."""
+        refreshed_at = self._refreshed_at
+        entry = self._snapshot.get((location, date_str))
+
+        if entry is None or refreshed_at is None or time.time() - refreshed_at > self.max_age_seconds:
+            self._counters['misses'] += 1
+            return None
+
+        self._counters['hits'] += 1
+        return entry
+
+    def replace(self, entries):
+        """Swap in a new snapshot of entries."""
+        self._snapshot = dict(entries)
+        self._refreshed_at = time.time()
+
+    def stats(self):
+        return {
+            'entries': len(self._snapshot),
+            'age_seconds': round(time.time() - self._refreshed_at, 1) if self._refreshed_at else None,
+            **self._counters
+        }
+
+# =====================================================================================
+# BACKGROUND SCHEDULER
+# =====================================================================================
+
+class ForecastPrewarmer:
+    """
+    Daemon thread that calls `refresh_fn` every `interval_seconds`.
+
+    Errors from a refresh are logged and the previous snapshot stays in
+    place until the next successful run.
+    """
+
+    def __init__(self, refresh_fn, interval_seconds=900):
+        self.refresh_fn = refresh_fn
+        self.interval_seconds = interval_seconds
+        self._stop = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+        self.last_duration = None
+        self.last_error = None
+        self.runs = 0
+
+    def start(self):
+        """Start the scheduler once per process; later calls are no-ops."""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return False
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='forecast-prewarmer', daemon=True)
+            self._thread.start()
+            return True
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def run_once(self):
+        """Run one refresh synchronously and record its outcome."""
+        started = time.perf_counter()
+        try:
+            self.refresh_fn()
+            self.last_error = None
+        except Exception as e:
+            self.last_error = str(e)
+            print(f"Pre-warm prakiraan gagal: {e}")
+        finally:
+            self.last_duration = time.perf_counter() - started
+            self.runs += 1
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.run_once()
+            self._stop.wait(self.interval_seconds)
+
+    def stats(self):
+        return {
+            'running': self._thread is not None and self._thread.is_alive(),
+            'runs': self.runs,
+            'interval_seconds': self.interval_seconds,
+            'last_duration_ms': round(self.last_duration * 1000, 2) if self.last_duration is not None else None,
+            'last_error': self.last_error
+        }
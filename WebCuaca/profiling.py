@@ -0,0 +1,205 @@
+"""
+Description: On-demand per-request profiling with flamegraph-ready output
+
+Two modes:
+    sampler  - a background thread samples the request thread's stack every
+               `interval_ms` and writes collapsed stacks (`<id>.collapsed`),
+               usable directly with flamegraph.pl, speedscope or inferno.
+    cprofile - deterministic cProfile stats (`<id>.prof`), usable with
+               flameprof, snakeviz or `python -m pstats`.
+
+Every profile gets a `<id>.json` sidecar (route, status, total time) so the
+index can be listed without parsing the profiles themselves.
+"""
+
+# =====================================================================================
+# IMPORTS AND DEPENDENCIES
+# =====================================================================================
+
+import cProfile
+import hmac
+import json
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+
+# =====================================================================================
+# STACK SAMPLER
+# =====================================================================================
+
+def frame_label(frame):
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+def collapse_stack(frame):
+    """Stack of `frame` as 'outer;...;inner' (the collapsed-stack format)."""
+    labels = []
+    while frame is not None:
+        labels.append(frame_label(frame))
+        frame = frame.f_back
+    return ';'.join(reversed(labels))
+
+class StackSampler:
+    """Sample the stack of one thread at a fixed interval from a daemon thread."""
+
+    def __init__(self, thread_id, interval_seconds=0.005):
+        self.thread_id = thread_id
+        self.interval_seconds = interval_seconds
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='request-profiler', daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval_seconds):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self.stacks[collapse_stack(frame)] += 1
+
+    def write(self, path):
+        with open(path, 'w', encoding='utf-8') as output_file:
+            for stack, count in self.stacks.most_common():
+                output_file.write(f"{stack} {count}\n")
+
+# =====================================================================================
+# REQUEST PROFILER
+# =====================================================================================
+
+class ProfileSession:
+    """One running request profile; call `finish` once the response is ready."""
+
+    def __init__(self, profiler, route, path):
+        self.profiler = profiler
+        self.route = route
+        self.path = path
+        self.profile_id = f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        self.started = time.perf_counter()
+
+        if profiler.mode == 'cprofile':
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        else:
+            self._profile = StackSampler(threading.get_ident(), profiler.interval_seconds)
+            self._profile.start()
+
+    def finish(self, status):
+        """Stop profiling, write the profile and its metadata, and return the metadata."""
+        total_seconds = time.perf_counter() - self.started
+
+        if isinstance(self._profile, cProfile.Profile):
+            self._profile.disable()
+            self.profiler.cprofile_slot.release()
+            filename = f"{self.profile_id}.prof"
+            self._profile.dump_stats(os.path.join(self.profiler.directory, filename))
+            samples = None
+        else:
+            self._profile.stop()
+            filename = f"{self.profile_id}.collapsed"
+            self._profile.write(os.path.join(self.profiler.directory, filename))
+            samples = sum(self._profile.stacks.values())
+
+        meta = {
+            'id': self.profile_id,
+            'file': filename,
+            'mode': self.profiler.mode,
+            'route': self.route,
+            'path': self.path,
+            'status': status,
+            'total_ms': round(total_seconds * 1000, 2),
+            'samples': samples,
+            'created': time.time()
+        }
+        with open(os.path.join(self.profiler.directory, f"{self.profile_id}.json"), 'w', encoding='utf-8') as meta_file:
+            json.dump(meta, meta_file)
+
+        self.profiler.rotate()
+        return meta
+
+# sampling via konfigurasi berlaku utk semua request; header hanya jika token cocok
+class RequestProfiler:
+    """
+    Decide which requests to profile and keep the last `max_profiles` on disk.
+
+    A request is profiled when profiling is enabled and it falls within
+    `sample_rate`, or when it carries the configured token in the profiling
+    header (which works even while sampling is disabled).
+    """
+
+    def __init__(self, directory, enabled=False, sample_rate=0.0, token=None, mode='sampler',
+                 interval_ms=5, max_profiles=50):
+        if mode not in ('sampler', 'cprofile'):
+            raise ValueError(f"Unknown profiling mode: {mode}")
+
+        self.directory = directory
+        self.enabled = enabled
+        self.sample_rate = sample_rate
+        self.token = token or None
+        self.mode = mode
+        self.interval_seconds = interval_ms / 1000.0
+        self.max_profiles = max_profiles
+        self.cprofile_slot = threading.Lock() # cProfile hanya boleh aktif di satu request sekaligus
+        self._lock = threading.Lock()
+
+    def is_authorized(self, header_value):
+        return self.token is not None and header_value is not None and \
+            hmac.compare_digest(header_value.encode('utf-8'), self.token.encode('utf-8'))
+
+    def should_profile(self, header_value=None):
+        if self.is_authorized(header_value):
+            return True
+        return self.enabled and random.random() < self.sample_rate
+
+    def start(self, route, path):
+        """Start a ProfileSession on the calling thread, or return None if cProfile is busy."""
+        if self.mode == 'cprofile' and not self.cprofile_slot.acquire(blocking=False):
+            return None
+        os.makedirs(self.directory, exist_ok=True)
+        return ProfileSession(self, route, path)
+
+    def recent(self, limit=50):
+        """Metadata of the most recent profiles, newest first."""
+        if not os.path.isdir(self.directory):
+            return []
+
+        entries = []
+        for filename in os.listdir(self.directory):
+            if not filename.endswith('.json'):
+                continue
+            try:
+                with open(os.path.join(self.directory, filename), encoding='utf-8') as meta_file:
+                    entries.append(json.load(meta_file))
+            except (OSError, ValueError):
+                continue
+
+        entries.sort(key=lambda entry: entry['created'], reverse=True)
+        return entries[:limit]
+
+    def rotate(self):
+        """Delete the oldest profiles beyond `max_profiles`."""
+        with self._lock:
+            for entry in self.recent(limit=None)[self.max_profiles:]:
+                for filename in (entry['file'], f"{entry['id']}.json"):
+                    try:
+                        os.remove(os.path.join(self.directory, filename))
+                    except OSError:
+                        pass
+
+    def stats(self):
+        return {
+            'enabled': self.enabled,
+            'sample_rate': self.sample_rate,
+            'header_enabled': self.token is not None,
+            'mode': self.mode,
+            'directory': self.directory,
+            'max_profiles': self.max_profiles
+        }
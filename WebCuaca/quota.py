@@ -0,0 +1,213 @@
+"""
+Description: Daily Visual Crossing record budget, persisted and shared by the worker processes
+
+Visual Crossing bills per record: one per day for include=days and one per
+hour for include=hours. Every upstream call reserves its estimated cost
+first and settles it with the payload's queryCost afterwards, so failed
+calls are refunded and estimates never drift from the bill.
+"""
+
+# =====================================================================================
+# IMPORTS AND DEPENDENCIES
+# =====================================================================================
+
+import json
+import os
+import threading
+from datetime import datetime, timezone
+
+import requests
+
+try:
+    import fcntl # kunci file antar proses worker (tidak tersedia di Windows)
+except ImportError:
+    fcntl = None
+
+# =====================================================================================
+# COST ESTIMATION
+# =====================================================================================
+
+HOURS_PER_DAY = 24
+
+def estimate_record_cost(num_days, include):
+    """Records billed for a timeline request of `num_days` days."""
+    return num_days * (HOURS_PER_DAY if 'hours' in include.split(',') else 1)
+
+def utc_today():
+    # kuota visual crossing direset tengah malam UTC
+    return datetime.now(timezone.utc).date().isoformat()
+
+class QuotaExceededError(requests.exceptions.RequestException):
+    """
+    Raised instead of calling upstream when the daily record budget does not allow it.
+
+    `background` is True when the records would fit but background priority
+    was refused, so a user request sharing that call may still reserve them.
+    """
+
+    def __init__(self, *args, background=False, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.background = background
+
+# =====================================================================================
+# QUOTA BUDGET
+# =====================================================================================
+
+# 'normal' -> semua request; 'conserve' -> hanya request pengguna (pre-warm ditunda); 'exhausted' -> tidak ada
+class QuotaBudget:
+    """
+    Daily record counter with reserve/settle semantics.
+
+    With `state_path` the counter is kept in a JSON file guarded by an
+    advisory file lock, so all workers on a host spend one shared budget and
+    restarts do not reset it. A `daily_limit` of 0 disables the budget.
+    """
+
+    def __init__(self, daily_limit=1000, state_path=None, conserve_fraction=0.2, today_fn=utc_today):
+        self.daily_limit = daily_limit
+        self.state_path = state_path
+        self.conserve_fraction = conserve_fraction
+        self.today_fn = today_fn
+        self._lock = threading.Lock()
+        self._state = {'date': today_fn(), 'used': 0}
+        self._counters = {'reserved': 0, 'refunded': 0, 'denied': 0}
+        if state_path is not None:
+            os.makedirs(os.path.dirname(os.path.abspath(state_path)), exist_ok=True)
+
+    @property
+    def enabled(self):
+        return self.daily_limit > 0
+
+    def reserve(self, cost, background=False):
+        """
+        Reserve `cost` records before an upstream call.
+
+        Args:
+            cost (int): Estimated records of the call
+            background (bool): Background work (pre-warming) is refused once the
+                budget is in 'conserve' state, keeping the rest for user requests
+
+        Raises:
+            QuotaExceededError: If the reservation does not fit the remaining budget
+        """
+        if not self.enabled:
+            return
+
+        # None -> dipesan; 'short' -> sisa tidak cukup; 'deferred' -> cukup, tapi prioritas background ditolak
+        def apply(state):
+            remaining = self.daily_limit - state['used']
+            if cost > remaining:
+                return 'short'
+            if background and self._classify(remaining) != 'normal':
+                return 'deferred'
+            state['used'] += cost
+            return None
+
+        refusal = self._update(apply)
+        if refusal is not None:
+            with self._lock:
+                self._counters['denied'] += 1
+            raise QuotaExceededError(
+                f"Kuota harian Visual Crossing tidak cukup ({cost} record diminta, sisa {self.remaining()})",
+                background=refusal == 'deferred')
+
+        with self._lock:
+            self._counters['reserved'] += cost
+
+    def settle(self, reserved, actual):
+        """Replace a reservation by the actual cost (0 refunds a failed call)."""
+        if not self.enabled or actual == reserved:
+            return
+
+        def apply(state):
+            state['used'] = max(0, state['used'] + actual - reserved)
+            return True
+
+        self._update(apply)
+        if actual < reserved:
+            with self._lock:
+                self._counters['refunded'] += reserved - actual
+
+    def remaining(self):
+        if not self.enabled:
+            return None
+        return max(0, self.daily_limit - self._update(lambda state: state['used']))
+
+    def state(self):
+        """'normal', 'conserve' or 'exhausted' ('normal' while the budget is disabled)."""
+        if not self.enabled:
+            return 'normal'
+        return self._classify(self.remaining())
+
+    def stats(self):
+        remaining = self.remaining()
+        with self._lock:
+            counters = dict(self._counters)
+        return {
+            'enabled': self.enabled,
+            'date': self._state['date'],
+            'daily_limit': self.daily_limit,
+            'used': self.daily_limit - remaining if self.enabled else None,
+            'remaining': remaining,
+            'state': self.state(),
+            'persisted': self.state_path is not None,
+            **counters
+        }
+
+    # ---------------------------------------------------------------------------------
+    # Internal helpers
+    # ---------------------------------------------------------------------------------
+
+    def _classify(self, remaining):
+        if remaining <= 0:
+            return 'exhausted'
+        if remaining <= self.daily_limit * self.conserve_fraction:
+            return 'conserve'
+        return 'normal'
+
+    def _update(self, apply):
+        """Run apply(state) on the current day's state under the process and file locks."""
+        with self._lock:
+            if self.state_path is None:
+                self._roll_over(self._state)
+                return apply(self._state)
+
+            with open(f"{self.state_path}.lock", 'a+') as lock_file:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    state = self._read_state()
+                    before = dict(state)
+                    result = apply(state)
+                    if state != before:
+                        self._write_state(state)
+                    self._state = state
+                    return result
+                finally:
+                    if fcntl is not None:
+                        fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _roll_over(self, state):
+        today = self.today_fn()
+        if state.get('date') != today:
+            state['date'] = today
+            state['used'] = 0
+
+    def _read_state(self):
+        try:
+            with open(self.state_path, encoding='utf-8') as state_file:
+                state = json.load(state_file)
+        except (OSError, ValueError):
+            state = {}
+        state = {'date': state.get('date'), 'used': int(state.get('used', 0))}
+        self._roll_over(state)
+        return state
+
+    def _write_state(self, state):
+        tmp_path = f"{self.state_path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as state_file:
+                json.dump(state, state_file)
+            os.replace(tmp_path, self.state_path)
+        except OSError as e:
+            print(f"Gagal menyimpan status kuota: {e}")
@@ -29,6 +29,7 @@ const CONSTANTS = {
         SUNNY: 'images/matahari.png',
         CLOUDY: 'images/berawan2.png'
     },
+    WEEKLY_FORECAST_DAYS: 7,
     DAYS_INDONESIAN: ['Minggu', 'Senin', 'Selasa', 'Rabu', 'Kamis', 'Jumat', 'Sabtu'],
     MONTHS_INDONESIAN: ['Januari', 'Februari', 'Maret', 'April', 'Mei', 'Juni', 
                        'Juli', 'Agustus', 'September', 'Oktober', 'November', 'Desember']
@@ -959,9 +960,7 @@ async function predictHourlyWeather() {
     clearWeatherAnimations();
 
     try {
-        const data = await fetchHourlyWeatherData(tanggal);
-        processHourlyWeatherData(data, jamAwal);
-        displayHourlyWeatherResults();
+        await streamHourlyWeatherData(tanggal, jamAwal);
         showHourlySuccessNotification();
     } catch (error) {
         handleWeatherError(error, 'Hourly Prediction');
@@ -1012,6 +1011,59 @@ async function fetchHourlyWeatherData(tanggal) {
     return data;
 }
 
+// Kartu ditampilkan satu per satu begitu harinya siap (NDJSON dari endpoint /stream)
+async function streamHourlyWeatherData(tanggal, jamAwal) {
+    updateLoadingProgress(hourlyForecastContainer, 20, 'Mengakses prediksi cuaca...');
+
+    const response = await fetch(`/api/predict_weekly_weather/stream?date=${encodeURIComponent(tanggal)}`);
+
+    if (!response.ok) {
+        const errorData = await response.json();
+        throw new Error(errorData.error || `HTTP ${response.status}`);
+    }
+
+    // Fallback for browsers without streaming fetch bodies
+    if (!response.body || !response.body.getReader) {
+        const data = await fetchHourlyWeatherData(tanggal);
+        processHourlyWeatherData(data, jamAwal);
+        displayHourlyWeatherResults();
+        return data;
+    }
+
+    updateLoadingProgress(hourlyForecastContainer, 40, 'Memproses data per jam...');
+    hourlyData = [];
+
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    let summary = null;
+
+    while (true) {
+        const { value, done } = await reader.read();
+        if (done) break;
+
+        buffer += decoder.decode(value, { stream: true });
+        const lines = buffer.split('\n');
+        buffer = lines.pop();
+
+        lines.filter(line => line.trim()).forEach(line => {
+            const event = JSON.parse(line);
+            if (event.type === 'day') {
+                renderStreamedHourlyCard(event.entry, event.index, jamAwal);
+            } else if (event.type === 'summary') {
+                summary = event;
+            }
+        });
+    }
+
+    if (!summary || hourlyData.filter(Boolean).length !== CONSTANTS.WEEKLY_FORECAST_DAYS) {
+        throw new Error('Data per jam tidak lengkap');
+    }
+
+    displayStreamedHourlyHeader();
+    return summary;
+}
+
 /* ===================================================================== */
 /* UI SETUP FUNCTIONS */
 /* ===================================================================== */
@@ -1038,29 +1090,31 @@ function setupHourlyWeatherUI() {
 /* ===================================================================== */
 
 function processHourlyWeatherData(data, jamAwal) {
-    hourlyData = data.weeklyForecast.map((item, index) => {
-        const totalJam = jamAwal + index;
-        const hariTambahan = Math.floor(totalJam / 24);
-        const jamPrediksi = totalJam % 24;
-        const jamText = jamPrediksi.toString().padStart(2, '0') + ":00";
+    hourlyData = data.weeklyForecast.map((item, index) => createHourlyItem(item, index, jamAwal));
+}
 
-        const baseDate = new Date(document.getElementById('tanggal').value);
-        baseDate.setDate(baseDate.getDate() + hariTambahan);
-        const tanggalFix = baseDate.toISOString().split("T")[0];
-        const datetimeFull = `${tanggalFix} ${jamText}`;
+function createHourlyItem(item, index, jamAwal) {
+    const totalJam = jamAwal + index;
+    const hariTambahan = Math.floor(totalJam / 24);
+    const jamPrediksi = totalJam % 24;
+    const jamText = jamPrediksi.toString().padStart(2, '0') + ":00";
 
-        return {
-            hour: jamText,
-            temp: item.temp,
-            condition: item.condition,
-            humidity: item.humidity,
-            windspeed: item.windspeed,
-            modelPredictionResult: item.modelPredictionResult || item.full_prediction,
-            date: tanggalFix,
-            datetime: datetimeFull,
-            day: getDayNameIndonesian(baseDate)
-        };
-    });
+    const baseDate = new Date(document.getElementById('tanggal').value);
+    baseDate.setDate(baseDate.getDate() + hariTambahan);
+    const tanggalFix = baseDate.toISOString().split("T")[0];
+    const datetimeFull = `${tanggalFix} ${jamText}`;
+
+    return {
+        hour: jamText,
+        temp: item.temp,
+        condition: item.condition,
+        humidity: item.humidity,
+        windspeed: item.windspeed,
+        modelPredictionResult: item.modelPredictionResult || item.full_prediction,
+        date: tanggalFix,
+        datetime: datetimeFull,
+        day: getDayNameIndonesian(baseDate)
+    };
 }
 
 /* ===================================================================== */
@@ -1132,6 +1186,30 @@ function displayHourlyWeatherResults() {
     updateLoadingProgress(hourlyForecastContainer, 100, 'Selesai!');
 }
 
+function renderStreamedHourlyCard(item, index, jamAwal) {
+    hourlyData[index] = createHourlyItem(item, index, jamAwal);
+
+    let hourlyGrid = hourlyForecastContainer.querySelector('.weekly-grid-daily');
+    if (!hourlyGrid) {
+        hourlyForecastContainer.innerHTML = '';
+        hourlyGrid = createPlaceholderHourlyGrid(CONSTANTS.WEEKLY_FORECAST_DAYS);
+        hourlyForecastContainer.appendChild(hourlyGrid);
+    }
+
+    hourlyGrid.replaceChild(createEnhancedHourlyCard(hourlyData[index], index), hourlyGrid.children[index]);
+}
+
+function displayStreamedHourlyHeader() {
+    const firstHourData = hourlyData[0];
+    const today = new Date(document.getElementById('tanggal').value);
+    firstHourData.location = "Ambon, Maluku";
+
+    const hourlyGrid = hourlyForecastContainer.querySelector('.weekly-grid-daily');
+    hourlyGrid.insertAdjacentHTML('beforebegin', createHourlyHeader(firstHourData, today));
+
+    setTimeout(() => navigateToCard(0), 100);
+}
+
 function createWeatherDetailsHTML(vcData) {
     return `
         <div class="weather-details">
@@ -1183,6 +1261,26 @@ function createHourlyGrid() {
     return hourlyGrid;
 }
 
+function createPlaceholderHourlyGrid(count) {
+    const hourlyGrid = document.createElement('div');
+    hourlyGrid.classList.add('weekly-grid-daily');
+    hourlyGrid.setAttribute('role', 'tablist');
+    hourlyGrid.setAttribute('aria-label', 'Prediksi Per Jam');
+
+    for (let i = 0; i < count; i++) {
+        const placeholderCard = document.createElement('div');
+        placeholderCard.classList.add('daily-card');
+        placeholderCard.setAttribute('aria-busy', 'true');
+        placeholderCard.innerHTML = `
+            <h3 class="hour-label">--:--</h3>
+            <p class="condition">memuat...</p>
+        `;
+        hourlyGrid.appendChild(placeholderCard);
+    }
+
+    return hourlyGrid;
+}
+
 /* ===================================================================== */
 /* ERROR HANDLING */
 /* ===================================================================== */
@@ -0,0 +1,443 @@
+"""
+Description: Pure-NumPy inference engine for the trained RBF SVC and StandardScaler
+"""
+
+# =====================================================================================
+# IMPORTS AND DEPENDENCIES
+# =====================================================================================
+
+import contextlib
+import hashlib
+import json
+import mmap
+import os
+import struct
+import time
+
+import numpy as np # utk perhitungan kernel dan probabilitas
+
+# =====================================================================================
+# ENGINE CONFIGURATION
+# =====================================================================================
+
+# versi 2: bundle tanpa kompresi dgn checksum sha256 atas semua array
+BUNDLE_FORMAT_VERSION = 2
+
+# batas probabilitas pasangan kelas, sama dengan libsvm
+MIN_PAIRWISE_PROBABILITY = 1e-7
+
+# file datar utk mmap: magic, panjang header (uint32 little-endian), header JSON, lalu array mentah
+FLAT_MAGIC = b'SVCFLAT\x00'
+FLAT_ALIGNMENT = 64
+
+# =====================================================================================
+# MODEL EXPORT
+# =====================================================================================
+
+# mengambil array numerik dari model SVC dan scaler sklearn, tanpa perlu import sklearn
+def extract_model_arrays(svm_model, scaler, feature_columns=None):
+    """
+    Extract the arrays needed for inference from fitted sklearn objects.
+
+    Args:
+        svm_model: Fitted sklearn SVC with an RBF kernel
+        scaler: Fitted sklearn StandardScaler
+        feature_columns (list): Column order used when the model has no feature names
+
+    Returns:
+        dict: Arrays describing the scaler and the one-vs-one SVC
+    """
+    if getattr(svm_model, 'kernel', None) != 'rbf':
+        raise ValueError(f"Hanya kernel RBF yang didukung (kernel model: {getattr(svm_model, 'kernel', None)})")
+
+    if hasattr(svm_model, 'feature_names_in_'):
+        feature_columns = list(svm_model.feature_names_in_)
+    if feature_columns is None:
+        raise ValueError("Kolom fitur tidak diketahui; berikan feature_columns")
+
+    # libsvm menyimpan koefisien dan intercept mentah di atribut berawalan underscore
+    prob_a = getattr(svm_model, '_probA', np.empty(0))
+    prob_b = getattr(svm_model, '_probB', np.empty(0))
+
+    return {
+        'format_version': np.array(BUNDLE_FORMAT_VERSION, dtype=np.int32),
+        'feature_columns': np.array(feature_columns, dtype=np.str_),
+        'classes': np.asarray(svm_model.classes_, dtype=np.int64),
+        'support_vectors': np.ascontiguousarray(svm_model.support_vectors_, dtype=np.float64),
+        'n_support': np.asarray(svm_model._n_support, dtype=np.int64),
+        'dual_coef': np.ascontiguousarray(svm_model._dual_coef_, dtype=np.float64),
+        'intercept': np.asarray(svm_model._intercept_, dtype=np.float64),
+        'gamma': np.array(svm_model._gamma, dtype=np.float64),
+        'prob_a': np.asarray(prob_a, dtype=np.float64),
+        'prob_b': np.asarray(prob_b, dtype=np.float64),
+        'scaler_mean': np.asarray(scaler.mean_, dtype=np.float64),
+        'scaler_scale': np.asarray(scaler.scale_, dtype=np.float64)
+    }
+
+def export_bundle(svm_model, scaler, bundle_path, feature_columns=None):
+    """Write the model and scaler arrays into a single .npz bundle with a checksum."""
+    arrays = extract_model_arrays(svm_model, scaler, feature_columns)
+    arrays['checksum'] = np.array(bundle_checksum(arrays), dtype=np.str_)
+    # tanpa kompresi: sedikit lebih besar, tapi dimuat tanpa dekompresi saat startup
+    with atomic_output(bundle_path) as bundle_file:
+        np.savez(bundle_file, **arrays)
+    return arrays
+
+def bundle_checksum(arrays):
+    """SHA-256 over every array's name, dtype, shape and bytes (the checksum entry excluded)."""
+    digest = hashlib.sha256()
+    for name in sorted(arrays):
+        if name == 'checksum':
+            continue
+        array = np.ascontiguousarray(arrays[name])
+        digest.update(f"{name}|{array.dtype.str}|{array.shape}|".encode('utf-8'))
+        digest.update(array.tobytes())
+    return digest.hexdigest()
+
+# array turunan (bobot pasangan, norma support vector) ikut disimpan agar tidak disalin per worker
+def export_flat_bundle(arrays, bundle_path):
+    """
+    Write the model arrays into a flat file that SVCEngine.load_mapped opens with mmap.
+
+    Args:
+        arrays (dict): Arrays from extract_model_arrays
+        bundle_path (str): Output path
+
+    Returns:
+        dict: The header written (format version, checksum and array table)
+    """
+    pairs, pair_weights = build_pair_weights(arrays['n_support'], arrays['dual_coef'])
+    numeric = {name: np.asarray(value, order='C') for name, value in arrays.items()
+               if name not in ('format_version', 'feature_columns', 'checksum')}
+    numeric['pairs'] = np.asarray(pairs, dtype=np.int64).reshape(-1, 2)
+    numeric['pair_weights'] = np.ascontiguousarray(pair_weights)
+    numeric['support_norms'] = np.einsum('ij,ij->i', numeric['support_vectors'], numeric['support_vectors'])
+
+    feature_columns = [str(col) for col in arrays['feature_columns']]
+    table = {}
+    offset = 0
+    for name in sorted(numeric):
+        offset = align(offset, FLAT_ALIGNMENT)
+        table[name] = {'dtype': numeric[name].dtype.str, 'shape': list(numeric[name].shape), 'offset': offset}
+        offset += numeric[name].nbytes
+
+    header = {
+        'format_version': BUNDLE_FORMAT_VERSION,
+        'feature_columns': feature_columns,
+        'checksum': bundle_checksum({**numeric, 'feature_columns': np.array(feature_columns, dtype=np.str_)}),
+        'arrays': table
+    }
+    header_bytes = json.dumps(header).encode('utf-8')
+    data_start = align(len(FLAT_MAGIC) + 4 + len(header_bytes), FLAT_ALIGNMENT)
+
+    with atomic_output(bundle_path) as bundle_file:
+        bundle_file.write(FLAT_MAGIC + struct.pack('<I', len(header_bytes)) + header_bytes)
+        for name in sorted(numeric):
+            bundle_file.seek(data_start + table[name]['offset'])
+            bundle_file.write(numeric[name].tobytes())
+
+    return header
+
+# ditulis paling akhir: watcher app.py hanya memantau file ini, jadi satu export = satu reload yg lengkap
+def write_export_stamp(stamp_path, source, checksum):
+    """
+    Record a finished export; app.py reloads the model when this file changes.
+
+    Args:
+        source (str): Artifact app.py loads on reload ('mmap' for the flat bundle)
+        checksum (str): Checksum the loaded engine must report
+
+    Returns:
+        dict: The stamp written
+    """
+    stamp = {'source': source, 'checksum': checksum, 'exported_at': time.strftime('%Y-%m-%dT%H:%M:%S')}
+    with atomic_output(stamp_path) as stamp_file:
+        stamp_file.write(json.dumps(stamp, indent=2).encode('utf-8'))
+    return stamp
+
+def read_flat_bundle(bundle_path):
+    """
+    Map a flat bundle read-only and return its header and zero-copy array views.
+
+    Raises:
+        ValueError: If the magic, format version or checksum does not match
+    """
+    with open(bundle_path, 'rb') as bundle_file:
+        mapped = mmap.mmap(bundle_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    if mapped[:len(FLAT_MAGIC)] != FLAT_MAGIC:
+        mapped.close()
+        raise ValueError("Bukan file bundle model datar (magic tidak cocok)")
+
+    header_length = struct.unpack_from('<I', mapped, len(FLAT_MAGIC))[0]
+    header_start = len(FLAT_MAGIC) + 4
+    header = json.loads(mapped[header_start:header_start + header_length].decode('utf-8'))
+    if header.get('format_version') != BUNDLE_FORMAT_VERSION:
+        mapped.close()
+        raise ValueError(f"Versi bundle model tidak didukung: {header.get('format_version')}")
+
+    data_start = align(header_start + header_length, FLAT_ALIGNMENT)
+    arrays = {}
+    for name, spec in header['arrays'].items():
+        dtype = np.dtype(spec['dtype'])
+        count = int(np.prod(spec['shape'], dtype=np.int64))
+        arrays[name] = np.frombuffer(mapped, dtype=dtype, count=count,
+                                     offset=data_start + spec['offset']).reshape(tuple(spec['shape']))
+    arrays['feature_columns'] = np.array(header['feature_columns'], dtype=np.str_)
+
+    if bundle_checksum(arrays) != header['checksum']:
+        raise ValueError("Checksum bundle model tidak cocok (file rusak atau tidak lengkap)")
+
+    arrays['checksum'] = np.array(header['checksum'], dtype=np.str_)
+    return header, arrays
+
+# file lama diganti dgn rename, jadi worker yg masih me-mmap file lama tidak membaca file setengah jadi
+@contextlib.contextmanager
+def atomic_output(path):
+    """Write to a temporary file next to `path`, then rename it over `path`."""
+    temp_path = f"{path}.tmp-{os.getpid()}"
+    try:
+        with open(temp_path, 'wb') as output_file:
+            yield output_file
+        os.replace(temp_path, path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+def align(offset, alignment):
+    return (offset + alignment - 1) // alignment * alignment
+
+# =====================================================================================
+# INFERENCE ENGINE
+# =====================================================================================
+
+class SVCEngine:
+    """
+    One-vs-one RBF SVC evaluated with NumPy only.
+
+    Reproduces sklearn's SVC.predict (libsvm voting) and, when the model was
+    trained with probability=True, SVC.predict_proba (Platt scaling with
+    pairwise coupling). The scaler is applied inside the engine, so callers
+    pass raw feature rows in `feature_columns` order.
+    """
+
+    def __init__(self, arrays, mapped_path=None):
+        self.mapped_path = mapped_path # path file bundle datar jika array dibuka lewat mmap
+        self.feature_columns = [str(col) for col in arrays['feature_columns']]
+        self.classes = np.asarray(arrays['classes'])
+        self.support_vectors = np.asarray(arrays['support_vectors'], dtype=np.float64)
+        self.gamma = float(arrays['gamma'])
+        self.intercept = np.asarray(arrays['intercept'], dtype=np.float64)
+        self.prob_a = np.asarray(arrays['prob_a'], dtype=np.float64)
+        self.prob_b = np.asarray(arrays['prob_b'], dtype=np.float64)
+        self.scaler_mean = np.asarray(arrays['scaler_mean'], dtype=np.float64)
+        self.scaler_scale = np.asarray(arrays['scaler_scale'], dtype=np.float64)
+
+        # bundle datar sudah berisi array turunan; bundle lain menghitungnya di sini
+        if 'pair_weights' in arrays:
+            self.pairs = [(int(i), int(j)) for i, j in arrays['pairs']]
+            self.pair_weights = np.asarray(arrays['pair_weights'], dtype=np.float64)
+            self.support_norms = np.asarray(arrays['support_norms'], dtype=np.float64)
+        else:
+            n_support = np.asarray(arrays['n_support'], dtype=np.int64)
+            dual_coef = np.asarray(arrays['dual_coef'], dtype=np.float64)
+            self.pairs, self.pair_weights = build_pair_weights(n_support, dual_coef)
+            self.support_norms = np.einsum('ij,ij->i', self.support_vectors, self.support_vectors)
+        self.checksum = str(arrays['checksum']) if 'checksum' in arrays else None
+
+    @classmethod
+    def from_estimators(cls, svm_model, scaler, feature_columns=None):
+        """Build an engine directly from fitted sklearn objects."""
+        return cls(extract_model_arrays(svm_model, scaler, feature_columns))
+
+    @classmethod
+    def load(cls, bundle_path):
+        """
+        Load an engine from a bundle written by export_bundle.
+
+        Raises:
+            ValueError: If the format version is unsupported or the checksum does not match
+        """
+        with np.load(bundle_path, allow_pickle=False) as bundle:
+            arrays = {key: bundle[key] for key in bundle.files}
+
+        version = int(arrays.get('format_version', -1))
+        if version != BUNDLE_FORMAT_VERSION:
+            raise ValueError(f"Versi bundle model tidak didukung: {version}")
+
+        if 'checksum' not in arrays or str(arrays['checksum']) != bundle_checksum(arrays):
+            raise ValueError("Checksum bundle model tidak cocok (file rusak atau tidak lengkap)")
+
+        return cls(arrays)
+
+    @classmethod
+    def load_mapped(cls, bundle_path):
+        """
+        Load an engine whose arrays are read-only views of a memory-mapped flat bundle.
+
+        Every process mapping the same file shares one physical copy of the
+        support vectors and coefficients through the page cache.
+        """
+        _, arrays = read_flat_bundle(bundle_path)
+        return cls(arrays, mapped_path=bundle_path)
+
+    @property
+    def nbytes(self):
+        """Bytes held by the arrays used at inference time."""
+        return sum(array.nbytes for array in (self.support_vectors, self.pair_weights, self.support_norms,
+                                              self.intercept, self.prob_a, self.prob_b,
+                                              self.scaler_mean, self.scaler_scale))
+
+    def warm_up(self):
+        """Run one dummy row through every stage so the first request does not pay first-call costs."""
+        self.evaluate(np.zeros((1, len(self.feature_columns)), dtype=np.float64))
+
+    @property
+    def supports_probability(self):
+        return self.prob_a.size == len(self.pairs) and self.prob_a.size > 0
+
+    def transform(self, features):
+        """Apply StandardScaler statistics to raw feature rows."""
+        return (np.asarray(features, dtype=np.float64) - self.scaler_mean) / self.scaler_scale
+
+    def decision_values(self, features_scaled):
+        """Pairwise (one-vs-one) decision values, shape (n_rows, n_pairs)."""
+        row_norms = np.einsum('ij,ij->i', features_scaled, features_scaled)
+        squared_distances = row_norms[:, None] + self.support_norms[None, :] - 2.0 * (features_scaled @ self.support_vectors.T)
+        np.maximum(squared_distances, 0.0, out=squared_distances)
+        kernel = np.exp(-self.gamma * squared_distances)
+        return kernel @ self.pair_weights + self.intercept
+
+    def predict_from_decision(self, decision):
+        """Majority vote over pairwise decisions, ties go to the lower class index."""
+        votes = np.zeros((decision.shape[0], len(self.classes)), dtype=np.int64)
+        for pair_index, (i, j) in enumerate(self.pairs):
+            positive = decision[:, pair_index] > 0
+            votes[:, i] += positive
+            votes[:, j] += ~positive
+        return self.classes[np.argmax(votes, axis=1)]
+
+    def proba_from_decision(self, decision):
+        """Platt-scaled pairwise probabilities coupled into class probabilities."""
+        pairwise = sigmoid_predict(decision, self.prob_a, self.prob_b)
+        np.clip(pairwise, MIN_PAIRWISE_PROBABILITY, 1 - MIN_PAIRWISE_PROBABILITY, out=pairwise)
+
+        n_classes = len(self.classes)
+        r = np.zeros((decision.shape[0], n_classes, n_classes))
+        for pair_index, (i, j) in enumerate(self.pairs):
+            r[:, i, j] = pairwise[:, pair_index]
+            r[:, j, i] = 1 - pairwise[:, pair_index]
+        return multiclass_probability(r)
+
+    def predict(self, features):
+        """Predict class labels for raw (unscaled) feature rows."""
+        return self.predict_from_decision(self.decision_values(self.transform(features)))
+
+    def predict_proba(self, features):
+        """Predict class probabilities for raw (unscaled) feature rows."""
+        if not self.supports_probability:
+            raise AttributeError("Model tidak dilatih dengan probability=True")
+        return self.proba_from_decision(self.decision_values(self.transform(features)))
+
+    def evaluate(self, features, stage=None):
+        """
+        Evaluate the kernel once and derive labels and probabilities.
+
+        Labels are the one-vs-one vote, as SVC.predict returns them, and the
+        probabilities come from the same decision values.
+
+        Args:
+            features: Raw (unscaled) feature rows
+            stage: Optional callable(name) returning a context manager that
+                times each step (scaling, svc_decision, svc_vote, probability)
+
+        Returns:
+            tuple: (labels, class_probabilities or None)
+        """
+        stage = stage or null_stage
+        with stage('scaling'):
+            features_scaled = self.transform(features)
+        with stage('svc_decision'):
+            decision = self.decision_values(features_scaled)
+
+        # label selalu dari voting ovo (spt SVC.predict); argmax probabilitas Platt bisa berbeda
+        with stage('svc_vote'):
+            labels = self.predict_from_decision(decision)
+        if not self.supports_probability:
+            return labels, None
+        with stage('probability'):
+            class_probabilities = self.proba_from_decision(decision)
+        return labels, class_probabilities
+
+def null_stage(name):
+    """Default stage timer of SVCEngine.evaluate: times nothing."""
+    return contextlib.nullcontext()
+
+# =====================================================================================
+# LIBSVM HELPERS
+# =====================================================================================
+
+# menyusun bobot per pasangan kelas (i, j) agar semua keputusan ovo dihitung dgn satu perkalian matriks
+def build_pair_weights(n_support, dual_coef):
+    """
+    Arrange libsvm dual coefficients into a (n_support_vectors, n_pairs) matrix.
+
+    For the pair (i, j), support vectors of class i use row j-1 of dual_coef
+    and support vectors of class j use row i, as in libsvm's svm_predict_values.
+    """
+    n_classes = len(n_support)
+    starts = np.concatenate(([0], np.cumsum(n_support)[:-1]))
+    pairs = [(i, j) for i in range(n_classes) for j in range(i + 1, n_classes)]
+    weights = np.zeros((dual_coef.shape[1], len(pairs)))
+
+    for pair_index, (i, j) in enumerate(pairs):
+        sv_i = slice(starts[i], starts[i] + n_support[i])
+        sv_j = slice(starts[j], starts[j] + n_support[j])
+        weights[sv_i, pair_index] = dual_coef[j - 1, sv_i]
+        weights[sv_j, pair_index] = dual_coef[i, sv_j]
+
+    return pairs, weights
+
+def sigmoid_predict(decision, prob_a, prob_b):
+    """Numerically stable 1 / (1 + exp(decision * A + B))."""
+    f_ab = decision * prob_a + prob_b
+    result = np.empty_like(f_ab)
+    positive = f_ab >= 0
+    exp_neg = np.exp(-f_ab[positive])
+    result[positive] = exp_neg / (1.0 + exp_neg)
+    result[~positive] = 1.0 / (1.0 + np.exp(f_ab[~positive]))
+    return result
+
+def multiclass_probability(r):
+    """
+    Pairwise coupling (Wu, Lin and Weng, method 2) vectorised over rows.
+
+    Mirrors libsvm's multiclass_probability, including its stopping rule, so
+    every row stops iterating at the same point libsvm would.
+    """
+    n_rows, k, _ = r.shape
+    q = -r.transpose(0, 2, 1) * r
+    diagonal = np.einsum('nij,nij->nj', r, r) - np.einsum('nii->ni', r) ** 2
+    q[:, np.arange(k), np.arange(k)] = diagonal
+
+    p = np.full((n_rows, k), 1.0 / k)
+    qp = np.einsum('ntj,nj->nt', q, p)
+    active = np.ones(n_rows, dtype=bool)
+    eps = 0.005 / k
+
+    for _ in range(max(100, k)):
+        pqp = np.einsum('nt,nt->n', p, qp)
+        max_error = np.max(np.abs(qp - pqp[:, None]), axis=1)
+        active &= max_error >= eps
+        if not active.any():
+            break
+
+        for t in range(k):
+            rows = active
+            diff = (-qp[rows, t] + pqp[rows]) / q[rows, t, t]
+            p[rows, t] += diff
+            pqp[rows] = (pqp[rows] + diff * (diff * q[rows, t, t] + 2 * qp[rows, t])) / (1 + diff) / (1 + diff)
+            qp[rows] = (qp[rows] + diff[:, None] * q[rows, t, :]) / (1 + diff)[:, None]
+            p[rows] /= (1 + diff)[:, None]
+
+    return p
@@ -0,0 +1,18 @@
+"""
+Description: Shared pytest setup; the app modules are flat files in WebCuaca/ and load artifacts relative to it
+"""
+
+import os
+import sys
+import tempfile
+
+WEBCUACA_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# sebelum app di-import: tanpa pre-warm, kuota dan profil di folder sementara
+TEST_STATE_DIR = tempfile.mkdtemp(prefix='webcuaca-test-')
+os.environ.setdefault('PREWARM_ENABLED', '0')
+os.environ.setdefault('WEBCUACA_STATE_DIR', TEST_STATE_DIR)
+os.environ.setdefault('QUOTA_STATE_PATH', os.path.join(TEST_STATE_DIR, 'quota_state.json'))
+
+sys.path.insert(0, WEBCUACA_DIR)
+os.chdir(WEBCUACA_DIR)
@@ -0,0 +1,43 @@
+"""
+Description: The ASGI app builds DayFrames and daily rows in worker threads, never on the event loop
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+pytest.importorskip('starlette')
+
+import app as weather_app
+import asgi_app
+
+def test_day_frames_and_daily_rows_are_built_off_the_event_loop(monkeypatch):
+    threads = {}
+    build_day_frames = weather_app.build_day_frames
+    select_daily_from_frame = weather_app.select_daily_from_frame
+
+    async def fetch_days_async(location, date_strs, include, elements):
+        return {date_str: {'datetime': date_str, 'hours': [{'datetime': '12:00:00', 'temp': 27.0}]}
+                for date_str in date_strs}
+
+    def recording(name, fn):
+        def wrapper(*args):
+            threads[name] = threading.current_thread()
+            return fn(*args)
+        return wrapper
+
+    monkeypatch.setattr(asgi_app, 'fetch_days_async', fetch_days_async)
+    monkeypatch.setattr(weather_app, 'build_day_frames', recording('build_day_frames', build_day_frames))
+    monkeypatch.setattr(weather_app, 'select_daily_from_frame', recording('select', select_daily_from_frame))
+    weather_app.day_store.clear()
+
+    async def run():
+        threads['loop'] = threading.current_thread()
+        return await asgi_app.get_hourly_based_daily_predictions_async(['2024-01-01'])
+
+    day_data = asyncio.run(run())
+
+    assert set(day_data) == {'2024-01-01'}
+    assert threads['build_day_frames'] is not threads['loop']
+    assert threads['select'] is not threads['loop']
@@ -0,0 +1,47 @@
+"""
+Description: /api/predict_batch refuses over-budget batches before calling Visual Crossing
+"""
+
+from datetime import date, timedelta
+
+import pytest
+
+import app as weather_app
+from quota import QuotaBudget
+
+@pytest.fixture
+def upstream_calls(monkeypatch):
+    """Record upstream calls instead of reaching the network."""
+    calls = []
+
+    def get_json(url, name='upstream'):
+        calls.append(url)
+        raise AssertionError("upstream must not be called for a refused batch")
+
+    monkeypatch.setattr(weather_app.upstream_client, 'get_json', get_json)
+    weather_app.day_store.clear()
+    weather_app.timeline_cache.clear()
+    return calls
+
+def batch_body(locations, days):
+    start = date(2024, 1, 1)
+    return {'items': [{'location': location, 'date': (start + timedelta(days=offset)).isoformat()}
+                      for location in locations for offset in range(days)]}
+
+def test_too_many_locations_is_rejected(upstream_calls):
+    locations = [f"Kota {index}" for index in range(weather_app.BATCH_CONFIG['max_locations'] + 1)]
+    response = weather_app.app.test_client().post('/api/predict_batch', json=batch_body(locations, 1))
+    assert response.status_code == 413
+    assert upstream_calls == []
+
+def test_too_many_records_is_rejected(upstream_calls):
+    days = weather_app.BATCH_CONFIG['max_upstream_records'] // 24 + 1
+    response = weather_app.app.test_client().post('/api/predict_batch', json=batch_body(['Ambon'], days))
+    assert response.status_code == 413
+    assert upstream_calls == []
+
+def test_batch_over_remaining_quota_is_rejected(upstream_calls, monkeypatch):
+    monkeypatch.setattr(weather_app, 'quota_budget', QuotaBudget(daily_limit=100))
+    response = weather_app.app.test_client().post('/api/predict_batch', json=batch_body(['Ambon', 'Tual'], 3))
+    assert response.status_code == 429
+    assert upstream_calls == []
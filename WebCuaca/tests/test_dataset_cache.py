@@ -0,0 +1,50 @@
+"""
+Description: The columnar cache encodes every chunk of the CSV the same way pd.read_csv reads the whole file
+"""
+
+import numpy as np
+import pandas as pd
+
+import dataset_cache
+
+def write_csv(tmp_path, rows):
+    path = tmp_path / 'cuaca.csv'
+    pd.DataFrame(rows).to_csv(path, index=False)
+    return str(path)
+
+def build(tmp_path, csv_path, chunk_rows):
+    return dataset_cache.load_dataset(csv_path, cache_dir=str(tmp_path / 'cache'), rebuild=True,
+                                      chunk_rows=chunk_rows)
+
+def test_label_codes_follow_sorted_classes_across_chunks(tmp_path):
+    # urutan kemunculan pertama (hujan, cerah, berawan) berbeda dgn urutan terurut
+    labels = ['hujan', 'hujan', 'cerah', None, 'hujan', 'berawan', 'cerah']
+    csv_path = write_csv(tmp_path, {'temp': range(len(labels)), 'weather': labels})
+
+    dataset = build(tmp_path, csv_path, chunk_rows=2)
+
+    assert dataset.classes == ['berawan', 'cerah', 'hujan']
+    assert dataset.label_codes().tolist() == [2, 2, 1, dataset_cache.MISSING_LABEL, 2, 0, 1]
+    assert dataset.label_names().tolist() == labels
+
+def test_column_turning_text_in_a_later_chunk_becomes_category(tmp_path):
+    conditions = ['1', '2', '', '3', 'Partially cloudy', '4']
+    csv_path = write_csv(tmp_path, {'temp': range(len(conditions)), 'conditions': conditions,
+                                    'weather': ['cerah'] * len(conditions)})
+
+    dataset = build(tmp_path, csv_path, chunk_rows=2)
+
+    assert dataset.manifest['columns']['conditions']['kind'] == 'category'
+    assert dataset.feature_columns == ['temp']
+    pd.testing.assert_frame_equal(dataset.to_frame(), pd.read_csv(csv_path).astype({'conditions': object}),
+                                  check_dtype=False)
+
+def test_empty_first_chunk_does_not_fix_the_timestamp_kind(tmp_path):
+    times = [None, None, '2024-01-01T00:00:00', '2024-01-01T01:00:00']
+    csv_path = write_csv(tmp_path, {'datetime': times, 'temp': [1.5, 2.5, 3.5, 4.5], 'weather': ['cerah'] * 4})
+
+    dataset = build(tmp_path, csv_path, chunk_rows=2)
+
+    assert dataset.manifest['columns']['datetime']['timestamp_kind'] == 'unix'
+    expected = pd.to_datetime(pd.Series(times)).to_numpy(dtype='datetime64[s]').astype(np.int64)
+    assert dataset.timestamps().tolist() == expected.tolist()
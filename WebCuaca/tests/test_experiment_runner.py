@@ -0,0 +1,50 @@
+"""
+Description: The experiment grid is scored by cross-validation on the training split only
+"""
+
+import os
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import StandardScaler
+
+import experiment_runner
+
+def make_prepared(rows=120):
+    rng = np.random.default_rng(0)
+    columns = ['temp', 'humidity']
+    y = np.arange(rows) % 3
+    X = rng.standard_normal((rows, len(columns))) + y[:, None]
+    train = rows * 3 // 4
+    scaler = StandardScaler().fit(pd.DataFrame(X[:train], columns=columns))
+    prepared = SimpleNamespace(feature_columns=columns, X_train=X[:train], y_train=y[:train],
+                               X_test=X[train:], y_test=y[train:])
+    return prepared, scaler
+
+def test_workers_only_see_the_training_split(tmp_path):
+    prepared, scaler = make_prepared()
+    experiment_runner.prepare_shared_arrays(prepared, scaler, str(tmp_path), cv_folds=3)
+
+    assert sorted(os.listdir(tmp_path)) == ['X_train.npy', 'folds.npy', 'y_train.npy']
+    folds = np.load(tmp_path / 'folds.npy')
+    # stratified: tiap fold berisi semua kelas dgn jumlah yg sama
+    for fold in range(3):
+        assert np.bincount(prepared.y_train[folds == fold]).tolist() == [10, 10, 10]
+
+def test_selection_uses_cross_validation_scores(tmp_path):
+    prepared, scaler = make_prepared()
+    experiment_runner.prepare_shared_arrays(prepared, scaler, str(tmp_path), cv_folds=3)
+    experiment_runner.init_worker(str(tmp_path))
+
+    results = [experiment_runner.run_experiment({'scenario': 'dasar', 'strategy': None, 'C': c_value, 'gamma': 'scale'})
+               for c_value in (0.01, 1.0)]
+
+    assert [result['error'] for result in results] == [None, None]
+    assert all('macro_f1' not in result for result in results)
+    best = experiment_runner.select_best(results, 'macro_f1')
+    assert best['cv_macro_f1'] == max(result['cv_macro_f1'] for result in results)
+
+    model, test_metrics = experiment_runner.fit_winner(best, prepared, scaler)
+    assert test_metrics['train_rows'] == len(prepared.y_train)
+    assert sum(map(sum, test_metrics['confusion_matrix'])) == len(prepared.y_test)
@@ -0,0 +1,73 @@
+"""
+Description: Hot reload loads only the exported artifact and keeps the current model when it is broken
+"""
+
+import shutil
+
+import pytest
+
+import app as weather_app
+from model_bundle import ArtifactWatcher
+from svc_engine import read_flat_bundle, write_export_stamp
+
+@pytest.fixture
+def artifacts(tmp_path, monkeypatch):
+    """Copies of the shipped artifacts, so the tests can break them."""
+    for key in ('engine_flat_path', 'engine_bundle_path', 'svm_model_path', 'scaler_path'):
+        path = tmp_path / weather_app.MODEL_CONFIG[key]
+        shutil.copy(weather_app.MODEL_CONFIG[key], path)
+        monkeypatch.setitem(weather_app.MODEL_CONFIG, key, str(path))
+    monkeypatch.setitem(weather_app.MODEL_CONFIG, 'export_stamp_path', str(tmp_path / 'model_export.json'))
+    monkeypatch.setattr(weather_app, 'model_bundle', weather_app.wait_for_model())
+    return tmp_path
+
+def corrupt(path):
+    with open(path, 'r+b') as artifact_file:
+        artifact_file.seek(5000)
+        artifact_file.write(b'\x00' * 64)
+
+def test_reload_swaps_in_the_stamped_artifact(artifacts):
+    header, _ = read_flat_bundle(weather_app.MODEL_CONFIG['engine_flat_path'])
+    write_export_stamp(weather_app.MODEL_CONFIG['export_stamp_path'], 'mmap', header['checksum'])
+    current = weather_app.model_bundle
+
+    bundle = weather_app.reload_model()
+
+    assert weather_app.model_bundle is bundle
+    assert (bundle.source, bundle.version) == ('mmap', current.version + 1)
+
+def test_corrupt_artifact_keeps_the_current_model(artifacts):
+    current = weather_app.model_bundle
+    failures = weather_app.model_reload_status['failures']
+    corrupt(weather_app.MODEL_CONFIG['engine_flat_path'])
+
+    # tidak ada fallback ke .npz/.pkl yg mungkin sudah usang
+    with pytest.raises(ValueError, match='gagal dimuat'):
+        weather_app.reload_model()
+
+    assert weather_app.model_bundle is current
+    assert weather_app.model_reload_status['failures'] == failures + 1
+
+def test_artifact_not_matching_the_stamp_is_refused(artifacts):
+    current = weather_app.model_bundle
+    write_export_stamp(weather_app.MODEL_CONFIG['export_stamp_path'], 'mmap', '0' * 64)
+
+    with pytest.raises(ValueError, match='stamp export'):
+        weather_app.reload_model()
+
+    assert weather_app.model_bundle is current
+
+def test_watcher_reloads_once_per_export(artifacts):
+    stamp_path = weather_app.MODEL_CONFIG['export_stamp_path']
+    calls = []
+    watcher = ArtifactWatcher([stamp_path], on_change=lambda: calls.append(1))
+
+    # artefak yg diganti tanpa stamp (export belum selesai) tidak memicu reload
+    shutil.copy(weather_app.MODEL_CONFIG['engine_flat_path'], artifacts / 'copy.bin')
+    shutil.move(artifacts / 'copy.bin', weather_app.MODEL_CONFIG['engine_flat_path'])
+    assert watcher.poll() is False
+
+    write_export_stamp(stamp_path, 'mmap', 'checksum')
+    assert watcher.poll() is True
+    assert watcher.poll() is False
+    assert calls == [1]
@@ -0,0 +1,56 @@
+"""
+Description: Runtime data (request profiles, quota state) must not be reachable through the static file routes
+"""
+
+import os
+import shutil
+import tempfile
+
+import pytest
+
+import app as weather_app
+
+@pytest.fixture
+def profile_dir_in_static_root(monkeypatch):
+    """A profile directory misconfigured inside the served folder, holding one profile."""
+    directory = tempfile.mkdtemp(prefix='profiles-', dir=weather_app.STATIC_ROOT)
+    for suffix in ('collapsed', 'prof', 'json'):
+        with open(os.path.join(directory, f"abc123.{suffix}"), 'w', encoding='utf-8') as profile_file:
+            profile_file.write('main;predict 1\n')
+    monkeypatch.setitem(weather_app.PROFILING_CONFIG, 'directory', directory)
+    yield os.path.basename(directory)
+    shutil.rmtree(directory, ignore_errors=True)
+
+def test_default_profile_directory_is_outside_static_root():
+    static_root = os.path.realpath(weather_app.STATIC_ROOT)
+    directory = os.path.realpath(os.path.join(weather_app.STATE_DIR, 'profiles'))
+    assert not directory.startswith(static_root + os.sep)
+
+@pytest.mark.parametrize('suffix', ['collapsed', 'prof', 'json'])
+def test_flask_refuses_profile_files_without_token(profile_dir_in_static_root, suffix):
+    client = weather_app.app.test_client()
+    response = client.get(f"/{profile_dir_in_static_root}/abc123.{suffix}")
+    assert response.status_code in (403, 404)
+
+def test_flask_still_serves_static_files():
+    client = weather_app.app.test_client()
+    assert client.get('/index.html').status_code == 200
+
+def test_asgi_refuses_profile_files_without_token(profile_dir_in_static_root):
+    starlette_testclient = pytest.importorskip('starlette.testclient')
+    import asgi_app
+
+    client = starlette_testclient.TestClient(asgi_app.app)
+    assert client.get(f"/{profile_dir_in_static_root}/abc123.collapsed").status_code in (403, 404)
+    assert client.get('/index.html').status_code == 200
+
+def test_default_quota_state_is_outside_static_root():
+    static_root = os.path.realpath(weather_app.STATIC_ROOT)
+    state_path = os.path.realpath(os.path.join(weather_app.STATE_DIR, 'quota_state.json'))
+    assert not state_path.startswith(static_root + os.sep)
+
+@pytest.mark.parametrize('suffix', ['', '.lock'])
+def test_flask_refuses_quota_state_inside_static_root(monkeypatch, suffix):
+    monkeypatch.setitem(weather_app.QUOTA_CONFIG, 'state_path', os.path.join(weather_app.STATIC_ROOT, 'quota_state.json'))
+    client = weather_app.app.test_client()
+    assert client.get(f"/quota_state.json{suffix}").status_code in (403, 404)
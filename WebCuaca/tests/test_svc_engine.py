@@ -0,0 +1,55 @@
+"""
+Description: svc_engine reproduces SVC.predict and SVC.predict_proba, also after export to the .npz and flat bundles
+"""
+
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.preprocessing import StandardScaler
+from sklearn.svm import SVC
+
+from dataset_cache import load_dataset
+from model_config import MODEL_CONFIG
+from svc_engine import SVCEngine, export_bundle, export_flat_bundle
+
+@pytest.fixture(scope='module')
+def fitted():
+    """Small SVC(probability=True) and scaler fitted on DataCuaca rows like the notebooks."""
+    dataset = load_dataset()
+    columns = MODEL_CONFIG['feature_columns']
+    features = pd.DataFrame(dataset.feature_matrix(columns), columns=columns)
+    labels = pd.Series(dataset.label_names())
+    kept = features.notna().all(axis=1) & labels.notna()
+    features, labels = features[kept].iloc[::8], labels[kept].iloc[::8]
+    y = labels.map({'berawan': 0, 'cerah': 1, 'hujan': 2}).to_numpy()
+
+    scaler = StandardScaler().fit(features)
+    model = SVC(kernel='rbf', C=10.0, gamma='scale', class_weight='balanced', probability=True, random_state=42)
+    with warnings.catch_warnings():
+        # sklearn >= 1.9 menandai probability=True deprecated; engine tetap harus cocok dgn model lama
+        warnings.simplefilter('ignore', FutureWarning)
+        model.fit(pd.DataFrame(scaler.transform(features), columns=columns), y)
+    return model, scaler, features
+
+def assert_same_as_sklearn(engine, model, scaler, features):
+    scaled = pd.DataFrame(scaler.transform(features), columns=features.columns)
+    rows = features[list(engine.feature_columns)].to_numpy()
+    assert np.array_equal(engine.predict(rows), model.predict(scaled))
+    np.testing.assert_allclose(engine.predict_proba(rows), model.predict_proba(scaled), rtol=0, atol=1e-9)
+
+def test_engine_matches_sklearn(fitted):
+    model, scaler, features = fitted
+    engine = SVCEngine.from_estimators(model, scaler, MODEL_CONFIG['feature_columns'])
+
+    assert engine.supports_probability
+    assert_same_as_sklearn(engine, model, scaler, features)
+
+def test_exported_bundles_match_sklearn(fitted, tmp_path):
+    model, scaler, features = fitted
+    arrays = export_bundle(model, scaler, str(tmp_path / 'engine.npz'), MODEL_CONFIG['feature_columns'])
+    export_flat_bundle(arrays, str(tmp_path / 'engine.bin'))
+
+    for engine in (SVCEngine.load(str(tmp_path / 'engine.npz')), SVCEngine.load_mapped(str(tmp_path / 'engine.bin'))):
+        assert_same_as_sklearn(engine, model, scaler, features)
@@ -0,0 +1,450 @@
+"""
+Description: Helpers for calling the Visual Crossing API from concurrent request handlers
+"""
+
+# =====================================================================================
+# IMPORTS AND DEPENDENCIES
+# =====================================================================================
+
+import asyncio
+import random
+import threading
+import time
+from collections import deque
+
+import requests # utk mengakses API eksternal
+from requests.adapters import HTTPAdapter
+
+from metrics import Metrics
+
+# =====================================================================================
+# REQUEST COALESCING
+# =====================================================================================
+
+class _InFlightCall:
+    """State shared between the leader of a call and the threads waiting on it."""
+
+    __slots__ = ('done', 'result', 'error', 'waiters')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+# request yg identik dan berjalan bersamaan hanya memanggil API sekali
+class SingleFlight:
+    """
+    Coalesce concurrent calls that share a key into one execution.
+
+    The first caller for a key runs the function; callers arriving while it
+    is in flight block until it finishes and receive the same result or
+    exception. Once the call completes the key is released, so later calls
+    run again (caching is left to the caller). Results are shared objects and
+    must be treated as read-only.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._counters = {'executions': 0, 'shared': 0}
+
+    def do(self, key, fn):
+        """Run fn() once per in-flight key and return its result."""
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = _InFlightCall()
+                self._calls[key] = call
+                self._counters['executions'] += 1
+                is_leader = True
+            else:
+                call.waiters += 1
+                self._counters['shared'] += 1
+                is_leader = False
+
+        if not is_leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+    def join(self, match):
+        """
+        Wait on an in-flight call whose key satisfies match(key) without starting one.
+
+        Lets a request for a span that lies inside a span already being
+        fetched share that call instead of paying for the overlap again.
+
+        Returns:
+            tuple: (True, result) after sharing a call, or (False, None) if no key matched
+        """
+        with self._lock:
+            call = next((call for key, call in self._calls.items() if match(key)), None)
+            if call is None:
+                return False, None
+            call.waiters += 1
+            self._counters['shared'] += 1
+
+        call.done.wait()
+        if call.error is not None:
+            raise call.error
+        return True, call.result
+
+    def stats(self):
+        """Executed vs. shared call counters and keys currently in flight."""
+        with self._lock:
+            stats = dict(self._counters)
+            stats['in_flight'] = len(self._calls)
+        return stats
+
+class AsyncSingleFlight:
+    """asyncio version of SingleFlight: concurrent awaiters of a key share one task."""
+
+    def __init__(self):
+        self._tasks = {}
+        self._counters = {'executions': 0, 'shared': 0}
+
+    async def do(self, key, coroutine_fn):
+        """Await coroutine_fn() once per in-flight key and return its result."""
+        task = self._tasks.get(key)
+        if task is None:
+            task = asyncio.ensure_future(coroutine_fn())
+            self._tasks[key] = task
+            task.add_done_callback(lambda _: self._tasks.pop(key, None))
+            self._counters['executions'] += 1
+        else:
+            self._counters['shared'] += 1
+
+        # shield: one cancelled caller must not cancel the fetch shared with others
+        return await asyncio.shield(task)
+
+    async def join(self, match):
+        """Await an in-flight task whose key satisfies match(key); (False, None) if none."""
+        task = next((task for key, task in self._tasks.items() if match(key)), None)
+        if task is None:
+            return False, None
+        self._counters['shared'] += 1
+        return True, await asyncio.shield(task)
+
+    def stats(self):
+        stats = dict(self._counters)
+        stats['in_flight'] = len(self._tasks)
+        return stats
+
+# =====================================================================================
+# CIRCUIT BREAKER
+# =====================================================================================
+
+class CircuitOpenError(requests.exceptions.RequestException):
+    """Raised without contacting upstream while the circuit breaker is open."""
+
+# setelah beberapa kegagalan berturut-turut, request langsung ditolak selama reset_timeout detik
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+
+    After `failure_threshold` consecutive failures the circuit opens and
+    calls fail fast for `reset_timeout` seconds. Then a single trial call is
+    let through (half-open); its outcome closes or re-opens the circuit.
+    """
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+
+    def allow(self):
+        """Return True when a call may be attempted."""
+        return self.acquire()[0]
+
+    def acquire(self):
+        """
+        Like allow(), but also report whether the call is the half-open trial.
+
+        Returns:
+            tuple: (allowed, is_trial); a trial must end in record_success,
+                record_failure or release_trial
+        """
+        with self._lock:
+            if self._opened_at is None:
+                return True, False
+            if self._trial_in_flight or time.monotonic() - self._opened_at < self.reset_timeout:
+                return False, False
+            self._trial_in_flight = True
+            return True, True
+
+    def release_trial(self):
+        """End a trial that produced no outcome (e.g. a cancelled call); the next call becomes the trial."""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._trial_in_flight or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+            self._trial_in_flight = False
+
+    @property
+    def state(self):
+        with self._lock:
+            if self._opened_at is None:
+                return 'closed'
+            if self._trial_in_flight or time.monotonic() - self._opened_at >= self.reset_timeout:
+                return 'half_open'
+            return 'open'
+
+# =====================================================================================
+# LATENCY RECORDING
+# =====================================================================================
+
+class LatencyRecorder:
+    """Keep the most recent call durations per name and report percentiles."""
+
+    def __init__(self, window=1000):
+        self.window = window
+        self._lock = threading.Lock()
+        self._samples = {}
+        self._counts = {}
+
+    def record(self, name, seconds):
+        with self._lock:
+            self._samples.setdefault(name, deque(maxlen=self.window)).append(seconds)
+            self._counts[name] = self._counts.get(name, 0) + 1
+
+    def summary(self):
+        """Call count and p50/p95/p99/max latency in milliseconds per name."""
+        with self._lock:
+            snapshot = {name: sorted(samples) for name, samples in self._samples.items()}
+            counts = dict(self._counts)
+
+        return {
+            name: {
+                'count': counts[name],
+                'p50_ms': percentile_ms(samples, 50),
+                'p95_ms': percentile_ms(samples, 95),
+                'p99_ms': percentile_ms(samples, 99),
+                'max_ms': round(samples[-1] * 1000, 2)
+            }
+            for name, samples in snapshot.items() if samples
+        }
+
+def percentile_ms(sorted_samples, percent):
+    """Nearest-rank percentile of sorted durations (seconds), in milliseconds."""
+    index = max(0, min(len(sorted_samples) - 1, -(-len(sorted_samples) * percent // 100) - 1))
+    return round(sorted_samples[int(index)] * 1000, 2)
+
+# =====================================================================================
+# HTTP CLIENT
+# =====================================================================================
+
+RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+class BaseUpstreamClient:
+    """Timeout, retry/backoff and circuit-breaker settings shared by the sync and async clients."""
+
+    def __init__(self, pool_size=10, connect_timeout=3.05, read_timeout=15.0, max_retries=2,
+                 backoff_base=0.5, backoff_max=4.0, breaker=None, latency=None, metrics=None):
+        self.pool_size = pool_size
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.breaker = breaker or CircuitBreaker()
+        self.latency = latency or LatencyRecorder()
+        self.metrics = metrics or Metrics(enabled=False)
+
+    def check_circuit(self):
+        """
+        Raise CircuitOpenError instead of calling upstream while the circuit is open.
+
+        Returns:
+            bool: True when this call is the half-open trial
+        """
+        allowed, is_trial = self.breaker.acquire()
+        if not allowed:
+            self.metrics.count('weather_upstream_requests_total', outcome='circuit_open')
+            raise CircuitOpenError("Layanan Visual Crossing sedang tidak tersedia, coba lagi nanti")
+        return is_trial
+
+    def backoff_delay(self, attempt, retry_after=None):
+        """Full-jitter exponential backoff, honouring a numeric Retry-After header."""
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+        try:
+            if retry_after is not None:
+                delay = max(delay, min(self.backoff_max, float(retry_after)))
+        except ValueError:
+            pass
+        return delay
+
+    def stats(self):
+        return {
+            'circuit': self.breaker.state,
+            'latency': self.latency.summary()
+        }
+
+def response_outcome(status_code):
+    """Metrics label for an upstream response status."""
+    if status_code < 400:
+        return 'success'
+    if status_code in RETRY_STATUS_CODES:
+        return 'retryable_status'
+    return 'client_error'
+
+# satu session bersama: koneksi keep-alive, timeout, retry dgn backoff, dan circuit breaker
+class UpstreamClient(BaseUpstreamClient):
+    """
+    Shared HTTP client for upstream JSON APIs.
+
+    Uses one pooled keep-alive session, bounds every request with connect and
+    read timeouts, retries connection errors, timeouts and 429/5xx responses
+    with full-jitter exponential backoff, and stops calling upstream while the
+    circuit breaker is open.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.timeout = (self.connect_timeout, self.read_timeout)
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size, max_retries=0)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def get_json(self, url, name='upstream'):
+        """
+        GET a URL and return its decoded JSON body.
+
+        Raises:
+            CircuitOpenError: When the circuit breaker is open
+            requests.exceptions.RequestException: On HTTP errors or exhausted retries
+        """
+        is_trial = self.check_circuit()
+        try:
+            for attempt in range(self.max_retries + 1):
+                started = time.perf_counter()
+                try:
+                    response = self.session.get(url, timeout=self.timeout)
+                except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                    self.latency.record(name, time.perf_counter() - started)
+                    self.metrics.count('weather_upstream_requests_total', outcome='connection_error')
+                    if attempt < self.max_retries:
+                        time.sleep(self.backoff_delay(attempt))
+                        continue
+                    self.breaker.record_failure()
+                    raise
+                except Exception:
+                    self.breaker.record_failure()
+                    raise
+
+                self.latency.record(name, time.perf_counter() - started)
+                self.metrics.count('weather_upstream_requests_total', outcome=response_outcome(response.status_code))
+
+                if response.status_code in RETRY_STATUS_CODES:
+                    if attempt < self.max_retries:
+                        time.sleep(self.backoff_delay(attempt, response.headers.get('Retry-After')))
+                        continue
+                    self.breaker.record_failure()
+                else:
+                    # 4xx lain (mis. 401/404) adalah jawaban valid, bukan gangguan upstream
+                    self.breaker.record_success()
+
+                response.raise_for_status()
+                with self.metrics.stage('upstream_json_parse'):
+                    return response.json()
+        finally:
+            # trial yg dibatalkan (CancelledError/KeyboardInterrupt) tdk boleh menahan circuit half-open selamanya
+            if is_trial:
+                self.breaker.release_trial()
+
+# versi asyncio utk mode ASGI; httpx hanya dibutuhkan jika client ini dipakai
+class AsyncUpstreamClient(BaseUpstreamClient):
+    """
+    asyncio counterpart of UpstreamClient built on httpx.AsyncClient.
+
+    Shares the retry, backoff and circuit-breaker behaviour. Final HTTP
+    errors are raised as requests.exceptions.HTTPError so callers can reuse
+    the same error-message mapping as the synchronous code.
+    """
+
+    def __init__(self, **kwargs):
+        import httpx
+
+        super().__init__(**kwargs)
+        self._httpx = httpx
+        self.client = httpx.AsyncClient(
+            timeout=httpx.Timeout(self.read_timeout, connect=self.connect_timeout),
+            limits=httpx.Limits(max_connections=self.pool_size, max_keepalive_connections=self.pool_size)
+        )
+
+    async def get_json(self, url, name='upstream'):
+        """
+        GET a URL and return its decoded JSON body.
+
+        Raises:
+            CircuitOpenError: When the circuit breaker is open
+            requests.exceptions.HTTPError: On a final HTTP error status
+            httpx.TransportError: On exhausted retries after connection errors or timeouts
+        """
+        is_trial = self.check_circuit()
+        try:
+            for attempt in range(self.max_retries + 1):
+                started = time.perf_counter()
+                try:
+                    response = await self.client.get(url)
+                except self._httpx.TransportError:
+                    self.latency.record(name, time.perf_counter() - started)
+                    self.metrics.count('weather_upstream_requests_total', outcome='connection_error')
+                    if attempt < self.max_retries:
+                        await asyncio.sleep(self.backoff_delay(attempt))
+                        continue
+                    self.breaker.record_failure()
+                    raise
+                except Exception:
+                    self.breaker.record_failure()
+                    raise
+
+                self.latency.record(name, time.perf_counter() - started)
+                self.metrics.count('weather_upstream_requests_total', outcome=response_outcome(response.status_code))
+
+                if response.status_code in RETRY_STATUS_CODES:
+                    if attempt < self.max_retries:
+                        await asyncio.sleep(self.backoff_delay(attempt, response.headers.get('Retry-After')))
+                        continue
+                    self.breaker.record_failure()
+                else:
+                    self.breaker.record_success()
+
+                if response.status_code >= 400:
+                    raise requests.exceptions.HTTPError(f"HTTP {response.status_code} untuk {name}", response=response)
+                with self.metrics.stage('upstream_json_parse'):
+                    return response.json()
+        finally:
+            # trial yg dibatalkan (CancelledError/KeyboardInterrupt) tdk boleh menahan circuit half-open selamanya
+            if is_trial:
+                self.breaker.release_trial()
+
+    async def aclose(self):
+        await self.client.aclose()
@@ -0,0 +1,274 @@
+"""
+Description: Local stand-in for the Visual Crossing timeline API, built from DataCuaca.csv
+
+Serves /VisualCrossingWebServices/rest/services/timeline/<location>/<start>[/<end>]
+with include=hours or include=days, so the app can be load-tested without
+spending API quota. Any date maps onto one of the historical CSV days.
+
+Usage:
+    python vc_stub.py --port 8765 --latency-ms 150 --error-rate 0.02
+    VISUAL_CROSSING_BASE_URL=http://127.0.0.1:8765/VisualCrossingWebServices/rest/services/timeline python app.py
+"""
+
+# =====================================================================================
+# IMPORTS AND DEPENDENCIES
+# =====================================================================================
+
+import argparse
+import csv
+import json
+import os
+import random
+import threading
+import time
+from collections import Counter
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlparse
+
+from quota import estimate_record_cost
+
+# =====================================================================================
+# STUB CONFIGURATION
+# =====================================================================================
+
+DEFAULT_CSV_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'DataCuaca.csv')
+
+# kolom numerik per jam di DataCuaca.csv
+HOURLY_NUMERIC_FIELDS = ('temp', 'humidity', 'precip', 'windgust', 'windspeed', 'cloudcover',
+                         'visibility', 'uvindex', 'solarradiation', 'pressure')
+
+# label kelas dataset -> teks kondisi visual crossing
+CONDITION_TEXT = {
+    'cerah': ('Clear', 'Clear conditions throughout the day.'),
+    'berawan': ('Partially cloudy', 'Partly cloudy throughout the day.'),
+    'hujan': ('Rain, Partially cloudy', 'Partly cloudy throughout the day with rain.')
+}
+
+# agregasi harian spt visual crossing: rata-rata, maksimum atau jumlah dari nilai per jam
+DAILY_AGGREGATES = {
+    'temp': 'mean', 'humidity': 'mean', 'precip': 'sum', 'windgust': 'max', 'windspeed': 'max',
+    'cloudcover': 'mean', 'visibility': 'mean', 'uvindex': 'max', 'solarradiation': 'mean', 'pressure': 'mean'
+}
+
+# =====================================================================================
+# DATASET
+# =====================================================================================
+
+def load_csv_days(csv_path):
+    """
+    Split the hourly CSV rows into days (a new day starts when the hour resets).
+
+    Returns:
+        list: One list of hour dicts (Visual Crossing field names) per day
+    """
+    days = []
+    previous_hour = None
+
+    with open(csv_path, encoding='utf-8-sig', newline='') as csv_file:
+        for row in csv.DictReader(csv_file):
+            hour = int(row['datetime'].split(':')[0])
+            if previous_hour is None or hour <= previous_hour:
+                days.append([])
+            previous_hour = hour
+            days[-1].append(build_hour(row))
+
+    return days
+
+def build_hour(row):
+    """Convert one CSV row into a Visual Crossing hour object."""
+    hour = {field: (float(row[field]) if row[field] != '' else None) for field in HOURLY_NUMERIC_FIELDS}
+    conditions, description = CONDITION_TEXT.get(row['weather'], CONDITION_TEXT['berawan'])
+    hour.update({
+        'datetime': row['datetime'],
+        'feelslike': hour['temp'],
+        'dewpoint': None,
+        'preciptype': ['rain'] if hour['precip'] else None,
+        'conditions': conditions,
+        'description': description
+    })
+    return hour
+
+def build_day(date_str, hours):
+    """Build a Visual Crossing day object (daily aggregates plus hours) from hour objects."""
+    day = {'datetime': date_str}
+
+    for field, how in DAILY_AGGREGATES.items():
+        values = [hour[field] for hour in hours if hour[field] is not None]
+        if not values:
+            day[field] = None
+        elif how == 'sum':
+            day[field] = round(sum(values), 2)
+        elif how == 'max':
+            day[field] = max(values)
+        else:
+            day[field] = round(sum(values) / len(values), 2)
+
+    temps = [hour['temp'] for hour in hours if hour['temp'] is not None]
+    conditions = Counter(hour['conditions'] for hour in hours).most_common(1)[0][0]
+    description = next(hour['description'] for hour in hours if hour['conditions'] == conditions)
+
+    day.update({
+        'tempmax': max(temps) if temps else None,
+        'tempmin': min(temps) if temps else None,
+        'feelslike': day['temp'],
+        'dewpoint': None,
+        'preciptype': ['rain'] if day['precip'] else None,
+        'solarenergy': round(sum(hour['solarradiation'] or 0 for hour in hours) * 0.0036, 1),
+        'conditions': conditions,
+        'description': description,
+        'hours': hours
+    })
+    return day
+
+def project(obj, elements):
+    """Keep only the requested elements (datetime is always kept), like the real API."""
+    if elements is None:
+        return dict(obj)
+    return {key: value for key, value in obj.items() if key in elements or key == 'datetime'}
+
+# =====================================================================================
+# TIMELINE STUB
+# =====================================================================================
+
+class TimelineStub:
+    """
+    Answer timeline requests from the CSV days.
+
+    A date maps onto CSV day `date.toordinal() % len(days)`, so every date
+    (past or future) returns realistic data and the same date always returns
+    the same day.
+    """
+
+    def __init__(self, csv_path=DEFAULT_CSV_PATH, latency_ms=0, jitter_ms=0, error_rate=0.0,
+                 error_status=503, max_days=366):
+        self.days = load_csv_days(csv_path)
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.max_days = max_days
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.injected_errors = 0
+
+    def handle(self, path, query):
+        """
+        Build the response for one request.
+
+        Returns:
+            tuple: (status_code, body_dict)
+        """
+        with self._lock:
+            self.requests += 1
+
+        delay = (self.latency_ms + random.uniform(0, self.jitter_ms)) / 1000.0
+        if delay > 0:
+            time.sleep(delay)
+
+        if self.error_rate and random.random() < self.error_rate:
+            with self._lock:
+                self.injected_errors += 1
+            return self.error_status, {'error': 'Injected error'}
+
+        segments = [unquote(segment) for segment in path.strip('/').split('/')]
+        if 'timeline' not in segments or len(segments) < segments.index('timeline') + 3:
+            return 404, {'error': 'Unknown path'}
+
+        location, *date_parts = segments[segments.index('timeline') + 1:]
+        try:
+            start_date = date.fromisoformat(date_parts[0])
+            end_date = date.fromisoformat(date_parts[1]) if len(date_parts) > 1 else start_date
+        except ValueError:
+            return 400, {'error': 'Bad date'}
+
+        num_days = (end_date - start_date).days + 1
+        if num_days < 1 or num_days > self.max_days:
+            return 400, {'error': 'Bad date range'}
+
+        include_param = query.get('include', ['days,hours'])[0]
+        include = include_param.split(',')
+        elements = set(query['elements'][0].split(',')) if 'elements' in query else None
+
+        days = []
+        for offset in range(num_days):
+            current = start_date + timedelta(days=offset)
+            day = build_day(current.isoformat(), self.days[current.toordinal() % len(self.days)])
+            hours = [project(hour, elements) for hour in day.pop('hours')]
+            day = project(day, elements)
+            if 'hours' in include:
+                day['hours'] = hours
+            days.append(day)
+
+        # ditagih spt visual crossing: 24 record per hari jika include memuat hours
+        query_cost = estimate_record_cost(num_days, include_param)
+        return 200, {'queryCost': query_cost, 'resolvedAddress': location, 'address': location, 'days': days}
+
+    def stats(self):
+        with self._lock:
+            return {'requests': self.requests, 'injected_errors': self.injected_errors, 'csv_days': len(self.days)}
+
+def make_handler(stub):
+    """Create a request handler class bound to a TimelineStub."""
+
+    class StubHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_GET(self):
+            parsed = urlparse(self.path)
+            if parsed.path == '/stats':
+                status, body = 200, stub.stats()
+            else:
+                status, body = stub.handle(parsed.path, parse_qs(parsed.query))
+
+            payload = json.dumps(body, separators=(',', ':')).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, format, *args):
+            pass
+
+    return StubHandler
+
+def serve(host='127.0.0.1', port=8765, **stub_kwargs):
+    """Create the stub HTTP server (call serve_forever() on the result)."""
+    stub = TimelineStub(**stub_kwargs)
+    server = ThreadingHTTPServer((host, port), make_handler(stub))
+    server.daemon_threads = True
+    server.stub = stub
+    return server
+
+# =====================================================================================
+# COMMAND LINE
+# =====================================================================================
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Local Visual Crossing timeline stub built from DataCuaca.csv')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--csv', default=DEFAULT_CSV_PATH, help='Hourly dataset (default: ../DataCuaca.csv)')
+    parser.add_argument('--latency-ms', type=float, default=0, help='Fixed latency added to every response')
+    parser.add_argument('--jitter-ms', type=float, default=0, help='Extra random latency in [0, jitter]')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of requests answered with an error')
+    parser.add_argument('--error-status', type=int, default=503, help='HTTP status of injected errors')
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    server = serve(args.host, args.port, csv_path=args.csv, latency_ms=args.latency_ms,
+                   jitter_ms=args.jitter_ms, error_rate=args.error_rate, error_status=args.error_status)
+
+    print(f"🧪 Stub Visual Crossing ({server.stub.stats()['csv_days']} hari data) di "
+          f"http://{args.host}:{args.port}/VisualCrossingWebServices/rest/services/timeline")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == '__main__':
+    main()
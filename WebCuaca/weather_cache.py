@@ -0,0 +1,183 @@
+"""
+Description: Tiered (memory + optional disk) cache for Visual Crossing timeline days
+"""
+
+# =====================================================================================
+# IMPORTS AND DEPENDENCIES
+# =====================================================================================
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import date
+
+# =====================================================================================
+# TIMELINE CACHE
+# =====================================================================================
+
+# cache per hari: tanggal lampau disimpan permanen, hari ini & masa depan memakai TTL pendek
+class TimelineCache:
+    """
+    Cache of per-day timeline payloads keyed by (location, date, include, elements).
+
+    Entries live in an in-process LRU bounded by total serialized size and,
+    when `disk_dir` is set, in one JSON file per key so they survive restarts.
+    Days before today never change upstream and are kept without expiry;
+    today and future days expire after `ttl_seconds`.
+    """
+
+    def __init__(self, max_bytes=32 * 1024 * 1024, ttl_seconds=600, disk_dir=None, today_fn=date.today):
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.disk_dir = disk_dir
+        self.today_fn = today_fn
+
+        self._entries = OrderedDict()  # key -> (payload_bytes, expires_at or None)
+        self._size = 0
+        self._lock = threading.Lock()
+        self._counters = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0, 'stores': 0, 'evictions': 0, 'expired': 0, 'stale_hits': 0}
+
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+
+    def get(self, key):
+        """Return a fresh copy of the cached day, or None on miss."""
+        now = time.time()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                payload, expires_at = entry
+                if expires_at is None or expires_at > now:
+                    self._entries.move_to_end(key)
+                    self._counters['memory_hits'] += 1
+                    return json.loads(payload)
+                # entri kedaluwarsa dibiarkan (sampai diganti/tergusur) utk get_stale
+                self._counters['expired'] += 1
+
+        entry = self._read_disk(key, now)
+
+        with self._lock:
+            if entry is None:
+                self._counters['misses'] += 1
+                return None
+            self._counters['disk_hits'] += 1
+            self._insert(key, *entry)
+
+        return json.loads(entry[0])
+
+    def get_stale(self, key):
+        """
+        Return the cached day even if it has expired, or None if it was never cached.
+
+        Used when upstream cannot be called (quota exhausted), where an old
+        forecast is better than none.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._counters['stale_hits'] += 1
+                return json.loads(entry[0])
+
+        entry = self._read_disk(key, time.time(), allow_expired=True)
+        if entry is None:
+            return None
+        with self._lock:
+            self._counters['stale_hits'] += 1
+        return json.loads(entry[0])
+
+    def put(self, key, day_data, date_str):
+        """Store one day's payload; the expiry depends on whether the date is in the past."""
+        payload = json.dumps(day_data, separators=(',', ':')).encode('utf-8')
+        expires_at = None if self.is_immutable(date_str) else time.time() + self.ttl_seconds
+
+        with self._lock:
+            self._insert(key, payload, expires_at)
+            self._counters['stores'] += 1
+
+        self._write_disk(key, payload, expires_at)
+
+    def is_immutable(self, date_str):
+        """Past dates are final upstream and can be cached permanently."""
+        try:
+            return date.fromisoformat(date_str) < self.today_fn()
+        except (TypeError, ValueError):
+            return False
+
+    def stats(self):
+        """Hit/miss counters and current memory usage."""
+        with self._lock:
+            stats = dict(self._counters)
+            stats['entries'] = len(self._entries)
+            stats['bytes'] = self._size
+
+        lookups = stats['memory_hits'] + stats['disk_hits'] + stats['misses']
+        stats['hit_ratio'] = round((stats['memory_hits'] + stats['disk_hits']) / lookups, 4) if lookups else None
+        return stats
+
+    def clear(self):
+        """Drop all in-memory entries (the disk store is left untouched)."""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    # ---------------------------------------------------------------------------------
+    # Internal helpers (callers hold self._lock for the in-memory ones)
+    # ---------------------------------------------------------------------------------
+
+    def _insert(self, key, payload, expires_at):
+        if len(payload) > self.max_bytes:
+            return
+
+        if key in self._entries:
+            self._remove(key)
+
+        self._entries[key] = (payload, expires_at)
+        self._size += len(payload)
+
+        while self._size > self.max_bytes:
+            _, (old_payload, _) = self._entries.popitem(last=False)
+            self._size -= len(old_payload)
+            self._counters['evictions'] += 1
+
+    def _remove(self, key):
+        payload, _ = self._entries.pop(key)
+        self._size -= len(payload)
+
+    def _disk_path(self, key):
+        digest = hashlib.sha1(json.dumps(key).encode('utf-8')).hexdigest()
+        return os.path.join(self.disk_dir, f"{digest}.json")
+
+    def _read_disk(self, key, now, allow_expired=False):
+        if not self.disk_dir:
+            return None
+
+        path = self._disk_path(key)
+        try:
+            with open(path, 'rb') as cache_file:
+                record = json.load(cache_file)
+        except (OSError, ValueError):
+            return None
+
+        expires_at = record.get('expires_at')
+        if record.get('key') != list(key) or (not allow_expired and expires_at is not None and expires_at <= now):
+            return None
+
+        return json.dumps(record['day'], separators=(',', ':')).encode('utf-8'), expires_at
+
+    def _write_disk(self, key, payload, expires_at):
+        if not self.disk_dir:
+            return
+
+        path = self._disk_path(key)
+        record = {'key': list(key), 'expires_at': expires_at, 'day': json.loads(payload)}
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as cache_file:
+                json.dump(record, cache_file, separators=(',', ':'))
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Gagal menyimpan cache ke disk: {e}")